@@ -0,0 +1,394 @@
+#!/usr/bin/env python
+"""bench_copy2hash: Benchmark copy2hash on synthetic trees of files."""
+
+######################################################
+#
+# bench_copy2hash: - generating synthetic trees of
+# files and timing the stages of copy2hash for
+# comparing the runs over time
+#
+######################################################
+
+import argparse
+from functools import partial
+import json
+import os
+from pathlib import Path
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    from copy2hash import __version__
+    from copy2hash import copy2hash
+except ImportError:
+    sys.path.insert(0, Path(__file__).resolve().parent.parent.as_posix())
+    from copy2hash import __version__
+    from copy2hash import copy2hash
+
+# Number of files or directories per directory of the nested trees
+FANOUT = 32
+# Datasets of the presets: number of files, size of the files, layout of the tree
+PRESETS = {
+    "small": (1000, "1KiB", "flat"),
+    "nested": (10000, "4KiB", "nested"),
+    "large": (16, "64MiB", "flat"),
+    "huge": (1000000, "64B", "nested"),
+    "gigabyte": (4, "1GiB", "flat"),
+}
+# Report formats, which are timed
+REPORT_FORMATS = ("csv", "json", "jsonl", "sqlite", "pkl", "txt", "yaml", "xml")
+# Upper limit of the cumulative import time of copy2hash in seconds; about twice
+# the import without cached bytecode, so a slow new import is caught
+STARTUP_BUDGET = 0.1
+# Units of the sizes of the files
+_UNITS = {"B": 1, "KiB": 1024, "MiB": 1024**2, "GiB": 1024**3}
+
+
+def parse_size(size):
+    """Parse the size of the files like '64KiB' into bytes.
+
+    Parameters
+    ----------
+    size : str
+        Size with one of the units 'B', 'KiB', 'MiB', or 'GiB'.
+
+    Returns
+    -------
+    nbytes : int
+        Size in bytes.
+    """
+    for unit in sorted(_UNITS, key=len, reverse=True):
+        if size.endswith(unit):
+            return int(float(size[: -len(unit)]) * _UNITS[unit])
+    return int(size)
+
+
+def make_tree(root, n_files, size, layout="flat"):
+    """Generate a synthetic tree of files.
+
+    Every file starts with its index, so all files have a different content; the
+    rest of the file is sparse, so also files of several GB are generated fast.
+
+    Parameters
+    ----------
+    root : Path
+        Parent directory of the tree.
+    n_files : int
+        Number of files.
+    size : int
+        Size of the files in bytes.
+    layout : str, optional
+        'flat' for a single directory, or 'nested' for FANOUT files per directory
+        in a tree of FANOUT directories per directory; default is 'flat'.
+
+    Returns
+    -------
+    root : Path
+        Parent directory of the tree.
+    """
+    depth = 0
+    if layout == "nested":
+        while FANOUT ** (depth + 1) < n_files:
+            depth += 1
+    for i in range(n_files):
+        parts = [f"d{(i // FANOUT ** (k + 1)) % FANOUT}" for k in range(depth)]
+        parent = root.joinpath(*reversed(parts))
+        if i % FANOUT == 0:
+            parent.mkdir(parents=True, exist_ok=True)
+        with open(parent.joinpath(f"file_{i}.dat"), "wb") as f:
+            f.write(f"{i}\n".encode("utf-8"))
+            f.truncate(size)
+    return root
+
+
+def make_args(tree, directory, **kwargs):
+    """Make the parser arguments for a run over the tree."""
+    opt = {
+        "infile": [tree.as_posix()],
+        "recursive": True,
+        "directory": directory.as_posix(),
+        "report": [],
+        "report_name": "bench_report",
+    }
+    opt.update(kwargs)
+    args = copy2hash.get_args(opt=opt, argv=[])
+    copy2hash.check_args(args)
+    return args
+
+
+def timed(func, *args):
+    """Call the function and return its result and its duration in seconds."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_startup():
+    """Time the import of copy2hash in a new interpreter.
+
+    Returns
+    -------
+    seconds : float
+        Cumulative import time of `copy2hash.copy2hash` from `-X importtime`.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import copy2hash.copy2hash"],
+        cwd=Path(__file__).resolve().parent.parent,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        if module.strip() == "copy2hash.copy2hash":
+            return int(cumulative) / 1e6
+    return None
+
+
+def bench_dataset(workdir, n_files, size, layout, sha):
+    """Time the stages of copy2hash for one synthetic dataset.
+
+    The stages are: finding the files, hashing their filenames and their content,
+    copying and moving them, and writing every report format.
+
+    Parameters
+    ----------
+    workdir : Path
+        Empty directory for the tree and the copies.
+    n_files : int
+        Number of files.
+    size : int
+        Size of the files in bytes.
+    layout : str
+        Layout of the tree, which is 'flat' or 'nested'.
+    sha : list
+        SHA keys of the run.
+
+    Returns
+    -------
+    timings : dict
+        Duration of every stage in seconds.
+    """
+    tree = make_tree(workdir.joinpath("tree"), n_files, size, layout)
+    timings = {}
+
+    worker = copy2hash.Copy2Hash(
+        make_args(tree, workdir.joinpath("copy"), sha=sha, content=True)
+    )
+    worker.open()
+    try:
+        records, timings["find_files"] = timed(list, worker.find_files())
+        worker.args["content"] = False
+        _, timings["hash_names"] = timed(worker.transform_hash, records)
+        worker.args["content"] = True
+        _, timings["hash_contents"] = timed(worker.transform_hash, records)
+        _, timings["copy"] = timed(worker.copy_files, records)
+        worker._records = records
+        copy_dict = worker.make_copy_dict()
+        for key in REPORT_FORMATS:
+            _, timings[f"write_{key}"] = timed(
+                partial(worker.make_export, formats=[key]), copy_dict
+            )
+    finally:
+        worker.close()
+
+    worker = copy2hash.Copy2Hash(
+        make_args(tree, workdir.joinpath("move"), sha=sha[:1], move=True)
+    )
+    worker.open()
+    try:
+        records = list(worker.find_files())
+        worker.transform_hash(records)
+        _, timings["move"] = timed(worker.move_files, records)
+    finally:
+        worker.close()
+    return timings
+
+
+def run_benchmarks(datasets, sha=("sha256",), tmpdir=None):
+    """Run the benchmarks of the startup and of the datasets.
+
+    Parameters
+    ----------
+    datasets : list
+        Tuples of the name, the number of files, the size, and the layout.
+    sha : list, optional
+        SHA keys of the runs; default is `('sha256',)`.
+    tmpdir : str, optional
+        Parent directory of the synthetic trees; default is None for the temporary
+        directory of the system.
+
+    Returns
+    -------
+    run : dict
+        Machine-readable description of the environment and the results.
+    """
+    results = []
+    seconds = bench_startup()
+    if seconds is not None:
+        results.append(
+            {
+                "dataset": "startup",
+                "n_files": 0,
+                "size": 0,
+                "layout": None,
+                "stage": "import",
+                "seconds": seconds,
+                "files_per_second": None,
+            }
+        )
+    for name, n_files, size, layout in datasets:
+        nbytes = parse_size(size)
+        workdir = Path(tempfile.mkdtemp(prefix="copy2hash_bench_", dir=tmpdir))
+        try:
+            timings = bench_dataset(workdir, n_files, nbytes, layout, list(sha))
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        for stage, seconds in timings.items():
+            results.append(
+                {
+                    "dataset": name,
+                    "n_files": n_files,
+                    "size": nbytes,
+                    "layout": layout,
+                    "stage": stage,
+                    "seconds": seconds,
+                    "files_per_second": n_files / seconds if seconds else None,
+                }
+            )
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "sha": list(sha),
+        "results": results,
+    }
+
+
+def load_runs(fname):
+    """Load the previous runs of a results file in the `JSON Lines`-format."""
+    if not Path(fname).is_file():
+        return []
+    with open(fname) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare_runs(previous, run):
+    """Print the durations of a run relative to the previous run of the datasets."""
+    last = {
+        (result["dataset"], result["stage"]): result["seconds"]
+        for result in previous.get("results", [])
+    }
+    print(
+        f"{'dataset':<10} {'stage':<14} {'seconds':>10} {'previous':>10} {'ratio':>7}"
+    )
+    for result in run["results"]:
+        seconds = result["seconds"]
+        before = last.get((result["dataset"], result["stage"]))
+        ratio = f"{seconds / before:>7.2f}" if before else f"{'-':>7}"
+        before = f"{before:>10.4f}" if before else f"{'-':>10}"
+        print(
+            f"{result['dataset']:<10} {result['stage']:<14} {seconds:>10.4f} "
+            f"{before} {ratio}"
+        )
+        if result["stage"] == "import" and seconds > STARTUP_BUDGET:
+            print(f"import time exceeds the budget of {STARTUP_BUDGET} s")
+
+
+def get_args(argv=None):
+    """Get the parser arguments of the benchmark from the command line."""
+    parser = argparse.ArgumentParser(
+        description="benchmark copy2hash on synthetic trees of files"
+    )
+    parser.add_argument(
+        "-p",
+        "--preset",
+        help="dataset(s) of the presets: {}; default is 'small'".format(
+            ", ".join(PRESETS)
+        ),
+        nargs="*",
+        choices=list(PRESETS),
+        default=["small"],
+    )
+    parser.add_argument(
+        "-n", "--files", help="number of files of a custom dataset", type=int
+    )
+    parser.add_argument(
+        "-sz",
+        "--size",
+        help="size of the files of a custom dataset like '64KiB'; default is '1KiB'",
+        default="1KiB",
+        type=str,
+    )
+    parser.add_argument(
+        "-l",
+        "--layout",
+        help="layout of the custom dataset; default is 'flat'",
+        choices=["flat", "nested"],
+        default="flat",
+    )
+    parser.add_argument(
+        "-s",
+        "--sha",
+        help="SHA key(s) of the runs; default is 'sha256'",
+        nargs="*",
+        default=["sha256"],
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help=(
+            "results file, which is extended by every run in the `JSON Lines`-format; "
+            "default is 'bench_results.jsonl'"
+        ),
+        default="bench_results.jsonl",
+    )
+    parser.add_argument(
+        "-t",
+        "--tmpdir",
+        help="parent directory of the synthetic trees; default is the system one",
+        default=None,
+    )
+    return vars(parser.parse_args(argv))
+
+
+def main(argv=None):
+    """Run the benchmarks via command line and store their results.
+
+    Parameters
+    ----------
+    argv : list, optional
+        Arguments to parse instead of the command line; default is None.
+
+    Returns
+    -------
+    run : dict
+        Machine-readable description of the environment and the results.
+    """
+    args = get_args(argv)
+    if args["files"]:
+        datasets = [
+            ("custom", args["files"], args["size"], args["layout"]),
+        ]
+    else:
+        datasets = [(name,) + PRESETS[name] for name in args["preset"]]
+
+    previous = load_runs(args["output"])
+    run = run_benchmarks(datasets, sha=args["sha"], tmpdir=args["tmpdir"])
+    compare_runs(previous[-1] if previous else {}, run)
+    with open(args["output"], "a") as f:
+        f.write(json.dumps(run))
+        f.write("\n")
+    return run
+
+
+if __name__ == "__main__":
+    main()
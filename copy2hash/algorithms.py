@@ -0,0 +1,253 @@
+"""Registry of the hash algorithms for copy2hash."""
+
+######################################################
+#
+# algorithms: - registry of the secure and fast hash
+# algorithms, which can be extended by other packages
+# via the `copy2hash.algorithms` entry point
+#
+######################################################
+
+from functools import partial
+import hashlib as hlib
+import time
+
+# Entry point group for registering hash algorithms from other packages
+ENTRY_POINT_GROUP = "copy2hash.algorithms"
+
+_REGISTRY = {}
+_ENTRY_POINTS_LOADED = False
+
+
+class HashAlgorithm:
+    """Hash algorithm of the registry.
+
+    Parameters
+    ----------
+    name : str
+        Name of the hash algorithm, which is used as SHA key.
+    constructor : callable
+        Callable without arguments returning a new hash object with the methods
+        `update()` and `hexdigest()` like the constructors of `hashlib`.
+    digest_size : int
+        Length of the digest in bytes.
+    length : int, optional
+        Length of the digest in bytes for extendable-output functions like
+        `shake_128`, which need the length for `hexdigest()`; default is None.
+    tier : str, optional
+        Tier of the hash algorithm: 'secure' for the secure hash algorithms, 'fast'
+        for the fast non-cryptographic ones, or 'external' for the ones of other
+        packages; default is 'secure'.
+
+    Attributes
+    ----------
+    throughput : float
+        Measured throughput in bytes per second; None until measure_throughput() is
+        called.
+    """
+
+    __slots__ = ("name", "constructor", "digest_size", "length", "tier", "throughput")
+
+    def __init__(self, name, constructor, digest_size, length=None, tier="secure"):
+        """Initialise the hash algorithm."""
+        self.name = name
+        self.constructor = constructor
+        self.digest_size = digest_size
+        self.length = length
+        self.tier = tier
+        self.throughput = None
+
+    def new(self):
+        """Return a new hash object of the hash algorithm."""
+        return self.constructor()
+
+    def hexdigest(self, hcode):
+        """Return the digest of the hash object in hexadecimal format.
+
+        Parameters
+        ----------
+        hcode : object
+            Hash object of the hash algorithm.
+
+        Returns
+        -------
+        str
+            The digest in hexadecimal format.
+        """
+        if self.length:
+            return hcode.hexdigest(self.length)
+        return hcode.hexdigest()
+
+    def measure_throughput(self, nbytes=16 * 1024 * 1024, chunk_size=1024 * 1024):
+        """Measure the throughput of the hash algorithm.
+
+        Parameters
+        ----------
+        nbytes : int, optional
+            Number of bytes to hash, by default 16 MiB.
+        chunk_size : int, optional
+            Size of the chunks in bytes, by default 1 MiB.
+
+        Returns
+        -------
+        throughput : float
+            Throughput in bytes per second.
+        """
+        chunk = bytes(chunk_size)
+        hcode = self.new()
+        start = time.perf_counter()
+        for _ in range(max(1, nbytes // chunk_size)):
+            hcode.update(chunk)
+        self.hexdigest(hcode)
+        elapsed = time.perf_counter() - start
+        self.throughput = max(1, nbytes // chunk_size) * chunk_size / max(elapsed, 1e-9)
+        return self.throughput
+
+
+def register(name, constructor, digest_size=None, length=None, tier="secure"):
+    """Register a hash algorithm.
+
+    Parameters
+    ----------
+    name : str
+        Name of the hash algorithm, which is used as SHA key.
+    constructor : callable
+        Callable without arguments returning a new hash object.
+    digest_size : int, optional
+        Length of the digest in bytes; by default, it is taken from a new hash object.
+    length : int, optional
+        Length of the digest in bytes for extendable-output functions.
+    tier : str, optional
+        Tier of the hash algorithm; default is 'secure'.
+
+    Returns
+    -------
+    algorithm : HashAlgorithm
+        The registered hash algorithm.
+    """
+    if digest_size is None:
+        digest_size = length or constructor().digest_size
+    algorithm = HashAlgorithm(name, constructor, digest_size, length=length, tier=tier)
+    _REGISTRY[name] = algorithm
+    return algorithm
+
+
+def _iter_entry_points():
+    """Return the entry points of the `copy2hash.algorithms` group."""
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # Python < 3.8
+        try:
+            import pkg_resources
+        except ImportError:
+            return []
+        return list(pkg_resources.iter_entry_points(ENTRY_POINT_GROUP))
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        return eps.select(group=ENTRY_POINT_GROUP)
+    return eps.get(ENTRY_POINT_GROUP, [])
+
+
+def load_entry_points():
+    """Register the hash algorithms of other packages.
+
+    The entry points of the `copy2hash.algorithms` group are loaded only once. An
+    entry point can either refer to a HashAlgorithm or to a constructor, which is
+    registered with the name of the entry point in the 'external' tier.
+    """
+    global _ENTRY_POINTS_LOADED
+    if _ENTRY_POINTS_LOADED:
+        return
+    _ENTRY_POINTS_LOADED = True
+    for entry_point in _iter_entry_points():
+        obj = entry_point.load()
+        if isinstance(obj, HashAlgorithm):
+            _REGISTRY[obj.name] = obj
+        else:
+            register(entry_point.name, obj, tier="external")
+
+
+def get(name):
+    """Get a registered hash algorithm.
+
+    Parameters
+    ----------
+    name : str
+        Name of the hash algorithm.
+
+    Returns
+    -------
+    algorithm : HashAlgorithm
+        The registered hash algorithm.
+
+    Raises
+    ------
+    KeyError
+        If the hash algorithm is not registered.
+    """
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        load_entry_points()
+    return _REGISTRY[name]
+
+
+def is_available(name):
+    """Check if a hash algorithm is registered.
+
+    Parameters
+    ----------
+    name : str
+        Name of the hash algorithm.
+
+    Returns
+    -------
+    bool
+        True if the hash algorithm is registered.
+    """
+    try:
+        get(name)
+    except KeyError:
+        return False
+    return True
+
+
+def available():
+    """Return the names of all registered hash algorithms."""
+    load_entry_points()
+    return list(_REGISTRY)
+
+
+# Secure hash algorithms of hashlib
+for _name in (
+    "sha1",
+    "sha224",
+    "sha256",
+    "sha384",
+    "sha512",
+    "blake2b",
+    "blake2s",
+    "md5",
+    "sha3_224",
+    "sha3_256",
+    "sha3_384",
+    "sha3_512",
+):
+    #  deepcode ignore insecureHash: <because the option is needed>
+    register(_name, getattr(hlib, _name))
+register("shake_128", hlib.shake_128, length=32)
+register("shake_256", hlib.shake_256, length=32)
+
+# Fast hash algorithms with a reduced digest size
+register("blake2b_64", partial(hlib.blake2b, digest_size=8), tier="fast")
+register("blake2b_128", partial(hlib.blake2b, digest_size=16), tier="fast")
+
+# Optional fast non-cryptographic hash algorithms
+try:
+    import xxhash
+except ImportError:
+    pass
+else:
+    register("xxh64", xxhash.xxh64, tier="fast")
+    if hasattr(xxhash, "xxh3_128"):
+        register("xxh3_128", xxhash.xxh3_128, tier="fast")
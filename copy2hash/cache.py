@@ -0,0 +1,189 @@
+"""Persistent cache of the file content hashes for copy2hash.
+
+sqlite3 is imported when a cache is opened, because only runs with a cache need it.
+"""
+
+######################################################
+#
+# cache: - skipping the re-hashing of unchanged files
+# via a SQLite database keyed by the file identity
+#
+######################################################
+
+import os
+import threading
+import time
+
+# Number of pending writes, which are written together in one transaction
+CACHE_BATCH_SIZE = 1024
+# Files modified in the last seconds are not cached, because a later modification
+# within the resolution of the timestamps would not change their identity
+CACHE_RACY_SECONDS = 2.0
+
+
+class HashCache:
+    """Persistent cache of the file content hashes.
+
+    The hexdigests are keyed by the device, the inode, and the hash algorithm. An entry
+    is only valid, if the size and the modification time of the file are unchanged.
+    The writes are collected and written in batches of CACHE_BATCH_SIZE entries.
+
+    Parameters
+    ----------
+    fname : str
+        Filename of the SQLite database of the cache.
+    max_age : float, optional
+        Maximum age in days of the entries since their last usage; default is None for
+        no eviction by age.
+    max_entries : int, optional
+        Maximum number of entries; the least recently used ones are evicted. Default is
+        None for no eviction by size.
+    """
+
+    def __init__(self, fname, max_age=None, max_entries=None):
+        """Initialise the cache and create the database if necessary."""
+        self.fname = fname
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._stores = []
+        self._touches = []
+        import sqlite3
+
+        self.connection = sqlite3.connect(fname, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS hashes ("
+                "device INTEGER, inode INTEGER, algorithm TEXT, size INTEGER, "
+                "mtime_ns INTEGER, hexdigest TEXT, used REAL, "
+                "PRIMARY KEY (device, inode, algorithm)) WITHOUT ROWID"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS hashes_used ON hashes (used)"
+            )
+
+    @staticmethod
+    def identity(fname):
+        """Get the identity of a file.
+
+        Parameters
+        ----------
+        fname : str
+            Filename including the parent directory.
+
+        Returns
+        -------
+        identity : tuple
+            Device, inode, size, and modification time in nanoseconds of the file.
+        """
+        st = os.stat(fname)
+        return st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns
+
+    def lookup(self, identity, sha_keys):
+        """Look up the hexdigests of a file.
+
+        Parameters
+        ----------
+        identity : tuple
+            Identity of the file from identity().
+        sha_keys : list
+            Reference SHA keys of the secured hash algorithms.
+
+        Returns
+        -------
+        hcodes : list
+            The hexdigests for every SHA key, or None if any of them is not cached.
+        """
+        device, inode, size, mtime_ns = identity
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT algorithm, hexdigest FROM hashes "
+                "WHERE device = ? AND inode = ? AND size = ? AND mtime_ns = ?",
+                (device, inode, size, mtime_ns),
+            ).fetchall()
+            hcodes = dict(rows)
+            if not all(sha_key in hcodes for sha_key in sha_keys):
+                self.misses += 1
+                return None
+            self.hits += 1
+            now = time.time()
+            self._touches.extend((now, device, inode, sha_key) for sha_key in sha_keys)
+            if len(self._touches) >= CACHE_BATCH_SIZE:
+                self._flush()
+        return [hcodes[sha_key] for sha_key in sha_keys]
+
+    def store(self, identity, sha_keys, hcodes):
+        """Store the hexdigests of a file.
+
+        Parameters
+        ----------
+        identity : tuple
+            Identity of the file from identity() before the hashing.
+        sha_keys : list
+            Reference SHA keys of the secured hash algorithms.
+        hcodes : list
+            The hexdigests for every SHA key.
+        """
+        device, inode, size, mtime_ns = identity
+        now = time.time()
+        if mtime_ns > (now - CACHE_RACY_SECONDS) * 1e9:
+            return
+        with self._lock:
+            self._stores.extend(
+                (device, inode, sha_key, size, mtime_ns, hcode, now)
+                for sha_key, hcode in zip(sha_keys, hcodes)
+            )
+            if len(self._stores) >= CACHE_BATCH_SIZE:
+                self._flush()
+
+    def flush(self):
+        """Write the pending entries to the database."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        """Write the pending entries in one transaction; the lock must be held."""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?, ?)",
+                self._stores,
+            )
+            self.connection.executemany(
+                "UPDATE hashes SET used = ? "
+                "WHERE device = ? AND inode = ? AND algorithm = ?",
+                self._touches,
+            )
+        self._stores = []
+        self._touches = []
+
+    def evict(self):
+        """Evict the entries by their age and by the maximum number of entries."""
+        with self._lock, self.connection:
+            if self.max_age is not None:
+                self.connection.execute(
+                    "DELETE FROM hashes WHERE used < ?",
+                    (time.time() - self.max_age * 86400.0,),
+                )
+            if self.max_entries is not None:
+                # Row values need SQLite 3.15, and the table has no rowid, so the
+                # evicted keys are deleted one by one
+                evicted = self.connection.execute(
+                    "SELECT device, inode, algorithm FROM hashes "
+                    "ORDER BY used DESC LIMIT -1 OFFSET ?",
+                    (self.max_entries,),
+                ).fetchall()
+                self.connection.executemany(
+                    "DELETE FROM hashes "
+                    "WHERE device = ? AND inode = ? AND algorithm = ?",
+                    evicted,
+                )
+
+    def close(self):
+        """Write the pending entries, evict the old ones, and close the database."""
+        self.flush()
+        self.evict()
+        self.connection.close()
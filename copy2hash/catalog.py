@@ -0,0 +1,204 @@
+"""Indexed SQLite catalog of the hash-secured filenames for copy2hash.
+
+The catalog is only used by the SQLite reports and the lookup, so sqlite3 is not
+imported before a catalog is opened.
+"""
+
+######################################################
+#
+# catalog: - SQLite report with indexes on the hash
+# name, the original filename, and the directory for
+# the reverse lookup of the original file(s)
+#
+######################################################
+
+from pathlib import Path
+import threading
+
+# Columns of the catalog; one row per file and SHA key
+CATALOG_COLUMNS = (
+    "hashname",
+    "sha_key",
+    "filename",
+    "home_dir",
+    "copy_dir",
+    "mode",
+    "method",
+    "file_index",
+)
+# Columns of the report, which are not SHA keys
+_REPORT_COLUMNS = (
+    "index",
+    "filename",
+    "mode",
+    "home_dir",
+    "copy_dir",
+    "method",
+    "duplicate_of",
+)
+
+
+class Catalog:
+    """Indexed SQLite catalog of the hash-secured filenames.
+
+    The catalog is an SQLite report, which can be written row by row like the
+    streaming reports. Every run adds its files to the catalog; a file, which is
+    copied or moved again to the same hash-secured filename, replaces its old row.
+    The rows of every batch are inserted in one transaction. The stages of the
+    asynchronous pipeline open, write, and close the catalog on different threads,
+    so the connection is shared between the threads and locked.
+
+    Parameters
+    ----------
+    fname : str
+        Filename of the SQLite database of the catalog.
+    columns : list, optional
+        Names of the columns of the report rows, which are written; the SHA keys are
+        the last columns. Default is None for only looking up.
+    """
+
+    def __init__(self, fname, columns=None):
+        """Open the catalog and create the tables and indexes if necessary."""
+        self.fname = fname
+        self.columns = list(columns) if columns else []
+        self.sha_keys = [
+            column for column in self.columns if column not in _REPORT_COLUMNS
+        ]
+        if self.columns:
+            Path(fname).parent.mkdir(parents=True, exist_ok=True)
+        import sqlite3
+
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(fname, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS catalog ("
+                "hashname TEXT NOT NULL, sha_key TEXT, filename TEXT NOT NULL, "
+                "home_dir TEXT NOT NULL, copy_dir TEXT NOT NULL, mode TEXT, "
+                "method TEXT, file_index INTEGER, "
+                "PRIMARY KEY (hashname, copy_dir, home_dir, filename)) WITHOUT ROWID"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS catalog_filename ON catalog (filename)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS catalog_home_dir ON catalog (home_dir)"
+            )
+
+    def write_rows(self, rows):
+        """Insert a batch of report rows in one transaction.
+
+        Parameters
+        ----------
+        rows : iterable
+            Rows of the report in the order of the columns; every hash-secured
+            filename becomes one row of the catalog. The shard directories of nested
+            hash-secured filenames like 'ab/cd/abcd...' are moved to the copy
+            directory, so they are found by their hash.
+        """
+        positions = [
+            self.columns.index(column)
+            for column in (
+                "index",
+                "filename",
+                "mode",
+                "home_dir",
+                "copy_dir",
+                "method",
+            )
+        ]
+        n_report = len(self.columns) - len(self.sha_keys)
+        entries = []
+        for row in rows:
+            file_index, filename, mode, home_dir, copy_dir, method = (
+                row[position] for position in positions
+            )
+            hashnames = row[n_report:]
+            for sha_key, hashname in zip(self.sha_keys, hashnames):
+                if hashname is None:
+                    continue
+                # The shard directories of a nested hashname belong to its directory
+                shard, _, hashname = hashname.rpartition("/")
+                entries.append(
+                    (
+                        hashname,
+                        sha_key,
+                        filename,
+                        home_dir,
+                        f"{copy_dir}/{shard}" if shard else copy_dir,
+                        mode,
+                        method,
+                        file_index,
+                    )
+                )
+        with self._lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO catalog ({}) VALUES ({})".format(
+                    ", ".join(CATALOG_COLUMNS), ", ".join("?" * len(CATALOG_COLUMNS))
+                ),
+                entries,
+            )
+
+    def lookup(self, hashname, prefix=False):
+        """Look up the original file(s) of a hash-secured filename.
+
+        Parameters
+        ----------
+        hashname : str
+            Hash-secured filename, which can include the file-extension.
+        prefix : bool, optional
+            If True, all hash-secured filenames starting with `hashname` are found;
+            default is False.
+
+        Returns
+        -------
+        rows : list
+            Rows of the catalog as dictionaries.
+        """
+        if not prefix:
+            query = "SELECT * FROM catalog WHERE hashname = ?", (hashname,)
+        elif hashname:
+            # A range on the primary key instead of LIKE, which cannot use the index
+            end = hashname[:-1] + chr(ord(hashname[-1]) + 1)
+            query = (
+                "SELECT * FROM catalog WHERE hashname >= ? AND hashname < ?",
+                (hashname, end),
+            )
+        else:
+            query = "SELECT * FROM catalog", ()
+        return self._select(*query)
+
+    def lookup_filename(self, filename, home_dir=None):
+        """Look up the hash-secured filename(s) of an original file.
+
+        Parameters
+        ----------
+        filename : str
+            Original filename without the parent path.
+        home_dir : str, optional
+            Parent path of the original file; default is None for all directories.
+
+        Returns
+        -------
+        rows : list
+            Rows of the catalog as dictionaries.
+        """
+        if home_dir is None:
+            return self._select("SELECT * FROM catalog WHERE filename = ?", (filename,))
+        return self._select(
+            "SELECT * FROM catalog WHERE filename = ? AND home_dir = ?",
+            (filename, home_dir),
+        )
+
+    def _select(self, query, parameters):
+        """Run a query of the catalog and get its rows as dictionaries."""
+        with self._lock:
+            return [dict(row) for row in self.connection.execute(query, parameters)]
+
+    def close(self):
+        """Close the catalog."""
+        with self._lock:
+            self.connection.close()
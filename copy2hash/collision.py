@@ -0,0 +1,173 @@
+"""Index of the generated hash-secured filenames for copy2hash.
+
+Only large runs spill to the disk, so sqlite3 and tempfile are imported with the
+first spill.
+"""
+
+######################################################
+#
+# collision: - finding two files, which are copied or
+# moved to the same hash-secured filename, with a
+# bounded memory via a Bloom filter and an SQLite spill
+#
+######################################################
+
+import hashlib as hlib
+import os
+
+# Number of names, which are kept in memory before they are spilled to the disk
+MEMORY_ENTRIES = 1000000
+# Number of bits of the Bloom filter of the spilled names; 128 MiB
+BLOOM_BITS = 2**30
+# Number of bit positions per name in the Bloom filter
+BLOOM_HASHES = 7
+# Maximum number of new names, which are written to the spill together
+SPILL_BATCH_SIZE = 65536
+
+
+class CollisionIndex:
+    """Index of the generated hash-secured filenames of a run.
+
+    Every name is kept as 16 byte digest. The first `max_entries` digests are kept
+    in a set of about 100 bytes per name. Beyond them, all digests are spilled to a
+    temporary SQLite database with a Bloom filter of a fixed size in front, so the
+    memory stays bounded for any number of names: most new names are recognized by
+    the Bloom filter without a query.
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        Number of names, which are kept in memory; default is MEMORY_ENTRIES.
+    bloom_bits : int, optional
+        Number of bits of the Bloom filter after the spill; default is BLOOM_BITS.
+    spill_dir : str, optional
+        Directory of the spill; default is None for the temporary directory of the
+        system.
+
+    Attributes
+    ----------
+    n_names : int
+        Number of indexed names.
+    n_collisions : int
+        Number of names, which were already indexed.
+    """
+
+    def __init__(
+        self, max_entries=MEMORY_ENTRIES, bloom_bits=BLOOM_BITS, spill_dir=None
+    ):
+        """Initialise the empty index."""
+        self.max_entries = max_entries
+        self.bloom_bits = bloom_bits
+        self.spill_dir = spill_dir
+        self.n_names = 0
+        self.n_collisions = 0
+        self._digests = set()
+        self._bloom = None
+        self._connection = None
+        self._fname = None
+
+    @staticmethod
+    def digest(name):
+        """Get the digest of a name for the index.
+
+        Parameters
+        ----------
+        name : str
+            Full hash-secured filename including the copy directory.
+
+        Returns
+        -------
+        digest : bytes
+            The 16 byte digest of the name.
+        """
+        return hlib.blake2b(name.encode("utf-8"), digest_size=16).digest()
+
+    def add(self, name):
+        """Add a name to the index.
+
+        Parameters
+        ----------
+        name : str
+            Full hash-secured filename including the copy directory.
+
+        Returns
+        -------
+        bool
+            True if the name is new, False if it collides with an indexed name.
+        """
+        digest = self.digest(name)
+        if digest in self._digests or (
+            self._bloom is not None and self._spilled(digest)
+        ):
+            self.n_collisions += 1
+            return False
+        self._digests.add(digest)
+        self.n_names += 1
+        if self._bloom is not None:
+            self._set_bits(digest)
+            if len(self._digests) >= min(SPILL_BATCH_SIZE, self.max_entries):
+                self._write_spill()
+        elif len(self._digests) >= self.max_entries:
+            self._start_spill()
+        return True
+
+    def _positions(self, digest):
+        """Get the bit positions of a digest in the Bloom filter."""
+        h_1 = int.from_bytes(digest[:8], "little")
+        h_2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h_1 + i * h_2) % self.bloom_bits for i in range(BLOOM_HASHES))
+
+    def _set_bits(self, digest):
+        """Set the bits of a digest in the Bloom filter."""
+        for position in self._positions(digest):
+            self._bloom[position >> 3] |= 1 << (position & 7)
+
+    def _spilled(self, digest):
+        """Check if a digest is in the spill."""
+        if not all(
+            self._bloom[position >> 3] & (1 << (position & 7))
+            for position in self._positions(digest)
+        ):
+            return False
+        cursor = self._connection.execute(
+            "SELECT 1 FROM names WHERE digest = ?", (digest,)
+        )
+        return cursor.fetchone() is not None
+
+    def _start_spill(self):
+        """Move the digests from the memory to the spill and the Bloom filter."""
+        import sqlite3
+        import tempfile
+
+        fd, self._fname = tempfile.mkstemp(
+            prefix="copy2hash_names_", suffix=".sqlite", dir=self.spill_dir
+        )
+        os.close(fd)
+        # The hashing stage of the pipeline can run on any of its threads
+        self._connection = sqlite3.connect(self._fname, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=OFF")
+        self._connection.execute("PRAGMA synchronous=OFF")
+        self._connection.execute(
+            "CREATE TABLE names (digest BLOB PRIMARY KEY) WITHOUT ROWID"
+        )
+        self._bloom = bytearray((self.bloom_bits + 7) // 8)
+        for digest in self._digests:
+            self._set_bits(digest)
+        self._write_spill()
+
+    def _write_spill(self):
+        """Write the digests in the memory to the spill."""
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO names VALUES (?)", ((digest,) for digest in self._digests)
+            )
+        self._digests = set()
+
+    def close(self):
+        """Close the index and remove its spill."""
+        self._digests = set()
+        self._bloom = None
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+            os.unlink(self._fname)
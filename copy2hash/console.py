@@ -0,0 +1,196 @@
+"""Buffered terminal output and progress display for copy2hash."""
+
+######################################################
+#
+# console: - collecting the messages in a buffer, which
+# is written in blocks, and showing the throughput and
+# the ETA of a run a few times per second
+#
+######################################################
+
+import atexit
+import sys
+import threading
+import time
+
+# Number of buffered messages, which are written together
+LOG_BUFFER_SIZE = 256
+# Minimum number of seconds between two refreshes of the progress display
+PROGRESS_INTERVAL = 0.25
+
+# Prefixes of the modes of the messages
+_PREFIXES = {1: "[ERROR] ", 2: "[VERBOSE] ", 3: "[WARNING] "}
+
+
+class Console:
+    """Buffered, level-filtered output of the messages.
+
+    The messages are collected and written in blocks of LOG_BUFFER_SIZE messages
+    instead of one `print()` per message. Errors and warnings are written
+    immediately together with the messages before them, so problems of single files
+    are not reported late. The message is only formatted with its arguments, if it
+    is written, so filtered verbose messages cost nothing but the call. The stages
+    of the pipeline log from several threads, so the buffer is locked.
+
+    Parameters
+    ----------
+    stream : file, optional
+        Stream of the messages; default is None for the current `sys.stdout`.
+    buffer_size : int, optional
+        Number of buffered messages; default is LOG_BUFFER_SIZE.
+
+    Attributes
+    ----------
+    verbose : bool
+        If False, the verbose messages are dropped; default is True.
+    """
+
+    def __init__(self, stream=None, buffer_size=LOG_BUFFER_SIZE):
+        """Initialise the empty buffer."""
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.verbose = True
+        self._lines = []
+        self._lock = threading.Lock()
+
+    def log(self, msg, mode=None, *args):
+        """Buffer a message.
+
+        Parameters
+        ----------
+        msg : str
+            Message, which is formatted with the arguments via `str.format()`.
+        mode : int, optional
+            If mode is activated, message becomes for:
+            1. an error message
+            2. a verbose message
+            3. a warning message
+        *args
+            Arguments of the message.
+        """
+        if mode == 2 and not self.verbose:
+            return
+        if args:
+            msg = msg.format(*args)
+        line = f"{_PREFIXES.get(mode, '')}{msg}\n"
+        with self._lock:
+            self._lines.append(line)
+            if mode in (1, 3) or len(self._lines) >= self.buffer_size:
+                self._flush()
+
+    def flush(self):
+        """Write the buffered messages."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        """Write the buffered messages, while the buffer is locked."""
+        if not self._lines:
+            return
+        lines, self._lines = self._lines, []
+        stream = self.stream or sys.stdout
+        stream.write("".join(lines))
+        stream.flush()
+
+
+class Progress:
+    """Rate-limited display of the processed files, the throughput, and the ETA.
+
+    update() is called for every processed file, but the display is only refreshed
+    every PROGRESS_INTERVAL seconds, independent of the number of files per second.
+    On a terminal, the display is refreshed in place.
+
+    Parameters
+    ----------
+    total : int, optional
+        Number of files of the run for the ETA; default is None for an unknown
+        number like in the recursive mode.
+    stream : file, optional
+        Stream of the display; default is None for the current `sys.stderr`.
+    interval : float, optional
+        Minimum number of seconds between two refreshes; default is
+        PROGRESS_INTERVAL.
+    """
+
+    def __init__(self, total=None, stream=None, interval=PROGRESS_INTERVAL):
+        """Initialise the counters and start the clock."""
+        self.total = total
+        self.stream = stream
+        self.interval = interval
+        self.files = 0
+        self.nbytes = 0
+        self._start = time.monotonic()
+        self._next = self._start + interval
+        self._width = 0
+
+    def update(self, files=1, nbytes=0):
+        """Count processed files and refresh the display, if it is due.
+
+        Parameters
+        ----------
+        files : int, optional
+            Number of processed files; default is 1.
+        nbytes : int, optional
+            Number of processed bytes; default is 0.
+        """
+        self.files += files
+        self.nbytes += nbytes
+        now = time.monotonic()
+        if now >= self._next:
+            self._next = now + self.interval
+            self.refresh(now)
+
+    def format(self, now):
+        """Format the display.
+
+        Parameters
+        ----------
+        now : float
+            Current time of `time.monotonic()`.
+
+        Returns
+        -------
+        line : str
+            The processed files, the files and MB per second, and the ETA.
+        """
+        seconds = max(now - self._start, 1e-9)
+        rate = self.files / seconds
+        line = (
+            f"[PROGRESS] {self.files}"
+            + (f"/{self.total}" if self.total else "")
+            + f" files, {rate:.1f} files/s, {self.nbytes / seconds / 1e6:.1f} MB/s"
+        )
+        if self.total and rate > 0:
+            eta = int(max(self.total - self.files, 0) / rate)
+            line += f", ETA {eta // 3600}:{eta // 60 % 60:02d}:{eta % 60:02d}"
+        return line
+
+    def refresh(self, now=None):
+        """Write the display.
+
+        Parameters
+        ----------
+        now : float, optional
+            Current time of `time.monotonic()`; default is None for the clock.
+        """
+        line = self.format(time.monotonic() if now is None else now)
+        stream = self.stream or sys.stderr
+        if stream.isatty():
+            stream.write(f"\r{line:<{self._width}}")
+            self._width = len(line)
+        else:
+            stream.write(f"{line}\n")
+        stream.flush()
+
+    def close(self):
+        """Write the final display."""
+        self.refresh()
+        stream = self.stream or sys.stderr
+        if stream.isatty():
+            stream.write("\n")
+            stream.flush()
+
+
+# Console of the messages of copy2hash, which is flushed at the exit
+CONSOLE = Console()
+atexit.register(CONSOLE.flush)
@@ -10,27 +10,58 @@
 ######################################################
 
 import argparse
-import hashlib as hlib
+from collections import deque
+from functools import lru_cache
+from itertools import chain, count, islice
+import os
 from pathlib import Path
-from shutil import copy, SameFileError
+from shutil import SameFileError
 import sys
 
-# imported fileformats
-import csv
-import json
-import pickle
-import yaml
-from dict2xml import dict2xml
+# The fileformats of the reports, asyncio, and the pools are imported, when they are
+# needed, because importing them dominates the start of small runs
 
 try:
     from . import __version__
+    from . import algorithms, fileio, report, walker
+    from .cache import HashCache
+    from .catalog import Catalog
+    from .collision import CollisionIndex
+    from .console import CONSOLE, Progress
+    from .dedupe import Deduplicator
+    from .journal import Journal
+    from .stats import RunStats
 except ImportError:
     from __init__ import __version__
-
-
-def log(msg, mode=None):
+    import algorithms
+    import fileio
+    import report
+    import walker
+    from cache import HashCache
+    from catalog import Catalog
+    from collision import CollisionIndex
+    from console import CONSOLE, Progress
+    from dedupe import Deduplicator
+    from journal import Journal
+    from stats import RunStats
+
+# Minimum number of files for hashing the file content on a pool of processes
+POOL_MIN_FILES = 64
+# Number of files, which are hashed and copied or moved together
+RECORD_BATCH_SIZE = 1024
+# Maximum number of batches between two stages of the asynchronous pipeline
+PIPELINE_QUEUE_SIZE = 2
+# Maximum number of memoized filenames for the hashing of the filenames
+NAME_CACHE_SIZE = 65536
+
+
+def log(msg, mode=None, *args):
     """Print messages to display.
 
+    The messages are buffered and written in blocks by `console.CONSOLE`; errors and
+    warnings are written immediately. Verbose messages are dropped without
+    formatting them, if the verbose mode is off.
+
     Parameters
     ----------
     msg : str
@@ -40,18 +71,14 @@ def log(msg, mode=None):
         1. an error message
         2. a verbose message
         3. a warning message
+    *args
+        Arguments, which are formatted into the message via `str.format()` only if it
+        is printed.
     """
-    if mode == 1:
-        print(f"[ERROR] {msg}")
-    elif mode == 2:
-        print(f"[VERBOSE] {msg}")
-    elif mode == 3:
-        print(f"[WARNING] {msg}")
-    else:
-        print(msg)
+    CONSOLE.log(msg, mode, *args)
 
 
-if sys.version < "3.6":
+if sys.version_info < (3, 6):
     log("Unsupported Python Version (version < 3.6)!", 1)
     sys.exit(1)
 
@@ -90,6 +117,11 @@ class SHAKeys:
     shake_256 : str
         String for calling secure hash and message digest algorithms [1,4,5].
 
+    Notes
+    -----
+    The hash algorithms are registered in `copy2hash.algorithms`, which also holds
+    the fast hash algorithms and the ones of other packages.
+
     References
     ----------
     .. [1] https://docs.python.org/3/library/hashlib.html
@@ -123,7 +155,8 @@ class ExportReport:
     supports the follwing fileformats: 'csv', 'json', 'pkl', 'txt', 'yaml', and 'xml'.
     It is also possible to export a `pure` ASCII file with an individual
     file-extension. Furthemore, also a combinition of different fileformats can be
-    chosen.
+    chosen. The formats 'csv', 'json', 'jsonl', 'sqlite', 'txt', and the individual
+    file-extensions can also be streamed row by row while the files are processed.
 
     Parameters
     ----------
@@ -134,8 +167,23 @@ class ExportReport:
     def __init__(self, args):
         """Initialise the class."""
         self.args = args
+        self._streams = []
+
+    def report_fname(self):
+        """Get the filename of the report without the file-extension.
+
+        Returns
+        -------
+        fname : Path
+            Filename of the report in the copy directory.
+        """
+        if self.args["directory"]:
+            return Path(
+                "{}/{}".format(self.args["directory"], self.args["report_name"])
+            )
+        return Path("./{}".format(self.args["report_name"]))
 
-    def make_export(self, copy_dict):
+    def make_export(self, copy_dict, formats=None):
         """Make a report of the copying and moving of the files.
 
         Parameters
@@ -143,19 +191,22 @@ class ExportReport:
         copy_dict : dir
             Internal dictionary will be used first for copying or moving the file(s),
             and after cleaning this dictionary will be used for generating the report.
+        formats : list, optional
+            Report formats; default is None for the ones of the parser.
         """
-        if self.args["directory"]:
-            fname = Path(
-                "{}/{}".format(self.args["directory"], self.args["report_name"])
-            )
-        else:
-            fname = Path("./{}".format(self.args["report_name"]))
+        fname = self.report_fname()
+        if formats is None:
+            formats = self.args["report"]
 
-        for key in self.args["report"]:
+        for key in formats:
             if key == "csv":
                 self.write_csv(copy_dict, fname)
             elif key == "json":
                 self.write_json(copy_dict, fname)
+            elif key == "jsonl":
+                self.write_jsonl(copy_dict, fname)
+            elif key == "sqlite":
+                self.write_sqlite(copy_dict, fname)
             elif key == "pkl":
                 self.write_pickle(copy_dict, fname)
             elif key == "txt":
@@ -179,6 +230,8 @@ class ExportReport:
         fname : str
             Filename of the report.
         """
+        import csv
+
         with open(f"{fname}.csv", "w+") as f:  # Just use 'w' mode in 3.x
             writer = csv.writer(f)
             writer.writerow(copy_dict.keys())
@@ -196,10 +249,91 @@ class ExportReport:
         fname : str
             Filename of the report.
         """
+        import json
+
         json_file = json.dumps(copy_dict, indent=4)
         with open(f"{fname}.json", "w+") as f:
             f.write(json_file)
 
+    @staticmethod
+    def write_jsonl(copy_dict, fname):
+        """Copy-Report in the `JSON Lines`-format with one object per file.
+
+        Parameters
+        ----------
+        copy_dict : str
+            Internal dictionary will be used first for copying or moving the file(s),
+            and after cleaning this dictionary will be used for generating the report.
+        fname : str
+            Filename of the report.
+        """
+        import json
+
+        with open(f"{fname}.jsonl", "w+") as f:
+            for row in zip(*copy_dict.values()):
+                f.write(json.dumps(dict(zip(copy_dict, row))))
+                f.write("\n")
+
+    @staticmethod
+    def write_sqlite(copy_dict, fname):
+        """Copy-Report as indexed `SQLite`-catalog for the reverse lookup.
+
+        Parameters
+        ----------
+        copy_dict : str
+            Internal dictionary will be used first for copying or moving the file(s),
+            and after cleaning this dictionary will be used for generating the report.
+        fname : str
+            Filename of the report.
+        """
+        catalog = Catalog(f"{fname}.sqlite", copy_dict.keys())
+        try:
+            catalog.write_rows(zip(*copy_dict.values()))
+        finally:
+            catalog.close()
+
+    def open_streams(self, columns):
+        """Open the streaming reports.
+
+        Only the report formats, which can be written row by row, are opened; the
+        others have to be written by make_export() at the end.
+
+        Parameters
+        ----------
+        columns : list
+            Names of the columns of the report.
+
+        Returns
+        -------
+        formats : list
+            The report formats, which are not streamed.
+        """
+        fname = self.report_fname()
+        formats = []
+        for key in self.args["report"]:
+            if key in report.BATCH_FORMATS:
+                formats.append(key)
+            else:
+                self._streams.append(report.open_stream(fname, key, columns))
+        return formats
+
+    def write_streams(self, rows):
+        """Write a batch of rows to the streaming reports.
+
+        Parameters
+        ----------
+        rows : list
+            Rows of the report in the order of the columns.
+        """
+        for stream in self._streams:
+            stream.write_rows(rows)
+
+    def close_streams(self):
+        """Close the streaming reports."""
+        for stream in self._streams:
+            stream.close()
+        self._streams = []
+
     @staticmethod
     def write_pickle(copy_dict, fname):
         """Copy-Report in the `pickel`-format.
@@ -212,6 +346,8 @@ class ExportReport:
         fname : str
             Filename of the report.
         """
+        import pickle
+
         with open(f"{fname}.pkl", "wb+") as f:
             pickle.dump(copy_dict, f)
 
@@ -229,6 +365,8 @@ class ExportReport:
         fxt : str
             The individual file extension from the parser.
         """
+        import csv
+
         with open(f"{fname}.{fxt}", "w+") as f:  # Just use 'w' mode in 3.x
             writer = csv.writer(f, delimiter="\t")
             writer.writerow(copy_dict.keys())
@@ -246,6 +384,8 @@ class ExportReport:
         fname : str
             Filename of the report.
         """
+        import yaml
+
         yaml_file = yaml.dump(copy_dict, indent=4)
         with open(f"{fname}.yaml", "w+") as f:
             f.write(yaml_file)
@@ -262,12 +402,14 @@ class ExportReport:
         fname : str
             Filename of the report.
         """
+        from dict2xml import dict2xml
+
         with open(f"{fname}.xml", "w+") as f:
             f.write(dict2xml(copy_dict, wrap="all", indent="  "))
 
 
 class HashTag:
-    """Hash Generation of the current filename.
+    """Hash Generation of the current filename or file content.
 
     Parameters
     ----------
@@ -278,6 +420,14 @@ class HashTag:
     ----------
     hname : str
         hash-secured filename.
+    cache : HashCache
+        Persistent cache of the file content hashes; None if it is not used.
+    executor : ProcessPoolExecutor
+        Pool of processes, which is kept for several calls of hash_contents(); None
+        for a new pool per call.
+    keep_pool : bool
+        If True, the pool of processes is started by the first call of
+        hash_contents(), which needs it, and kept as `executor` for the later calls.
     """
 
     hname = str
@@ -285,6 +435,29 @@ class HashTag:
     def __init__(self, args):
         """Initialise the class."""
         self.args = args
+        self.cache = None
+        self.executor = None
+        self.keep_pool = False
+
+    @staticmethod
+    def get_algorithm(sha_key):
+        """Get the hash algorithm of a SHA key from the registry.
+
+        Parameters
+        ----------
+        sha_key : str
+            Reference SHA key of the secured hash algorithm.
+
+        Returns
+        -------
+        algorithm : HashAlgorithm
+            The registered hash algorithm.
+        """
+        try:
+            return algorithms.get(sha_key)
+        except KeyError:
+            log(f"No legal SHA-key {sha_key}!", 1)
+            sys.exit(1)
 
     @staticmethod
     def fpath2hash(fpath, sha_key):
@@ -302,53 +475,98 @@ class HashTag:
         hcode: str
             Returns the encoded full path in hexadecimal format.
         """
-        fpath_encoded = fpath.encode("utf-8")
-        if sha_key == SHAKeys.sha1:
-            #  deepcode ignore insecureHash: <because the option is needed>
-            hcode = hlib.sha1(fpath_encoded)
-            return hcode.hexdigest()
-        elif sha_key == SHAKeys.sha224:
-            hcode = hlib.sha224(fpath_encoded)
-            return hcode.hexdigest()
-        elif sha_key == SHAKeys.sha256:
-            hcode = hlib.sha256(fpath_encoded)
-            return hcode.hexdigest()
-        elif sha_key == SHAKeys.sha384:
-            hcode = hlib.sha384(fpath_encoded)
-            return hcode.hexdigest()
-        elif sha_key == SHAKeys.sha512:
-            hcode = hlib.sha512(fpath_encoded)
-            return hcode.hexdigest()
-        elif sha_key == SHAKeys.blake2b:
-            hcode = hlib.blake2b(fpath_encoded)
-            return hcode.hexdigest()
-        elif sha_key == SHAKeys.blake2s:
-            hcode = hlib.blake2s(fpath_encoded)
-            return hcode.hexdigest()
-        elif sha_key == SHAKeys.md5:
-            #  deepcode ignore insecureHash: <because the option is needed>
-            hcode = hlib.md5(fpath_encoded)
-            return hcode.hexdigest()
-        elif sha_key == SHAKeys.sha3_224:
-            hcode = hlib.sha3_224(fpath_encoded)
-            return hcode.hexdigest()
-        elif sha_key == SHAKeys.sha3_256:
-            hcode = hlib.sha3_256(fpath_encoded)
-            return hcode.hexdigest()
-        elif sha_key == SHAKeys.sha3_384:
-            hcode = hlib.sha3_384(fpath_encoded)
-            return hcode.hexdigest()
-        elif sha_key == SHAKeys.sha3_512:
-            hcode = hlib.sha3_512(fpath_encoded)
-            return hcode.hexdigest()
-        elif sha_key == SHAKeys.shake_128:
-            hcode = hlib.shake_128(fpath_encoded)
-            return hcode.hexdigest(32)
-        elif sha_key == SHAKeys.shake_256:
-            hcode = hlib.shake_256(fpath_encoded)
-            return hcode.hexdigest(32)
-        else:
-            sys.exit(1)
+        algorithm = HashTag.get_algorithm(sha_key)
+        hcode = algorithm.new()
+        hcode.update(fpath.encode("utf-8"))
+        return algorithm.hexdigest(hcode)
+
+    @staticmethod
+    def hash_names(names, sha_keys):
+        """Transform a batch of filenames into hash translated expressions.
+
+        hash_names() resolves the hash algorithms of the SHA keys once per batch and
+        encodes every filename only once for all SHA keys. The hexdigests of the
+        filenames are memoized in a bounded LRU cache, because equal filenames are
+        common in different directories. It has no side effects, so it can be called
+        by several threads or processes.
+
+        Parameters
+        ----------
+        names : iterable
+            Filenames, which have to be translated to hash-secured filenames.
+        sha_keys : list
+            Reference SHA keys of the secured hash algorithms.
+
+        Returns
+        -------
+        hcodes : list
+            The encoded filenames in hexadecimal format for every SHA key per filename.
+        """
+        hash_algorithms = tuple(HashTag.get_algorithm(sha_key) for sha_key in sha_keys)
+        return [list(name_digests(name, hash_algorithms)) for name in names]
+
+    @staticmethod
+    def file2hash(fname, sha_key, chunk_size=fileio.CHUNK_SIZE, engine="auto"):
+        """Transform the content of a file into hash translated expression.
+
+        file2hash() reads the file in fixed-size chunks and feeds them to the secure
+        hash algorithm, so the memory usage is independent of the file size.
+
+        Parameters
+        ----------
+        fname : str
+            Filename including the parent directory of the file to read.
+        sha_key : str
+            Reference SHA key of the secured hash algorithm.
+        chunk_size : int, optional
+            Size of the chunks in bytes, by default 1 MiB.
+        engine : str, optional
+            Read engine of `copy2hash.fileio`, by default 'auto'.
+
+        Returns
+        -------
+        hcode: str
+            Returns the encoded file content in hexadecimal format.
+        """
+        return HashTag.file2hashes(
+            fname, [sha_key], chunk_size=chunk_size, engine=engine
+        )[0]
+
+    @staticmethod
+    def file2hashes(fname, sha_keys, chunk_size=fileio.CHUNK_SIZE, engine="auto"):
+        """Transform the content of a file into several hash translated expressions.
+
+        file2hashes() reads the file only once and feeds every chunk to all the secure
+        hash algorithms together, so the file is not read once per SHA key.
+
+        Parameters
+        ----------
+        fname : str
+            Filename including the parent directory of the file to read.
+        sha_keys : list
+            Reference SHA keys of the secured hash algorithms.
+        chunk_size : int, optional
+            Size of the chunks in bytes, by default 1 MiB.
+        engine : str, optional
+            Read engine of `copy2hash.fileio`, by default 'auto'.
+
+        Returns
+        -------
+        hcodes: list
+            Returns the encoded file content in hexadecimal format for every SHA key.
+        """
+        hash_algorithms = [HashTag.get_algorithm(sha_key) for sha_key in sha_keys]
+        hcodes = [algorithm.new() for algorithm in hash_algorithms]
+        fileio.read_chunks(
+            fname,
+            [hcode.update for hcode in hcodes],
+            engine=engine,
+            chunk_size=chunk_size,
+        )
+        return [
+            algorithm.hexdigest(hcode)
+            for algorithm, hcode in zip(hash_algorithms, hcodes)
+        ]
 
     def make_full_hashname(self, hpath, suffix, sha_key):
         """Make the full hash-secured filename.
@@ -379,6 +597,33 @@ class HashTag:
             hpath = "{}-{}".format(sha_key, hpath)
         return hpath
 
+    def shard_hashname(self, hpath, hname):
+        """Nest the hash-secured filename in the shard directories of its hash.
+
+        Like the object store of git, the first `shard_depth` groups of `shard_width`
+        hexadecimal digits of the hash become the parent directories of the file, so
+        no directory holds millions of files.
+
+        Parameters
+        ----------
+        hpath : str
+            The encoded filename in hexadecimal format.
+        hname : str
+            The full hash-secured filename.
+
+        Returns
+        -------
+        hname : str
+            The hash-secured filename relative to the copy directory like
+            'ab/cd/abcd...txt', or the unchanged one without sharding.
+        """
+        depth = self.args.get("shard_depth") or 0
+        if not depth:
+            return hname
+        width = self.args.get("shard_width") or 2
+        shards = [hpath[start:][:width] for start in range(0, depth * width, width)]
+        return "/".join(shards + [hname])
+
     def generate_hashname(self, fname, suffix, sha_key):
         """Generate the hashname of the filename.
 
@@ -388,7 +633,8 @@ class HashTag:
         Parameters
         ----------
         fname : str
-            Filename, which has to be translated to hash-secured filename.
+            Filename, which has to be translated to hash-secured filename. In the
+            content mode, it is the path of the file to read.
         suffix : str
             File-extension of the filename.
         sha_key : str
@@ -402,7 +648,8 @@ class HashTag:
         Notes
         -----
             1. The full-path will be encoded in in hexadecimal format by using a
-                reference secure hash algorithms (sha) from `hashlib`.
+                reference secure hash algorithms (sha) from `hashlib`. In the content
+                mode, the file content will be encoded instead of the full-path.
             2. The new hashname will be normally merged with the standard suffix (file
                 extension) from the reference filename. The suffix can be optional:
                 a. Remove any file-extension.
@@ -411,11 +658,239 @@ class HashTag:
                 c. Removed the standard file-extension and add the used secure hash
                    algorithms (sha) in front of the new hashname seperated by a colon.
         """
-        hpath = self.fpath2hash(fname, sha_key)
+        if self.args.get("content"):
+            hpath = self.file2hash(fname, sha_key)
+        else:
+            (hpath,) = self.hash_names([fname], [sha_key])[0]
         self.hname = self.make_full_hashname(hpath, suffix, sha_key)
 
         return self.hname
 
+    def use_process_pool(self, n_files):
+        """Check if the file content(s) should be hashed on a pool of processes.
+
+        Parameters
+        ----------
+        n_files : int
+            Number of files to hash.
+
+        Returns
+        -------
+        bool
+            True for the `process` mode and for the `auto` mode, if there are at least
+            POOL_MIN_FILES files and more than one CPU; otherwise False.
+        """
+        hash_pool = self.args.get("hash_pool") or "auto"
+        if hash_pool == "process":
+            return True
+        if hash_pool == "auto":
+            return n_files >= POOL_MIN_FILES and (os.cpu_count() or 1) > 1
+        return False
+
+    def hash_contents(self, fnames, sha_keys):
+        """Hash the content of the file(s) serial or on a pool of processes.
+
+        Every file is read only once for all SHA keys. The processes get only the
+        filenames and send back only the hexdigests, so the file content never has to
+        be transferred between the processes. If the persistent cache is used, only
+        the files with a changed identity are hashed.
+
+        Parameters
+        ----------
+        fnames : list
+            Filenames including the parent directory of the files to read.
+        sha_keys : list
+            Reference SHA keys of the secured hash algorithms.
+
+        Yields
+        ------
+        hcodes: list
+            The encoded file content in hexadecimal format for every SHA key or None.
+        error : str
+            Warning message if the file could not be read, otherwise None.
+        """
+        engine = self.args.get("read_engine") or "auto"
+        if self.cache is None:
+            yield from self.map_hash_content(
+                [(fname, sha_keys, engine) for fname in fnames]
+            )
+            return
+
+        results = [None] * len(fnames)
+        identities = [None] * len(fnames)
+        misses = []
+        for i, fname in enumerate(fnames):
+            try:
+                identities[i] = self.cache.identity(fname)
+            except OSError:
+                # The error is reported by the hashing
+                misses.append(i)
+                continue
+            hcodes = self.cache.lookup(identities[i], sha_keys)
+            if hcodes is None:
+                misses.append(i)
+            else:
+                results[i] = hcodes, None
+
+        jobs = [(fnames[i], sha_keys, engine) for i in misses]
+        for i, (hcodes, error) in zip(misses, self.map_hash_content(jobs)):
+            results[i] = hcodes, error
+            if error is None and identities[i] is not None:
+                self.cache.store(identities[i], sha_keys, hcodes)
+        yield from results
+
+    def map_hash_content(self, jobs):
+        """Run hash_content() for the jobs serial or on a pool of processes.
+
+        Parameters
+        ----------
+        jobs : list
+            Jobs for hash_content().
+
+        Yields
+        ------
+        result : tuple
+            Result of hash_content() for every job in the order of the jobs.
+        """
+        if not self.use_process_pool(len(jobs)):
+            yield from map(hash_content, jobs)
+            return
+
+        workers = os.cpu_count() or 1
+        chunksize = max(1, len(jobs) // (4 * workers))
+        from concurrent.futures import ProcessPoolExecutor
+
+        if self.executor is None and self.keep_pool:
+            self.executor = ProcessPoolExecutor(max_workers=workers)
+        if self.executor is not None:
+            yield from self.executor.map(hash_content, jobs, chunksize=chunksize)
+            return
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(hash_content, jobs, chunksize=chunksize)
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def name_digests(name, hash_algorithms):
+    """Hash a single filename for several hash algorithms.
+
+    name_digests() is memoized for the last NAME_CACHE_SIZE pairs of the filename and
+    the hash algorithms of the SHA keys, which are resolved once per batch.
+
+    Parameters
+    ----------
+    name : str
+        Filename, which has to be translated to hash-secured filename.
+    hash_algorithms : tuple
+        HashAlgorithm of every SHA key from the registry.
+
+    Returns
+    -------
+    hcodes : tuple
+        The encoded filename in hexadecimal format for every SHA key.
+    """
+    data = name.encode("utf-8")
+    hcodes = []
+    for algorithm in hash_algorithms:
+        hcode = algorithm.new()
+        hcode.update(data)
+        hcodes.append(algorithm.hexdigest(hcode))
+    return tuple(hcodes)
+
+
+def hash_content(job):
+    """Hash the content of a single file.
+
+    hash_content() is defined on module level, so it can be sent to the worker
+    processes of hash_contents().
+
+    Parameters
+    ----------
+    job : tuple
+        Filename including the parent directory, the reference SHA keys, and the read
+        engine.
+
+    Returns
+    -------
+    hcodes: list
+        The encoded file content in hexadecimal format for every SHA key or None.
+    error : str
+        Warning message if the file could not be read, otherwise None.
+    """
+    fname, sha_keys, engine = job
+    try:
+        return HashTag.file2hashes(fname, sha_keys, engine=engine), None
+    except (FileNotFoundError, IsADirectoryError, PermissionError) as e_1:
+        return None, f"{e_1}"
+
+
+class FileRecord:
+    """Record of a single file to copy or move to hash-secured named file(s).
+
+    Parameters
+    ----------
+    index : int
+        Index of the file in the list of the input file(s).
+    filename : str
+        Filename of the file without the parent path.
+    suffix : str
+        File-extension of the file.
+    mode : str
+        Working mode, which is 'copy' or 'move'.
+    home_dir : str
+        Parent path of the file.
+    copy_dir : str
+        Parent path of the hash-secured named file(s).
+    size : int, optional
+        Size of the file in bytes, if it is already known; default is None for
+        taking it when it is needed.
+
+    Attributes
+    ----------
+    hashnames : dict
+        Hash-secured filename for every SHA key; None if it could not be generated.
+    digest : str
+        Content hash of the first SHA key in the content mode, otherwise None.
+    method : str
+        Method, which was used for copying, linking, or moving the file; None if the
+        file could not be copied or moved.
+    duplicate_of : str
+        Source of the first file with the same content in the deduplication mode,
+        otherwise None.
+    """
+
+    __slots__ = (
+        "index",
+        "filename",
+        "suffix",
+        "mode",
+        "home_dir",
+        "copy_dir",
+        "size",
+        "hashnames",
+        "digest",
+        "method",
+        "duplicate_of",
+    )
+
+    def __init__(self, index, filename, suffix, mode, home_dir, copy_dir, size=None):
+        """Initialise the record."""
+        self.index = index
+        self.filename = filename
+        self.suffix = suffix
+        self.mode = mode
+        self.home_dir = home_dir
+        self.copy_dir = copy_dir
+        self.size = size
+        self.hashnames = {}
+        self.digest = None
+        self.method = None
+        self.duplicate_of = None
+
+    @property
+    def source(self):
+        """Path of the regular named file."""
+        return Path(self.home_dir).joinpath(self.filename)
+
 
 class Copy2Hash(ExportReport, HashTag):
     """Copy or move file(s) to hash-secured named file(s).
@@ -435,25 +910,55 @@ class Copy2Hash(ExportReport, HashTag):
 
     Attributes
     ----------
-    _copy_dir : dir
-       Internal dictionary will be used first for copying or moving the file(s), and
-       after cleaning this dictionary will be used for generating the report.
+    _records : list
+       Internal list of one FileRecord per file, which will be used for copying or
+       moving the file(s) and for generating the report.
+    stats : RunStats
+        Statistics of the stages of the run, or None if they are disabled; embedding
+        applications can set their own RunStats with hooks before the run.
+    progress : Progress
+        Progress display of the run, or None if it is disabled.
+    collisions : CollisionIndex
+        Index of the hash-secured filenames of the run in the filename mode,
+        otherwise None.
     """
 
     def __init__(self, args):
         """Initialise the class with super."""
         super().__init__(args)
         self.args = args
-        self._copy_dir = {
-            "index": [],
-            "filename": [],
-            "ppath": [],
-            "fpath": [],
-            "suffix": [],
-            "mode": [],
-            "home_dir": [],
-            "copy_dir": [],
-        }
+        self._records = []
+        self.cache = None
+        self.executor = None
+        self.journal = None
+        self.deduplicator = None
+        self.stats = None
+        self.progress = None
+        self.collisions = None
+        self._formats = []
+        self._shard_dirs = set()
+        self._promoted = {}
+
+    def log(self, msg, mode=None, *args):
+        """Print messages of the run to display.
+
+        The verbose messages are dropped without formatting them, if the verbose
+        mode of this run is off, so runs with a different verbosity can share the
+        console.
+
+        Parameters
+        ----------
+        msg : str
+            Message to print to the terminal.
+        mode : int, optional
+            Mode of the message like for log().
+        *args
+            Arguments, which are formatted into the message via `str.format()` only if
+            it is printed.
+        """
+        if mode == 2 and not self.args.get("verbose"):
+            return
+        log(msg, mode, *args)
 
     @staticmethod
     def deconvolute_path(fname):
@@ -517,182 +1022,1146 @@ class Copy2Hash(ExportReport, HashTag):
         return s_ppath.as_posix(), s_ppath.as_posix()
 
     def find_files(self):
-        """Get the filenames and save it.
-
-        find_files() reads the filenames and the working mode to an internal dictionary.
-        This is part I of II, because get_hash() has to add the hash-keys according to
-        the number of selected SHA keys in the parser.
-        """
-        for i, fname in enumerate(self.args["infile"]):
-            self._copy_dir["index"].append(i)
-            ppath, fpath, suffix, fname = self.deconvolute_path(fname)
-            self._copy_dir["filename"].append(fname)
-            self._copy_dir["ppath"].append(ppath)
-            self._copy_dir["fpath"].append(fpath)
-            self._copy_dir["suffix"].append(suffix)
-
-            if self.args["move"]:
-                self._copy_dir["mode"].append("move")
-            else:
-                self._copy_dir["mode"].append("copy")
-
-            s_ppath, n_ppath = self.get_copypath(ppath, self.args)
-            self._copy_dir["home_dir"].append(s_ppath)
-            self._copy_dir["copy_dir"].append(n_ppath)
-
-    def transform_hash(self):
+        """Find the file(s) and yield their records.
+
+        find_files() yields one record per file with its working mode. This is part
+        I of II, because transform_hash() has to add the hash-secured filenames
+        according to the number of selected SHA keys in the parser. In the recursive
+        mode, the directories of the input are walked lazily, so the first records
+        are processed before the walk is finished; the destination directory is not
+        walked. It is made before the walk, so it is also excluded, if it is nested
+        in the walked directories and made by the first copies. Without a
+        destination directory, the copies are made next to the walked files, so
+        every directory is read completely before its files are processed.
+
+        Yields
+        ------
+        record : FileRecord
+            Record of the next file.
+        """
+        mode = "move" if self.args["move"] else "copy"
+        directory = self.args["directory"]
+        if directory and self.args.get("recursive", False):
+            Path(directory).mkdir(parents=True, exist_ok=True)
+        fnames = walker.scan_files(
+            self.args["infile"],
+            recursive=self.args.get("recursive", False),
+            exclude=[directory] if directory else (),
+            onerror=lambda e_1: log(msg=f"{e_1}", mode=3),
+            snapshot=not directory,
+        )
+        last_ppath, copypaths = None, None
+        for i, fname in enumerate(fnames):
+            ppath, _, suffix, fname = self.deconvolute_path(fname)
+            # The files of a directory are found together, so its copy path is
+            # only checked once
+            if ppath != last_ppath:
+                last_ppath, copypaths = ppath, self.get_copypath(ppath, self.args)
+            s_ppath, n_ppath = copypaths
+            yield FileRecord(i, fname, suffix, mode, s_ppath, n_ppath)
+
+    def transform_hash(self, records):
         """Get the hash-secured file names.
 
         transform_hash() transform the regular filename(s) to a hash-secured
-        filename(s). It adds the new hash-secured filename(s) and their export
-        directory to the _copy_dir directory.
+        filename(s). It adds the new hash-secured filename(s) to the records.
 
         Notes
         -----
-        In the old version, just the filename (self._copy_dir["fpath"]) without file
-        extension was used, but this is problematic in cases of equal filenames with
-        different extension. Now, the full filename (self._copy_dir["filename"]) are
-        used.
-        """
-        for i, sha_key in enumerate(self.args["sha"]):
-            sha_fname = []
-            for (fname, suffix) in zip(
-                self._copy_dir["filename"], self._copy_dir["suffix"]
-            ):
-                hname = self.generate_hashname(fname, suffix, sha_key)
-                sha_fname.append(hname)
-            self._copy_dir[sha_key] = sha_fname
-
-    def copy_files(self):
-        """Copy regular named file(s) to hash-secured named file(s)."""
-        sha_key_list = list(self._copy_dir.keys())[8:]
-
-        for filename, home_path, copy_path in zip(
-            self._copy_dir["filename"],
-            self._copy_dir["home_dir"],
-            self._copy_dir["copy_dir"],
-        ):
-            for sha_key in sha_key_list:
-                for copyname in self._copy_dir[sha_key]:
-                    try:
-                        copy(
-                            Path(home_path).joinpath(filename),
-                            Path(copy_path).joinpath(copyname),
-                        )
-                        if self.args["verbose"]:
-                            log(
-                                "Copy file '{}/{}' \n\tto '{}/{}'".format(
-                                    home_path, filename, copy_path, copyname
-                                ),
-                                2,
-                            )
-                    except (FileNotFoundError, IsADirectoryError) as e_1:
-                        log(msg=f"{e_1}", mode=3)
-                    except SameFileError as e_2:
-                        log(msg=f"{e_2} -> will not be replaced!", mode=3)
-
-    def move_files(self):
-        """Move regular named file(s) to hash-secured named file(s)."""
-        sha_key_list = list(self._copy_dir.keys())[8:]
-        sha_key = sha_key_list[0]
-        if len(sha_key_list) > 1:
-            log("SHA key list is >1; only the first will be picked!", 3)
+        In the old version, just the filename without file extension was used, but this
+        is problematic in cases of equal filenames with different extension. Now, the
+        full filename (FileRecord.filename) are used. In the content mode, the file(s)
+        will be read once from their home directory (FileRecord.home_dir) and their
+        content is used for all SHA keys together. For resuming, the hash-secured
+        filenames of the journal are used instead of hashing the file(s) again.
 
-        for filename, home_path, move_path in zip(
-            self._copy_dir["filename"],
-            self._copy_dir["home_dir"],
-            self._copy_dir["copy_dir"],
-        ):
-            for movename in self._copy_dir[sha_key]:
-                try:
-                    Path(home_path).joinpath(filename).rename(
-                        Path(move_path).joinpath(movename)
-                    )
-                    if self.args["verbose"]:
-                        log(
-                            "Move file '{}/{}' \n\tto '{}/{}'".format(
-                                home_path, filename, move_path, movename
-                            ),
-                            2,
-                        )
-                except (FileNotFoundError, IsADirectoryError) as e_1:
-                    log(msg=f"{e_1}", mode=3)
-
-    def clean_dict(self):
-        """Remove unnecessary entries in the dictionary."""
-        del self._copy_dir["ppath"]
-        del self._copy_dir["fpath"]
-        del self._copy_dir["suffix"]
+        Parameters
+        ----------
+        records : list
+            Records of the file(s) to hash.
+        """
+        sha_keys = self.args["sha"]
+        resumed = self.journal.hashnames if self.journal is not None else {}
+        unfinished = []
+        for record in records:
+            hashnames = resumed.get(record.source.as_posix())
+            if hashnames and all(sha_key in hashnames for sha_key in sha_keys):
+                record.hashnames = {sha_key: hashnames[sha_key] for sha_key in sha_keys}
+                if self.collisions is not None:
+                    self.index_hashnames(record)
+            else:
+                unfinished.append(record)
 
-    def copy2hash(self):
-        """Copy or move the file(s) to hash renamed file(s).
+        if self.args.get("content"):
+            fnames = [record.source.as_posix() for record in unfinished]
+        else:
+            fnames = [record.filename for record in unfinished]
 
-        Attributes
+        if self.args.get("content"):
+            hpaths = self.hash_contents(fnames, sha_keys)
+        else:
+            hpaths = ((hcodes, None) for hcodes in self.hash_names(fnames, sha_keys))
+
+        for (hcodes, error), record in zip(hpaths, unfinished):
+            if error:
+                log(msg=error, mode=3)
+                record.hashnames = dict.fromkeys(sha_keys)
+                continue
+            if self.args.get("content"):
+                record.digest = hcodes[0]
+            for sha_key, hpath in zip(sha_keys, hcodes):
+                record.hashnames[sha_key] = self.shard_hashname(
+                    hpath, self.make_full_hashname(hpath, record.suffix, sha_key)
+                )
+            if self.collisions is not None:
+                self.resolve_collisions(record, hcodes)
+
+    def index_hashnames(self, record):
+        """Add the hash-secured filenames of a resumed record to the collision index.
+
+        Parameters
         ----------
-        1. self.find_files() -> find the file(s)
-        2. self.transform_hash() -> generate the hash names for the file(s)
-        3. move or copied the file(s) ->
-        4. Remove unnecessary entries in the dictionary -> self.clean_dict()
-        5. make a report with of the copied or moved file(s) ->  self.make_export
+        record : FileRecord
+            Record of the file with its hash-secured filenames of the journal.
         """
-        self.find_files()
-        self.transform_hash()
-        if self.args["move"]:
-            self.move_files()
-        else:
-            self.copy_files()
-        self.clean_dict()
-        self.make_export(self._copy_dir)
+        for hashname in record.hashnames.values():
+            if hashname is not None:
+                self.collisions.add(Path(record.copy_dir, hashname).as_posix())
 
+    def resolve_collisions(self, record, hcodes):
+        """Check the hash-secured filenames of a record against the other files.
 
-def get_args(opt=None):
-    """Get the parser arguments from the command line.
+        Two files with the same filename in different directories get the same
+        hash-secured filename in the filename mode; the truncated hashes of
+        `shake_128` and `shake_256` can collide, too. The policy of the parser
+        decides for the second file:
 
-    Returns
-    -------
-    args : dict
-        Dictionary of the keywords and values from the parser.
+        1. 'warn' logs the collision and keeps the filename, so the second file
+           replaces the first one like before. Moving would destroy the only copy
+           of the first file, so the moved files are renamed like for 'suffix'.
+        2. 'fail' stops the run before the second file is copied or moved.
+        3. 'rehash' hashes the filename together with its resolved parent path
+           instead, so the name is independent of the working directory.
+        4. 'suffix' appends a counter to the hash like '<hash>-1'.
 
-    Parameters
-    ----------
-    opt : dict, optional
-        Optional Dictionary for modifying the parser arguments; default is None.
-    """
-    parser = argparse.ArgumentParser(
-        description=(
-            "copy or rename any file(s) to a hash-secured filename via terminal"
-        )
-    )
-    # Arguments for loading the data
-    parser.add_argument(
-        "infile",
-        nargs="*",
-        type=str,
-        help=(
-            "file(s) to copy or to rename with regular filename to secured hash "
-            "filename"
-        ),
-    )
-    parser.add_argument(
-        "-r",
-        "--report",
-        help=(
-            "define one or a series of file format(s) for the rename-report(s) to "
-            "retrace the copying or rename of the file(s). The availabel file formats "
-            "are:'csv', 'json', 'pkl', 'txt', 'yaml', 'xml', or own file-extension as "
-            "ASCII; default is 'json'"
-        ),
-        default=["json"],
-        nargs="*",
-        type=str,
-    )
-    parser.add_argument(
-        "-rn",
-        "--report_name",
-        help=(
-            "define the report name for the copied or move file(s); default is "
-            "'copy_report'"
-        ),
+        If rehashing collides again, the counter is appended, too.
+
+        Parameters
+        ----------
+        record : FileRecord
+            Record of the file with its new hash-secured filenames.
+        hcodes : list
+            The encoded filename in hexadecimal format for every SHA key.
+        """
+        policy = self.args.get("collision") or "warn"
+        for sha_key, hpath in zip(self.args["sha"], hcodes):
+            hashname = record.hashnames[sha_key]
+            if self.collisions.add(Path(record.copy_dir, hashname).as_posix()):
+                continue
+            msg = "'{}' collides with another file on the hash-secured filename '{}'"
+            if policy == "fail":
+                log(f"{msg}!", 1, record.source, hashname)
+                sys.exit(1)
+            if policy == "warn" and record.mode != "move":
+                log(f"{msg}; the other file is replaced!", 3, record.source, hashname)
+                continue
+
+            # Pairs of the hash for the shards and the hash of the filename
+            candidates = ((hpath, f"{hpath}-{i}") for i in count(1))
+            if policy == "rehash":
+                source = Path(record.home_dir).resolve().joinpath(record.filename)
+                (rehashed,) = self.hash_names([source.as_posix()], [sha_key])[0]
+                candidates = chain([(rehashed, rehashed)], candidates)
+            for shard, candidate in candidates:
+                renamed = self.shard_hashname(
+                    shard, self.make_full_hashname(candidate, record.suffix, sha_key)
+                )
+                if self.collisions.add(Path(record.copy_dir, renamed).as_posix()):
+                    break
+            if policy == "warn":
+                log(f"{msg}; moved to '{{}}'!", 3, record.source, hashname, renamed)
+            else:
+                self.log(
+                    f"{msg}; renamed to '{{}}'", 2, record.source, hashname, renamed
+                )
+            record.hashnames[sha_key] = renamed
+
+    def run_jobs(self, func, jobs):
+        """Run the copy or move jobs on a bounded pool of worker threads.
+
+        run_jobs() keeps at most four jobs per worker in flight and returns the results
+        in the order of the jobs, so the log is independent of the order in which the
+        workers finish. Jobs of the same hash-secured filename like the colliding
+        files of the 'warn' policy run one after another, so the later file replaces
+        the earlier one instead of writing into it. With a single worker, the jobs run
+        in the main thread.
+
+        Parameters
+        ----------
+        func : callable
+            Function, which is called for every job.
+        jobs : iterable
+            Jobs for the function.
+
+        Yields
+        ------
+        result : any
+            Result of the function for every job in the order of the jobs.
+        """
+        workers = self.args.get("workers") or 1
+        if workers <= 1:
+            yield from map(func, jobs)
+            return
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            destinations = set()
+            for job in jobs:
+                # The copy directory and the hash-secured filename of the job
+                destination = job[0].copy_dir, job[1]
+                while destination in destinations:
+                    yield self.pop_job(pending, destinations)
+                destinations.add(destination)
+                pending.append((destination, executor.submit(func, job)))
+                if len(pending) >= 4 * workers:
+                    yield self.pop_job(pending, destinations)
+            while pending:
+                yield self.pop_job(pending, destinations)
+
+    @staticmethod
+    def pop_job(pending, destinations):
+        """Wait for the oldest job in flight of run_jobs() and get its result."""
+        destination, future = pending.popleft()
+        destinations.discard(destination)
+        return future.result()
+
+    @staticmethod
+    def journal_key(job):
+        """Get the source and the destination of a job for the journal.
+
+        Parameters
+        ----------
+        job : tuple
+            The record of the file and the hash-secured filename.
+
+        Returns
+        -------
+        src : str
+            Filename of the source file.
+        dst : str
+            Filename of the destination file.
+        """
+        record, hashname = job
+        return record.source.as_posix(), Path(record.copy_dir, hashname).as_posix()
+
+    def journal_jobs(self, op, jobs):
+        """Record the jobs in the journal before they run and skip the finished ones.
+
+        The jobs are planned in batches, so the journal is synced once per batch and
+        not once per job.
+
+        Parameters
+        ----------
+        op : str
+            Operation of the jobs: 'copy' or 'move'.
+        jobs : iterable
+            The records of the files and the hash-secured filenames.
+
+        Yields
+        ------
+        job : tuple
+            The jobs, which are not finished yet.
+        """
+        if self.journal is None:
+            yield from jobs
+            return
+
+        batch = []
+        for job in jobs:
+            if self.resume_job(op, job):
+                continue
+            batch.append(job)
+            if len(batch) >= self.journal.batch_size:
+                self.plan_jobs(op, batch)
+                yield from batch
+                batch = []
+        if batch:
+            self.plan_jobs(op, batch)
+            yield from batch
+
+    def plan_jobs(self, op, jobs):
+        """Record the jobs as planned in the journal.
+
+        Parameters
+        ----------
+        op : str
+            Operation of the jobs: 'copy' or 'move'.
+        jobs : list
+            The records of the files and the hash-secured filenames.
+        """
+        entries = []
+        for job in jobs:
+            src, dst = self.journal_key(job)
+            entries.append(
+                {"op": op, "src": src, "dst": dst, "hashnames": job[0].hashnames}
+            )
+        self.journal.plan(entries)
+
+    def resume_job(self, op, job):
+        """Check a job against the replayed journal.
+
+        A completed job is skipped. An interrupted move is completed, if the source
+        is gone and the destination exists, because the destination of a move across
+        filesystems is only renamed into place after it is synced. Otherwise, the
+        move runs again, and its partial file is removed. The partial destination of
+        an interrupted copy is removed, so the job runs again.
+
+        Parameters
+        ----------
+        op : str
+            Operation of the job: 'copy' or 'move'.
+        job : tuple
+            The record of the file and the hash-secured filename.
+
+        Returns
+        -------
+        bool
+            True if the job is already finished, otherwise False.
+        """
+        record, hashname = job
+        src, dst = self.journal_key(job)
+        entry = self.journal.entries.get((src, dst))
+        if entry is None:
+            return False
+
+        if entry["state"] != "done":
+            if op == "move" and not os.path.lexists(src) and os.path.lexists(dst):
+                entry = {"method": "rename"}
+                self.journal.done(op, src, dst, entry["method"])
+            else:
+                partial = f"{dst}{fileio.PARTIAL_SUFFIX}"
+                if op == "move" and os.path.lexists(partial):
+                    os.unlink(partial)
+                    self.log("Remove the partial move '{}'", 2, partial)
+                if (
+                    op == "copy"
+                    and os.path.lexists(dst)
+                    and os.path.abspath(src) != os.path.abspath(dst)
+                ):
+                    os.unlink(dst)
+                    self.log("Remove the partial copy '{}'", 2, dst)
+                return False
+
+        record.method = entry["method"]
+        self.log("Skip the finished {} of '{}' \n\tto '{}'", 2, op, src, dst)
+        return True
+
+    def copy_file(self, job):
+        """Copy or link a single regular named file to a hash-secured named file.
+
+        Parameters
+        ----------
+        job : tuple
+            The record of the file and the hash-secured filename.
+
+        Returns
+        -------
+        job : tuple
+            The unchanged job.
+        method : str
+            The method, which was used for copying or linking the file, otherwise None.
+        error : str
+            Warning message if the file could not be copied, otherwise None.
+        """
+        record, copyname = job
+        src, dst = record.source, Path(record.copy_dir).joinpath(copyname)
+        try:
+            if self.args.get("link"):
+                method = fileio.link_file(src, dst, self.args["link"])
+            else:
+                method = fileio.copy_file(src, dst)
+        except (FileNotFoundError, IsADirectoryError) as e_1:
+            return job, None, f"{e_1}"
+        except SameFileError as e_2:
+            return job, None, f"{e_2} -> will not be replaced!"
+        return job, method, None
+
+    @staticmethod
+    def move_file(job):
+        """Move a single regular named file to a hash-secured named file.
+
+        The file is renamed on the same filesystem, and otherwise copied, synced,
+        and removed via `copy2hash.fileio.move_file()`.
+
+        Parameters
+        ----------
+        job : tuple
+            The record of the file and the hash-secured filename.
+
+        Returns
+        -------
+        job : tuple
+            The unchanged job.
+        method : str
+            The method, which was used for moving the file, otherwise None.
+        error : str
+            Warning message if the file could not be moved, otherwise None.
+        """
+        record, movename = job
+        try:
+            method = fileio.move_file(
+                record.source, Path(record.copy_dir).joinpath(movename)
+            )
+        except OSError as e_1:
+            return job, None, f"{e_1}"
+        return job, method, None
+
+    def find_duplicates(self, records):
+        """Split the records into the ones with a new content and the duplicates.
+
+        Parameters
+        ----------
+        records : list
+            Records of the file(s) to copy.
+
+        Returns
+        -------
+        originals : list
+            Records of the file(s), whose content is found for the first time.
+        duplicates : list
+            Pairs of the record of a duplicate and the record of its original.
+        """
+        originals, duplicates = [], []
+        for record in records:
+            if not any(record.hashnames.values()):
+                originals.append(record)
+                continue
+            try:
+                original = self.deduplicator.find(
+                    record, record.source, size=record.size, digest=record.digest
+                )
+            except OSError:
+                # The error is reported by the copying
+                original = None
+            if original is None:
+                originals.append(record)
+            else:
+                record.duplicate_of = original.source.as_posix()
+                duplicates.append((record, original))
+        return originals, duplicates
+
+    def promote_duplicates(self, duplicates):
+        """Copy a duplicate instead of its original, if the original was not copied.
+
+        An unreadable or skipped original leaves no file for linking its duplicates,
+        so its first duplicate is copied like a new content and becomes the original
+        of the other ones, also of the duplicates in the later batches.
+
+        Parameters
+        ----------
+        duplicates : list
+            Pairs of the record of a duplicate and the record of its original.
+
+        Returns
+        -------
+        duplicates : list
+            Pairs of the remaining duplicates and their copied originals.
+        """
+        while True:
+            pairs, promoted = [], {}
+            for record, original in duplicates:
+                while original.index in self._promoted:
+                    original = self._promoted[original.index]
+                if original.method is None and original.index not in promoted:
+                    promoted[original.index] = record
+                    record.duplicate_of = None
+                    continue
+                pairs.append((record, promoted.get(original.index, original)))
+            if not promoted:
+                break
+            self._promoted.update(promoted)
+            self.copy_records(list(promoted.values()))
+            duplicates = pairs
+        for record, original in pairs:
+            record.duplicate_of = original.source.as_posix()
+        return pairs
+
+    def dedupe_file(self, job):
+        """Hardlink or skip a single duplicate instead of copying it.
+
+        Parameters
+        ----------
+        job : tuple
+            The record of the duplicate, its hash-secured filename, and the
+            hash-secured file of its original.
+
+        Returns
+        -------
+        job : tuple
+            The unchanged job.
+        method : str
+            The method, which was used for the duplicate, otherwise None.
+        error : str
+            Warning message if the duplicate could not be linked, otherwise None.
+        """
+        record, copyname, original = job
+        if self.args["dedupe"] == "skip":
+            return job, "skipped", None
+        dst = Path(record.copy_dir).joinpath(copyname)
+        # Files with the same content and file-extension share the same file
+        if dst == original:
+            return job, "duplicate", None
+        try:
+            method = fileio.link_file(original, dst, "hard")
+        except (FileNotFoundError, IsADirectoryError) as e_1:
+            return job, None, f"{e_1}"
+        except SameFileError:
+            return job, "hardlink", None
+        return job, method, None
+
+    def dedupe_files(self, duplicates):
+        """Hardlink or skip the duplicates of the copied file(s).
+
+        Parameters
+        ----------
+        duplicates : list
+            Pairs of the record of a duplicate and the record of its original.
+        """
+        jobs = (
+            (record, copyname, Path(original.copy_dir, original.hashnames[sha_key]))
+            for record, original in duplicates
+            for sha_key, copyname in record.hashnames.items()
+            if copyname is not None and original.hashnames.get(sha_key)
+        )
+        for (record, copyname, original), method, error in self.run_jobs(
+            self.dedupe_file, jobs
+        ):
+            if error:
+                log(msg=error, mode=3)
+                continue
+            if self.progress is not None and record.method is None:
+                self.progress.update(nbytes=self.record_size(record))
+            record.method = method
+            self.log(
+                "Deduplicate file '{}/{}' \n\tto '{}/{}' via {}",
+                2,
+                record.home_dir,
+                record.filename,
+                record.copy_dir,
+                copyname,
+                method,
+            )
+
+    def copy_files(self, records):
+        """Copy regular named file(s) to hash-secured named file(s).
+
+        Every file is copied or linked once per SHA key to its own hash-secured
+        filename. In the deduplication mode, only the first file with the same
+        content is copied; its duplicates are hardlinked to it or skipped.
+
+        Parameters
+        ----------
+        records : list
+            Records of the file(s) to copy.
+        """
+        duplicates = []
+        if self.deduplicator is not None:
+            records, duplicates = self.find_duplicates(records)
+        self.copy_records(records)
+        if duplicates:
+            self.dedupe_files(self.promote_duplicates(duplicates))
+
+    def copy_records(self, records):
+        """Copy the file(s) of the records to all of their hash-secured filenames.
+
+        Parameters
+        ----------
+        records : list
+            Records of the file(s) to copy.
+        """
+        jobs = (
+            (record, copyname)
+            for record in records
+            for copyname in record.hashnames.values()
+            if copyname is not None
+        )
+        jobs = self.journal_jobs("copy", jobs)
+        for job, method, error in self.run_jobs(self.copy_file, jobs):
+            if error:
+                log(msg=error, mode=3)
+                continue
+            record, copyname = job
+            if self.progress is not None and record.method is None:
+                self.progress.update(nbytes=self.record_size(record))
+            record.method = method
+            if self.journal is not None:
+                self.journal.done("copy", *self.journal_key(job), method)
+            self.log(
+                "Copy file '{}/{}' \n\tto '{}/{}' via {}",
+                2,
+                record.home_dir,
+                record.filename,
+                record.copy_dir,
+                copyname,
+                method,
+            )
+
+    def move_files(self, records):
+        """Move regular named file(s) to hash-secured named file(s).
+
+        Only the hash-secured filename of the first SHA key is used.
+
+        Parameters
+        ----------
+        records : list
+            Records of the file(s) to move.
+        """
+        sha_key = self.args["sha"][0]
+        jobs = (
+            (record, record.hashnames[sha_key])
+            for record in records
+            if record.hashnames[sha_key] is not None
+        )
+        jobs = self.journal_jobs("move", jobs)
+        for job, method, error in self.run_jobs(self.move_file, jobs):
+            if error:
+                log(msg=error, mode=3)
+                continue
+            record, movename = job
+            record.method = method
+            if self.progress is not None:
+                self.progress.update(nbytes=self.record_size(record))
+            if self.journal is not None:
+                self.journal.done("move", *self.journal_key(job), method)
+            self.log(
+                "Move file '{}/{}' \n\tto '{}/{}'",
+                2,
+                record.home_dir,
+                record.filename,
+                record.copy_dir,
+                movename,
+            )
+
+    def report_columns(self):
+        """Get the names of the columns of the report.
+
+        Returns
+        -------
+        columns : list
+            Names of the columns; the SHA keys are the last columns.
+        """
+        columns = ["index", "filename", "mode", "home_dir", "copy_dir", "method"]
+        if self.args.get("dedupe") and not self.args["move"]:
+            columns.append("duplicate_of")
+        return columns + list(self.args["sha"])
+
+    def make_rows(self, records):
+        """Make the rows of the records for the report.
+
+        Parameters
+        ----------
+        records : list
+            Records of the file(s).
+
+        Returns
+        -------
+        rows : list
+            One tuple per file in the order of report_columns().
+        """
+        sha_keys = self.args["sha"]
+        dedupe = self.args.get("dedupe") and not self.args["move"]
+        return [
+            (
+                record.index,
+                record.filename,
+                record.mode,
+                record.home_dir,
+                record.copy_dir,
+                record.method,
+                *((record.duplicate_of,) if dedupe else ()),
+                *(record.hashnames.get(sha_key) for sha_key in sha_keys),
+            )
+            for record in records
+        ]
+
+    def make_copy_dict(self):
+        """Make the columnar dictionary of the records for the report.
+
+        Returns
+        -------
+        copy_dict : dict
+            Dictionary with one list per column and one entry per file; the SHA keys
+            are the last columns.
+        """
+        columns = self.report_columns()
+        copy_dict = {column: [] for column in columns}
+        for row in self.make_rows(self._records):
+            for column, value in zip(columns, row):
+                copy_dict[column].append(value)
+        return copy_dict
+
+    def open(self):
+        """Open the reports, the journal, the cache, and the pools for a run.
+
+        Returns
+        -------
+        formats : list
+            The report formats, which are written by make_export() at the end.
+        """
+        if self.args["move"] and len(self.args["sha"]) > 1:
+            log("SHA key list is >1; only the first will be picked!", 3)
+        if self.args.get("progress"):
+            infile = self.args["infile"]
+            # The number of files is unknown before the directories are walked
+            total = None
+            if not self.args.get("recursive") and hasattr(infile, "__len__"):
+                total = len(infile)
+            self.progress = Progress(total=total)
+        formats = self.args["report"]
+        if self.args.get("stream_report", False):
+            formats = self.open_streams(self.report_columns())
+        if self.args.get("journal"):
+            self.journal = Journal(
+                self.args["journal"], resume=self.args.get("resume", False)
+            )
+        if self.args.get("cache") and self.args.get("content"):
+            self.cache = HashCache(
+                self.args["cache"],
+                max_age=self.args.get("cache_max_age"),
+                max_entries=self.args.get("cache_max_entries"),
+            )
+        if self.args.get("dedupe") and not self.args["move"]:
+            self.deduplicator = Deduplicator(
+                engine=self.args.get("read_engine") or "auto"
+            )
+        if self.args.get("collision") and not self.args.get("content"):
+            self.collisions = CollisionIndex()
+        if self.stats is None and self.args.get("stats"):
+            self.stats = RunStats(trace_memory=self.args.get("trace_memory", False))
+        if self.stats is not None:
+            self.stats.start()
+        # The pool is started by the first batch, which needs it, so small runs never
+        # start the processes
+        self.keep_pool = bool(self.args.get("content"))
+        self._formats = formats
+        return formats
+
+    def close(self):
+        """Close the reports, the journal, the cache, and the pools of a run."""
+        if self.cache is not None:
+            self.cache.close()
+        if self.collisions is not None:
+            self.collisions.close()
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        if self.journal is not None:
+            self.journal.close()
+        self.close_streams()
+        if self.progress is not None:
+            self.progress.close()
+        CONSOLE.flush()
+
+    def find_batches(self):
+        """Find the file(s) and yield their records in batches.
+
+        Yields
+        ------
+        records : list
+            Records of the next `--batch_size` file(s), by default RECORD_BATCH_SIZE.
+        """
+        batch_size = self.args.get("batch_size") or RECORD_BATCH_SIZE
+        files = self.find_files()
+        while True:
+            records = list(islice(files, batch_size))
+            if not records:
+                return
+            yield records
+
+    def make_shard_dirs(self, records):
+        """Create the missing shard directories of a batch of records.
+
+        The created directories are kept for the whole run, so every shard directory
+        is only created once instead of being checked for every file.
+
+        Parameters
+        ----------
+        records : list
+            Records of the file(s) with their hash-secured filenames.
+        """
+        for record in records:
+            for hashname in record.hashnames.values():
+                if hashname is None:
+                    continue
+                shard = os.path.dirname(hashname)
+                if shard and (record.copy_dir, shard) not in self._shard_dirs:
+                    Path(record.copy_dir, shard).mkdir(parents=True, exist_ok=True)
+                    self._shard_dirs.add((record.copy_dir, shard))
+
+    def transfer_files(self, records):
+        """Copy or move a batch of file(s) according to the working mode.
+
+        Parameters
+        ----------
+        records : list
+            Records of the file(s) with their hash-secured filenames.
+        """
+        if self.args.get("shard_depth"):
+            self.make_shard_dirs(records)
+        if self.args["move"]:
+            self.move_files(records)
+        else:
+            self.copy_files(records)
+
+    def report_records(self, records):
+        """Write a batch of records to the streaming reports or keep them.
+
+        Parameters
+        ----------
+        records : list
+            Records of the copied or moved file(s).
+        """
+        if self._streams:
+            self.write_streams(self.make_rows(records))
+        if self._formats:
+            self._records.extend(records)
+        if self.stats is not None:
+            self.count_records(records)
+
+    def count_records(self, records):
+        """Count the files, bytes, and errors of a batch of records for the stats.
+
+        Parameters
+        ----------
+        records : list
+            Records of the copied or moved file(s).
+        """
+        nbytes = sum(self.record_size(record) for record in records)
+        methods = [record.method for record in records if record.method is not None]
+        self.stats.count(
+            files=len(records),
+            nbytes=nbytes,
+            errors=len(records) - len(methods),
+            methods=methods,
+        )
+
+    @staticmethod
+    def record_size(record):
+        """Get the size of the file of a record.
+
+        Parameters
+        ----------
+        record : FileRecord
+            Record of the copied or moved file.
+
+        Returns
+        -------
+        size : int
+            Size of the file in bytes, or 0 if the file is missing.
+        """
+        if record.size is not None:
+            return record.size
+        # The source of a moved file is gone, so its first destination is used
+        destinations = (
+            Path(record.copy_dir).joinpath(hashname)
+            for hashname in record.hashnames.values()
+            if hashname is not None
+        )
+        for fname in (record.source, next(destinations, None)):
+            try:
+                # The size is taken once, when it is first needed
+                record.size = os.stat(fname).st_size
+            except (OSError, TypeError):
+                continue
+            return record.size
+        return 0
+
+    def run_stage(self, stage, func, *args):
+        """Run a stage of copy2hash() and record it in the stats, if they are enabled.
+
+        Parameters
+        ----------
+        stage : str
+            Name of the stage.
+        func : callable
+            Function of the stage.
+        *args
+            Arguments of the function.
+
+        Returns
+        -------
+        result : any
+            Result of the function.
+        """
+        if self.stats is None:
+            return func(*args)
+        return self.stats.run(stage, func, *args)
+
+    def report_stats(self):
+        """Stop the stats and print them, or write them to the file of the parser."""
+        if self.stats is None:
+            return
+        self.stats.stop()
+        fname = self.args.get("stats")
+        if fname == "-":
+            for line in self.stats.format_summary():
+                log(f"[STATS] {line}")
+        elif fname:
+            self.stats.write(fname)
+
+    def copy2hash(self):
+        """Copy or move the file(s) to hash renamed file(s).
+
+        Attributes
+        ----------
+        1. self.find_files() -> find the file(s)
+        2. self.transform_hash() -> generate the hash names for the file(s)
+        3. move or copied the file(s) ->
+        4. make a report with of the copied or moved file(s) ->  self.make_export
+
+        The steps 2. and 3. run for batches of RECORD_BATCH_SIZE files, while the
+        file(s) are found. For streaming reports, step 4. runs for every batch, too,
+        and the records are only kept for the report formats, which cannot be
+        streamed.
+        """
+        for _ in self.process():
+            pass
+
+    def process(self):
+        """Copy or move the file(s) and yield their records, while they are processed.
+
+        process() runs the steps of copy2hash() and yields the records of every batch
+        as soon as it is copied or moved and reported. The records are not kept, if
+        all report formats are streamed or no report is written, so the memory stays
+        bounded by the batch size. The final report is written, when the last record
+        is consumed.
+
+        Yields
+        ------
+        record : FileRecord
+            Record of the next processed file with its hash-secured filename(s) and
+            its method; the method is None if the file could not be copied or moved.
+        """
+        formats = self.open()
+        try:
+            batches = self.find_batches()
+            while True:
+                records = self.run_stage("find", next, batches, None)
+                if records is None:
+                    break
+                self.run_stage("hash", self.transform_hash, records)
+                self.run_stage("transfer", self.transfer_files, records)
+                self.run_stage("report", self.report_records, records)
+                yield from records
+        finally:
+            self.close()
+        if formats:
+            self.run_stage("export", self.make_export, self.make_copy_dict(), formats)
+        self.report_stats()
+        CONSOLE.flush()
+
+    async def copy2hash_async(self, queue_size=PIPELINE_QUEUE_SIZE):
+        """Copy or move the file(s) to hash renamed file(s) in a pipeline.
+
+        copy2hash_async() runs the steps of copy2hash() as concurrent stages, which
+        pass the batches of records via bounded queues: finding, hashing, copying or
+        moving, and reporting. Every stage runs its blocking file I/O in its own
+        thread, so the event loop is never blocked, and a full queue pauses the
+        stages before it. If a stage fails or the run is cancelled, the running
+        threads are finished before the run is closed.
+
+        Parameters
+        ----------
+        queue_size : int, optional
+            Maximum number of batches between two stages, by default
+            PIPELINE_QUEUE_SIZE.
+        """
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+
+        # The running loop, also for Python 3.6
+        loop = asyncio.get_event_loop()
+        threads = ThreadPoolExecutor(max_workers=4)
+        try:
+            formats = await self.run_in_thread(loop, threads, self.open)
+            try:
+                await self.run_pipeline(loop, threads, queue_size)
+            finally:
+                await self.run_in_thread(loop, threads, self.close)
+            if formats:
+                copy_dict = self.make_copy_dict()
+                await self.run_in_thread(
+                    loop,
+                    threads,
+                    self.run_stage,
+                    "export",
+                    self.make_export,
+                    copy_dict,
+                    formats,
+                )
+        finally:
+            # Every thread is finished, so the pool is shut down without blocking
+            # the loop
+            threads.shutdown(wait=False)
+        self.report_stats()
+        CONSOLE.flush()
+
+    @staticmethod
+    async def run_in_thread(loop, threads, func, *args):
+        """Run a blocking function in a thread of the pool and wait for it.
+
+        A thread cannot be cancelled, so if the waiting is cancelled, the function
+        is still awaited before the cancellation is passed on.
+
+        Parameters
+        ----------
+        loop : asyncio.AbstractEventLoop
+            The running event loop.
+        threads : ThreadPoolExecutor
+            Pool of the threads.
+        func : callable
+            Blocking function.
+        *args
+            Arguments of the function.
+
+        Returns
+        -------
+        result : object
+            Result of the function.
+        """
+        import asyncio
+
+        future = loop.run_in_executor(threads, func, *args)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            await asyncio.wait([future])
+            raise
+
+    async def run_pipeline(self, loop, threads, queue_size):
+        """Run the stages of the pipeline until all batches are reported.
+
+        Parameters
+        ----------
+        loop : asyncio.AbstractEventLoop
+            The running event loop.
+        threads : ThreadPoolExecutor
+            Pool with one thread per stage for the blocking file I/O.
+        queue_size : int
+            Maximum number of batches between two stages.
+        """
+        import asyncio
+
+        queues = [asyncio.Queue(maxsize=queue_size) for _ in range(3)]
+        batches = self.find_batches()
+
+        async def find():
+            while True:
+                records = await self.run_in_thread(
+                    loop, threads, self.run_stage, "find", next, batches, None
+                )
+                await queues[0].put(records)
+                if records is None:
+                    return
+
+        async def stage(name, func, inbox, outbox=None):
+            while True:
+                records = await inbox.get()
+                if records is not None:
+                    await self.run_in_thread(
+                        loop, threads, self.run_stage, name, func, records
+                    )
+                if outbox is not None:
+                    await outbox.put(records)
+                if records is None:
+                    return
+
+        tasks = [
+            asyncio.ensure_future(coro)
+            for coro in (
+                find(),
+                stage("hash", self.transform_hash, queues[0], queues[1]),
+                stage("transfer", self.transfer_files, queues[1], queues[2]),
+                stage("report", self.report_records, queues[2]),
+            )
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # A failed stage would block the others on the queues; the cancelled
+            # stages wait for their running threads
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+
+def get_args(opt=None, argv=None):
+    """Get the parser arguments from the command line.
+
+    Returns
+    -------
+    args : dict
+        Dictionary of the keywords and values from the parser.
+
+    Parameters
+    ----------
+    opt : dict, optional
+        Optional Dictionary for modifying the parser arguments; default is None.
+    argv : list, optional
+        Arguments to parse instead of the command line like `[]` for the defaults;
+        default is None for the command line.
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            "copy or rename any file(s) to a hash-secured filename via terminal"
+        )
+    )
+    # Arguments for loading the data
+    parser.add_argument(
+        "infile",
+        nargs="*",
+        type=str,
+        help=(
+            "file(s) to copy or to rename with regular filename to secured hash "
+            "filename"
+        ),
+    )
+    parser.add_argument(
+        "-r",
+        "--report",
+        help=(
+            "define one or a series of file format(s) for the rename-report(s) to "
+            "retrace the copying or rename of the file(s). The availabel file formats "
+            "are:'csv', 'json', 'jsonl', 'pkl', 'sqlite', 'txt', 'yaml', 'xml', or own "
+            "file-extension as ASCII; default is 'json'. The 'sqlite' report is an "
+            "indexed catalog for 'copy2hash lookup'."
+        ),
+        default=["json"],
+        nargs="*",
+        type=str,
+    )
+    parser.add_argument(
+        "-sr",
+        "--stream_report",
+        help=(
+            "write the report(s) row by row while the file(s) are copied or moved, so "
+            "the memory usage is independent of the number of files. The 'json' "
+            "report is streamed as an array of one object per file; the 'pkl', "
+            "'yaml', and 'xml' reports are still written at the end."
+        ),
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "-rn",
+        "--report_name",
+        help=(
+            "define the report name for the copied or move file(s); default is "
+            "'copy_report'"
+        ),
         default="copy_report",
         type=str,
     )
@@ -705,7 +2174,9 @@ def get_args(opt=None):
             "'sha1', 'sha224', 'sha256', 'sha384', 'sha512', 'blake2b', 'blake2s', "
             "'md5', 'sha3_224', 'sha3_256', 'sha3_384', 'sha3_512', 'shake_128', "
             "'shake_256'; default 'sha256'. The 'shake_128' and 'shake_256' are "
-            "defined for 32 character length."
+            "defined for 32 character length. Furthermore, the fast hash algorithms "
+            "'blake2b_64', 'blake2b_128', and the ones of other packages are "
+            "available; see --list_algorithms."
         ),
         default=["sha256"],
         nargs="*",
@@ -722,6 +2193,17 @@ def get_args(opt=None):
         default=None,
         type=str,
     )
+    parser.add_argument(
+        "-rec",
+        "--recursive",
+        help=(
+            "walk the directories of the input recursively and copy or move all "
+            "their file(s); the walk is streamed, so the first file(s) are processed "
+            "before the walk is finished"
+        ),
+        action="store_true",
+        default=False,
+    )
     parser.add_argument(
         "-mv",
         "--move",
@@ -731,6 +2213,86 @@ def get_args(opt=None):
         ),
         action="store_true",
     )
+    parser.add_argument(
+        "-ln",
+        "--link",
+        help=(
+            "link the file(s) instead of copying them: 'reflink' for a copy-on-write "
+            "clone on btrfs or XFS, 'hard' for a hardlink, or 'sym' for a symlink. "
+            "The 'reflink' and 'hard' fall back to copying, if the filesystem cannot "
+            "link the file(s)."
+        ),
+        default=None,
+        choices=fileio.LINK_MODES,
+        type=str,
+    )
+    parser.add_argument(
+        "-dd",
+        "--dedupe",
+        help=(
+            "copy only the first file of the same content: its duplicates are "
+            "hardlinked to its copy ('link') or not copied at all ('skip'). The "
+            "file(s) are compared by their size, a partial hash, and a full hash, or "
+            "directly by their hash in the content mode. The report gets the column "
+            "'duplicate_of'."
+        ),
+        default=None,
+        choices=["link", "skip"],
+        type=str,
+    )
+    parser.add_argument(
+        "-jn",
+        "--journal",
+        help=(
+            "define the file of a journal, which records every planned and finished "
+            "copy or move of the file(s), so an interrupted run can be resumed"
+        ),
+        default=None,
+        type=str,
+    )
+    parser.add_argument(
+        "-rs",
+        "--resume",
+        help=(
+            "resume an interrupted run via its journal: finished copies or moves are "
+            "skipped and partial copies are removed and repeated"
+        ),
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "-co",
+        "--collision",
+        help=(
+            "define the policy for files with the same hash-secured filename like "
+            "equal filenames in different directories: 'warn' replaces the first "
+            "copied file and appends a counter to the moved ones, 'fail' stops the "
+            "run, 'rehash' hashes the filename with its resolved parent path, and "
+            "'suffix' appends a counter to the hash; default is 'warn'. In the "
+            "content mode, equal names mean equal contents."
+        ),
+        choices=["warn", "fail", "rehash", "suffix"],
+        default="warn",
+        type=str,
+    )
+    parser.add_argument(
+        "-sd",
+        "--shard_depth",
+        help=(
+            "nest the hash-secured file(s) in SHARD_DEPTH levels of subdirectories, "
+            "which are named by the beginning of the hash like 'ab/cd/abcd...'; "
+            "default is 0 for a flat directory"
+        ),
+        default=0,
+        type=int,
+    )
+    parser.add_argument(
+        "-sw",
+        "--shard_width",
+        help="define the number of hexadecimal digits per shard level; default is 2",
+        default=2,
+        type=int,
+    )
     parser.add_argument(
         "-fxt",
         "--file_extension",
@@ -760,6 +2322,138 @@ def get_args(opt=None):
         ),
         action="store_true",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        help=(
+            "define the number of worker threads for copying or moving the file(s) in "
+            "parallel; default is 1"
+        ),
+        default=1,
+        type=int,
+    )
+    parser.add_argument(
+        "-bs",
+        "--batch_size",
+        help=(
+            "define the number of file(s), which are hashed, copied or moved, and "
+            f"reported together; default is {RECORD_BATCH_SIZE}"
+        ),
+        default=None,
+        type=int,
+    )
+    parser.add_argument(
+        "-c",
+        "--content",
+        help=(
+            "generate the secure hash of the file content instead of the filename. "
+            "The file(s) are read in chunks of 1 MiB, so also large file(s) can be "
+            "hashed with a constant memory usage."
+        ),
+        action="store_true",
+    )
+    parser.add_argument(
+        "-hp",
+        "--hash_pool",
+        help=(
+            "define how the file content(s) are hashed: 'serial' in the main process, "
+            "'process' on a pool of processes (one per CPU), or 'auto' for using the "
+            f"pool only for at least {POOL_MIN_FILES} files; default is 'auto'"
+        ),
+        default="auto",
+        choices=["auto", "serial", "process"],
+        type=str,
+    )
+    parser.add_argument(
+        "-re",
+        "--read_engine",
+        help=(
+            "define how the file content(s) are read for the hashing: 'readinto' into "
+            "one reused buffer, 'mmap' via a memory map, 'direct' via direct I/O "
+            "bypassing the page cache for huge cold files, or 'auto' for using 'mmap' "
+            f"only for files of at least {fileio.MMAP_MIN_SIZE // 2**20} MiB; default "
+            "is 'auto'"
+        ),
+        default="auto",
+        choices=fileio.READ_ENGINES,
+        type=str,
+    )
+    parser.add_argument(
+        "-ca",
+        "--cache",
+        help=(
+            "define the file of a persistent cache of the file content hashes, so "
+            "unchanged file(s) are not hashed again in the content mode. The entries "
+            "are keyed by device, inode, size, and modification time of the file(s)."
+        ),
+        default=None,
+        type=str,
+    )
+    parser.add_argument(
+        "-cma",
+        "--cache_max_age",
+        help=(
+            "define the maximum age in days of the cache entries since their last "
+            "usage; default is 30"
+        ),
+        default=30.0,
+        type=float,
+    )
+    parser.add_argument(
+        "-cme",
+        "--cache_max_entries",
+        help="define the maximum number of cache entries; default is unlimited",
+        default=None,
+        type=int,
+    )
+    parser.add_argument(
+        "-pl",
+        "--pipeline",
+        help=(
+            "run finding, hashing, copying or moving, and reporting of the file(s) "
+            "concurrently as stages of an asynchronous pipeline"
+        ),
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "-pg",
+        "--progress",
+        help=(
+            "show the number of processed files, the files and MB per second, and "
+            "the ETA a few times per second on stderr"
+        ),
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "-st",
+        "--stats",
+        help=(
+            "print the timings of the stages and the number of files, bytes, and "
+            "errors of the run, or write them to the JSON file STATS"
+        ),
+        nargs="?",
+        const="-",
+        default=None,
+        type=str,
+    )
+    parser.add_argument(
+        "-tm",
+        "--trace_memory",
+        help="record the peaks of the traced memory of the stages for --stats",
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "-la",
+        "--list_algorithms",
+        help=(
+            "list the available hash algorithms with their digest length and their "
+            "measured throughput"
+        ),
+        action="store_true",
+    )
     parser.add_argument(
         "-ver", "--verbose", help=("enable the verbose mode"), action="store_true"
     )
@@ -770,7 +2464,7 @@ def get_args(opt=None):
         action="store_true",
     )
 
-    args = vars(parser.parse_args())
+    args = vars(parser.parse_args(argv))
 
     # For pytest
     if opt:
@@ -780,14 +2474,137 @@ def get_args(opt=None):
     return args
 
 
+def list_algorithms():
+    """List the registered hash algorithms with their measured throughput."""
+    log(f"{'name':<12} {'tier':<9} {'bits':>5} {'MB/s':>9}")
+    for name in algorithms.available():
+        algorithm = algorithms.get(name)
+        throughput = algorithm.measure_throughput() / 1e6
+        log(
+            f"{name:<12} {algorithm.tier:<9} {8 * algorithm.digest_size:>5} "
+            f"{throughput:>9.1f}"
+        )
+
+
+def get_lookup_args(argv=None):
+    """Get the parser arguments of the lookup command from the command line.
+
+    Parameters
+    ----------
+    argv : list, optional
+        Arguments after `copy2hash lookup`; default is None for the ones of sys.argv.
+
+    Returns
+    -------
+    args : dict
+        Dictionary of the keywords and values from the parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="copy2hash lookup",
+        description=(
+            "look up the original file(s) of hash-secured filename(s) in a 'sqlite' "
+            "catalog"
+        ),
+    )
+    parser.add_argument("catalog", help="catalog of a 'sqlite' report", type=str)
+    parser.add_argument(
+        "query",
+        nargs="+",
+        help=(
+            "hash-secured filename(s) including the file-extension, or their "
+            "beginning for --prefix"
+        ),
+        type=str,
+    )
+    parser.add_argument(
+        "-p",
+        "--prefix",
+        help="find all hash-secured filenames starting with the query",
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "-f",
+        "--filename",
+        help=(
+            "reverse the lookup: find the hash-secured filename(s) of the original "
+            "filename(s)"
+        ),
+        action="store_true",
+        default=False,
+    )
+    return vars(parser.parse_args(argv))
+
+
+def lookup_runner(argv=None):
+    """Run the lookup command via command line.
+
+    Every found file is printed as tab separated line of the hash-secured file, the
+    original file, the SHA key, and the method.
+
+    Parameters
+    ----------
+    argv : list, optional
+        Arguments after `copy2hash lookup`; default is None for the ones of sys.argv.
+
+    Returns
+    -------
+    n_found : int
+        Number of found files.
+    """
+    args = get_lookup_args(argv)
+    if not Path(args["catalog"]).is_file():
+        log(f"Missing catalog {args['catalog']}!", 1)
+        return 0
+
+    catalog = Catalog(args["catalog"])
+    n_found = 0
+    try:
+        for query in args["query"]:
+            if args["filename"]:
+                path = Path(query)
+                rows = catalog.lookup_filename(
+                    path.name,
+                    home_dir=path.parent.as_posix() if path.parent.name else None,
+                )
+            else:
+                rows = catalog.lookup(query, prefix=args["prefix"])
+            if not rows:
+                log(f"No file found for '{query}'!", 3)
+            for row in rows:
+                log(
+                    "{}/{}\t{}/{}\t{}\t{}",
+                    None,
+                    row["copy_dir"],
+                    row["hashname"],
+                    row["home_dir"],
+                    row["filename"],
+                    row["sha_key"],
+                    row["method"],
+                )
+            n_found += len(rows)
+    finally:
+        catalog.close()
+        CONSOLE.flush()
+    return n_found
+
+
 def command_line_runner(opt=None):
     """Run bashplot() via command line.
 
+    The subcommand `copy2hash lookup` is passed to lookup_runner(), unless a file or
+    directory named `lookup` exists in the working directory; then it is copied
+    like every other input. `copy2hash -- lookup` always copies it.
+
     Parameters
     ----------
     opt : dict, optional
         Optional Dictionary for modifying the parser arguments; default is None.
     """
+    if not opt and sys.argv[1:2] == ["lookup"] and not os.path.exists("lookup"):
+        lookup_runner(sys.argv[2:])
+        return
+
     args = get_args()
 
     # For pytest
@@ -798,22 +2615,190 @@ def command_line_runner(opt=None):
     if args["version"]:
         log(__version__)
 
+    if args.get("list_algorithms"):
+        list_algorithms()
+        return
+
+    if args.get("pipeline"):
+        import asyncio
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(copy2hash_async(args))
+        finally:
+            loop.close()
+        return
+
+    try:
+        records = copy2hash_files(args.pop("infile"), **args)
+    except ValueError:
+        return
+    deque(records, maxlen=0)
+
+
+def check_args(args):
+    """Check and complete the parser arguments before a run.
+
+    Parameters
+    ----------
+    args : dict
+        Dictionary of the keywords and values from the parser.
+
+    Returns
+    -------
+    bool
+        True if the arguments are valid for a run, otherwise False.
+    """
     if not args["infile"]:
         log("Missing input file(s)!", mode=1)
-        return
+        return False
 
     if args["directory"]:
         args["directory"] = Path(args["directory"])
 
-    if not set(args["sha"]).issubset(SHAKeys.__dict__):
+    if args.get("resume") and not args.get("journal"):
+        log("Resuming requires the journal of the interrupted run!", 1)
+        return False
+
+    if args.get("link") and args["move"]:
+        log("The link mode is ignored for moving the file(s)!", 3)
+
+    if args.get("dedupe") and args["move"]:
+        log("The deduplication mode is ignored for moving the file(s)!", 3)
+
+    if not all(algorithms.is_available(sha_key) for sha_key in args["sha"]):
         log("No legal SHA-key(s) {}!".format(args["sha"]), 1)
-        return
+        return False
+
+    if args.get("batch_size") is not None and args["batch_size"] < 1:
+        log("The batch size has to be at least 1!", 1)
+        return False
+
+    if args.get("shard_depth"):
+        width = args.get("shard_width") or 0
+        digits = min(2 * algorithms.get(sha_key).digest_size for sha_key in args["sha"])
+        if args["shard_depth"] < 0 or width < 1 or args["shard_depth"] * width > digits:
+            log(
+                "The shards have to be a part of the {} digits of the hash!".format(
+                    digits
+                ),
+                1,
+            )
+            return False
 
     if args["verbose"]:
         msg = "Found following files:\n{}".format("\n".join(str(args["infile"])))
         log(msg=msg, mode=2)
+    return True
+
+
+def make_worker(args, stats=None, hooks=None):
+    """Make the Copy2Hash() of a run with the statistics of the application.
+
+    Parameters
+    ----------
+    args : dict
+        Dictionary of the keywords and values from the parser.
+    stats : RunStats, optional
+        Statistics of the run; default is None for the `--stats` option.
+    hooks : list, optional
+        Functions, which are added to the hooks of the statistics; default is None.
+
+    Returns
+    -------
+    worker : Copy2Hash
+        The worker of the run.
+    """
+    worker = Copy2Hash(args)
+    if hooks and stats is None:
+        stats = RunStats(trace_memory=args.get("trace_memory", False))
+    for hook in hooks or ():
+        stats.add_hook(hook)
+    worker.stats = stats
+    return worker
+
+
+def copy2hash_files(paths, stats=None, hooks=None, **options):
+    """Copy or move file(s) to hash-secured named file(s) and yield their records.
+
+    copy2hash_files() is the entry point for Python applications and for the command
+    line. The paths can be any iterable like a generator; they are consumed lazily
+    batch by batch, and the record of every file is yielded as soon as its batch is
+    processed. A small `batch_size` like 1 yields every file as it finishes, for
+    example for large files in the content mode; the default of RECORD_BATCH_SIZE
+    is faster for many small files.
+
+    Examples
+    --------
+    >>> for record in copy2hash_files(Path("data").glob("*.txt"), sha=["md5"]):
+    ...     print(record.filename, record.hashnames["md5"])
+
+    Parameters
+    ----------
+    paths : iterable
+        Filenames or directories of the file(s) to copy or to move.
+    stats : RunStats or str, optional
+        Statistics of the run, which the application reads after the run, or the
+        filename of the statistics like the `--stats` option; default is None.
+    hooks : list, optional
+        Functions, which are called as `hook(stage, seconds, result)` after every
+        stage; they enable the statistics. Default is None.
+    **options
+        Keywords and values, which replace the defaults of the parser like
+        `directory="copy", content=True, batch_size=1`. Unlike the command line, no
+        report is written by default; it has to be selected via `report=["json"]`.
 
-    Copy2Hash(args).copy2hash()
+    Returns
+    -------
+    records : generator
+        Records of the processed files; the run starts with the first record and
+        finishes with the last one.
+
+    Raises
+    ------
+    ValueError
+        If the options are invalid; the reason is logged.
+    """
+    opt = {"report": []}
+    opt.update(options)
+    opt["infile"] = paths
+    if not isinstance(stats, RunStats):
+        opt["stats"], stats = stats, None
+    args = get_args(opt=opt, argv=[])
+    if not check_args(args):
+        raise ValueError("Invalid options for copy2hash!")
+    return make_worker(args, stats, hooks).process()
+
+
+async def copy2hash_async(opt=None, stats=None, hooks=None):
+    """Copy or move file(s) to hash-secured named file(s) in a running event loop.
+
+    copy2hash_async() is the entry point for asyncio applications. It runs the
+    asynchronous pipeline of Copy2Hash.copy2hash_async() without blocking the event
+    loop.
+
+    Parameters
+    ----------
+    opt : dict, optional
+        Keywords and values, which replace the defaults of the parser like
+        `{"infile": ["example.txt"], "content": True}`; default is None.
+    stats : RunStats, optional
+        Statistics of the run, which the application reads after the run; default
+        is None.
+    hooks : list, optional
+        Functions, which are called as `hook(stage, seconds, result)` after every
+        stage; they enable the statistics. Default is None.
+
+    Returns
+    -------
+    bool
+        True if the file(s) are processed, False if the arguments are invalid.
+    """
+    args = get_args(opt=opt, argv=[])
+    if not check_args(args):
+        return False
+    await make_worker(args, stats, hooks).copy2hash_async()
+    return True
 
 
 if __name__ == "__main__":
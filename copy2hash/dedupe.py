@@ -0,0 +1,140 @@
+"""Incremental finder of duplicate files for copy2hash."""
+
+######################################################
+#
+# dedupe: - finding files with identical content via
+# their size, a partial hash, and a full hash, so the
+# duplicates can be linked instead of copied
+#
+######################################################
+
+import hashlib as hlib
+import os
+
+try:
+    from . import fileio
+except ImportError:
+    import fileio
+
+# Number of bytes at the beginning of the files for the partial hash
+PARTIAL_SIZE = 64 * 1024
+
+# Marker of a group, whose first file is already hashed for the next stage
+_HASHED = object()
+
+
+class Deduplicator:
+    """Incremental finder of duplicate files.
+
+    The files are compared stage by stage: first by their size, then by a partial
+    hash of their first PARTIAL_SIZE bytes, and finally by a full hash. A file is
+    only hashed for the next stage, if another file matches it in the current stage;
+    the first file of a group is hashed on demand when the second one arrives. If the
+    content hashes of the files are already known, they are compared directly.
+
+    Parameters
+    ----------
+    engine : str, optional
+        Read engine of `fileio.read_chunks()` for the full hashes; default is 'auto'.
+
+    Attributes
+    ----------
+    n_duplicates : int
+        Number of found duplicates.
+    """
+
+    def __init__(self, engine="auto"):
+        """Initialise the empty groups."""
+        self.engine = engine
+        self.n_duplicates = 0
+        self._sizes = {}
+        self._partials = {}
+        self._fulls = {}
+        self._digests = {}
+
+    def find(self, item, fname, size=None, digest=None):
+        """Find the first file with the same content.
+
+        Parameters
+        ----------
+        item : object
+            Item of the file like its record, which is returned for its duplicates.
+        fname : str
+            Filename including the parent directory.
+        size : int, optional
+            Size of the file in bytes; default is None for reading it from the file.
+        digest : str, optional
+            Content hash of the file; default is None for comparing the files stage
+            by stage.
+
+        Returns
+        -------
+        original : object
+            Item of the first file with the same content, or None if the file is the
+            first one with its content.
+        """
+        if digest is not None:
+            original = self._digests.setdefault(digest, item)
+        else:
+            if size is None:
+                size = os.stat(fname).st_size
+            original = self._find_staged(item, fname, size)
+        if original is item:
+            return None
+        self.n_duplicates += 1
+        return original
+
+    def _find_staged(self, item, fname, size):
+        """Compare the file by its size, its partial hash, and its full hash."""
+        first = self._sizes.setdefault(size, (item, fname))
+        if first is not _HASHED:
+            if first[0] is item:
+                return item
+            self._sizes[size] = _HASHED
+            self._partials.setdefault((size, self.partial_hash(first[1])), first)
+
+        key = size, self.partial_hash(fname)
+        first = self._partials.setdefault(key, (item, fname))
+        if first is not _HASHED:
+            if first[0] is item:
+                return item
+            # The partial hash of small files is already their full hash
+            if size <= PARTIAL_SIZE:
+                return first[0]
+            self._partials[key] = _HASHED
+            self._fulls.setdefault(key + (self.full_hash(first[1]),), first[0])
+        return self._fulls.setdefault(key + (self.full_hash(fname),), item)
+
+    @staticmethod
+    def partial_hash(fname):
+        """Hash the first PARTIAL_SIZE bytes of a file.
+
+        Parameters
+        ----------
+        fname : str
+            Filename including the parent directory.
+
+        Returns
+        -------
+        digest : bytes
+            Digest of the beginning of the file.
+        """
+        with open(fname, "rb") as f:
+            return hlib.blake2b(f.read(PARTIAL_SIZE), digest_size=16).digest()
+
+    def full_hash(self, fname):
+        """Hash the full content of a file.
+
+        Parameters
+        ----------
+        fname : str
+            Filename including the parent directory.
+
+        Returns
+        -------
+        digest : bytes
+            Digest of the content of the file.
+        """
+        hcode = hlib.blake2b(digest_size=32)
+        fileio.read_chunks(fname, [hcode.update], engine=self.engine)
+        return hcode.digest()
@@ -0,0 +1,444 @@
+"""File I/O engines for copy2hash."""
+
+######################################################
+#
+# fileio: - reading the file content for the hashing
+# via reusable buffers, memory maps, or direct I/O,
+# copying or linking the files via the kernel, and
+# moving them across filesystems
+#
+######################################################
+
+import errno
+import mmap
+import os
+from shutil import SameFileError
+import sys
+import time
+
+# Size of the chunks for reading the file content in bytes
+CHUNK_SIZE = 1024 * 1024
+# Minimum file size for reading the file content via a memory map in bytes
+MMAP_MIN_SIZE = 64 * 1024 * 1024
+# Alignment of the buffer, the offset, and the chunks for direct I/O in bytes
+DIRECT_ALIGNMENT = 4096
+
+READ_ENGINES = ("auto", "readinto", "mmap", "direct")
+
+# Size of the buffer for copying the files in userspace in bytes
+COPY_BUFFER_SIZE = 8 * 1024 * 1024
+# Maximum number of bytes per system call for copying the files in the kernel
+KERNEL_COPY_SIZE = 1024 * 1024 * 1024
+# Errors of the system calls, if the kernel cannot copy between both files
+_COPY_FALLBACK_ERRNOS = {
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.EBADF,
+    errno.EPERM,
+}
+# Errors of the links, if the filesystem cannot link both files
+_LINK_FALLBACK_ERRNOS = _COPY_FALLBACK_ERRNOS | {errno.ENOTTY, errno.EMLINK}
+# `os.sendfile()` copies between regular files only on Linux; on macOS and BSD, the
+# destination has to be a socket
+_USE_SENDFILE = sys.platform.startswith("linux") and hasattr(os, "sendfile")
+# Request code of the ioctl for cloning a file on btrfs or XFS (linux/fs.h)
+FICLONE = 0x40049409
+
+LINK_MODES = ("reflink", "hard", "sym")
+
+# Number of attempts of every step of a move
+MOVE_RETRIES = 3
+# Delay before the first retry of a step of a move in seconds, which is doubled
+RETRY_DELAY = 0.1
+# Errors of the system calls, which can pass on a retry like on network mounts
+_TRANSIENT_ERRNOS = {
+    errno.EAGAIN,
+    errno.EBUSY,
+    errno.EINTR,
+    errno.ETIMEDOUT,
+    errno.ESTALE,
+}
+# Suffix of the partial copy of a move across filesystems
+PARTIAL_SUFFIX = ".partial"
+
+
+def choose_read_engine(size):
+    """Choose the read engine for the automatic mode by the file size.
+
+    Parameters
+    ----------
+    size : int
+        Size of the file in bytes.
+
+    Returns
+    -------
+    engine : str
+        'mmap' for files of at least MMAP_MIN_SIZE bytes, otherwise 'readinto'.
+    """
+    if size >= MMAP_MIN_SIZE:
+        return "mmap"
+    return "readinto"
+
+
+def read_chunks(fname, updates, engine="auto", chunk_size=CHUNK_SIZE):
+    """Read the content of a file in chunks and feed them to the update function(s).
+
+    The chunks are memoryviews of a buffer, which is reused or mapped, so they are only
+    valid during the call of the update function(s) and must not be kept.
+
+    Parameters
+    ----------
+    fname : str
+        Filename including the parent directory of the file to read.
+    updates : list
+        Functions like `hashlib.sha256().update`, which are called for every chunk.
+    engine : str, optional
+        Read engine: 'readinto' for reading into one reused buffer, 'mmap' for a
+        memory map of the file, 'direct' for direct I/O bypassing the page cache,
+        or 'auto' for choosing by the file size; default is 'auto'.
+    chunk_size : int, optional
+        Size of the chunks in bytes, by default 1 MiB.
+
+    Returns
+    -------
+    engine : str
+        The read engine, which was used.
+    """
+    if engine == "direct":
+        if _read_direct(fname, updates, chunk_size):
+            return "direct"
+        # Not supported by the operating system or the filesystem
+        engine = "readinto"
+
+    with open(fname, "rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if engine == "auto":
+            engine = choose_read_engine(size)
+        if engine == "mmap" and size:
+            _read_mmap(f, updates, size, chunk_size)
+            return "mmap"
+        _read_readinto(f, updates, chunk_size)
+    return engine
+
+
+def _read_readinto(f, updates, chunk_size):
+    """Read the file into one reused buffer."""
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    buffer = bytearray(chunk_size)
+    with memoryview(buffer) as view:
+        while True:
+            n_bytes = f.readinto(buffer)
+            if not n_bytes:
+                break
+            with view[:n_bytes] as chunk:
+                for update in updates:
+                    update(chunk)
+
+
+def _read_mmap(f, updates, size, chunk_size):
+    """Read the file via a memory map straight from the page cache."""
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mm, "madvise"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        with memoryview(mm) as view:
+            for offset in range(0, size, chunk_size):
+                end = min(offset + chunk_size, size)
+                with view[offset:end] as chunk:
+                    for update in updates:
+                        update(chunk)
+
+
+def _read_direct(fname, updates, chunk_size):
+    """Read the file via direct I/O into an aligned buffer.
+
+    Returns False without feeding any chunk, if direct I/O is not supported. The
+    file is read up to its size, because direct I/O can also return short reads in
+    the middle of the file like on network filesystems; a file, which ends early,
+    raises an OSError instead of a digest of the truncated content.
+    """
+    if not hasattr(os, "O_DIRECT"):
+        return False
+    try:
+        fd = os.open(fname, os.O_RDONLY | os.O_DIRECT)
+    except OSError as e_1:
+        if e_1.errno in (errno.EINVAL, errno.EOPNOTSUPP):
+            return False
+        raise
+    # Anonymous memory maps are page aligned
+    chunk_size = -(-chunk_size // DIRECT_ALIGNMENT) * DIRECT_ALIGNMENT
+    try:
+        size = os.fstat(fd).st_size
+        with mmap.mmap(-1, chunk_size) as buffer, memoryview(buffer) as view:
+            offset = 0
+            while offset < size:
+                try:
+                    n_bytes = os.readv(fd, [buffer])
+                except OSError as e_2:
+                    if not offset and e_2.errno in (errno.EINVAL, errno.EOPNOTSUPP):
+                        return False
+                    raise
+                if not n_bytes:
+                    break
+                with view[:n_bytes] as chunk:
+                    for update in updates:
+                        update(chunk)
+                offset += n_bytes
+        if offset < size:
+            raise OSError(
+                errno.EIO, f"Read {offset} of {size} bytes of '{fname}' via direct I/O"
+            )
+    finally:
+        os.close(fd)
+    return True
+
+
+def copy_file(src, dst, buffer_size=COPY_BUFFER_SIZE):
+    """Copy the content and the permission bits of a file.
+
+    copy_file() copies the content in the kernel via `os.copy_file_range()`; if this
+    is not possible, via `os.sendfile()` on Linux, and finally via a large buffer in
+    userspace.
+    Every fallback continues at the current position of the files. The destination
+    is preallocated via `os.posix_fallocate()`.
+
+    Parameters
+    ----------
+    src : str
+        Filename of the source file.
+    dst : str
+        Filename of the destination file.
+    buffer_size : int, optional
+        Size of the buffer for copying in userspace in bytes, by default 8 MiB.
+
+    Returns
+    -------
+    method : str
+        The method, which finished the copying: 'copy_file_range', 'sendfile', or
+        'buffered'.
+
+    Raises
+    ------
+    SameFileError
+        If the source and the destination are the same file.
+    """
+    with open(src, "rb", buffering=0) as fsrc:
+        src_stat = os.fstat(fsrc.fileno())
+        try:
+            dst_stat = os.stat(dst)
+        except FileNotFoundError:
+            pass
+        else:
+            if (src_stat.st_dev, src_stat.st_ino) == (dst_stat.st_dev, dst_stat.st_ino):
+                raise SameFileError(f"{src!r} and {dst!r} are the same file")
+
+        with open(dst, "wb", buffering=0) as fdst:
+            _preallocate(fdst.fileno(), src_stat.st_size)
+            method = _copy_fd(fsrc, fdst, src_stat.st_size, buffer_size)
+            if hasattr(os, "fchmod"):
+                os.fchmod(fdst.fileno(), src_stat.st_mode & 0o7777)
+    return method
+
+
+def _preallocate(fd, size):
+    """Preallocate the destination file, if it is supported."""
+    if not size or not hasattr(os, "posix_fallocate"):
+        return
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except OSError as e_1:
+        if e_1.errno not in _COPY_FALLBACK_ERRNOS:
+            raise
+
+
+def _copy_fd(fsrc, fdst, size, buffer_size):
+    """Copy the open files via the kernel or via a buffer in userspace."""
+    if size:
+        for method, func in (
+            ("copy_file_range", getattr(os, "copy_file_range", None)),
+            ("sendfile", _sendfile if _USE_SENDFILE else None),
+        ):
+            if func is None:
+                continue
+            try:
+                while True:
+                    n_bytes = func(fsrc.fileno(), fdst.fileno(), KERNEL_COPY_SIZE)
+                    if not n_bytes:
+                        break
+            except OSError as e_1:
+                if e_1.errno not in _COPY_FALLBACK_ERRNOS:
+                    raise
+                continue
+            # The kernel stops early for special files, which are copied in userspace
+            if fsrc.tell() >= size:
+                return method
+
+    # Small files do not need the full buffer
+    buffer = bytearray(min(buffer_size, max(size, 64 * 1024)))
+    with memoryview(buffer) as view:
+        while True:
+            n_bytes = fsrc.readinto(buffer)
+            if not n_bytes:
+                break
+            with view[:n_bytes] as chunk:
+                written = 0
+                while written < n_bytes:
+                    written += fdst.write(chunk[written:])
+    return "buffered"
+
+
+def _sendfile(in_fd, out_fd, count):
+    """Copy via `os.sendfile()` from the current position of the source file."""
+    return os.sendfile(out_fd, in_fd, None, count)
+
+
+def link_file(src, dst, link):
+    """Link a file via a reflink, a hardlink, or a symlink.
+
+    The reflink and the hardlink fall back to copy_file(), if the filesystem cannot
+    link both files. An existing destination is replaced like by copy_file().
+
+    Parameters
+    ----------
+    src : str
+        Filename of the source file.
+    dst : str
+        Filename of the destination file.
+    link : str
+        Link mode: 'reflink', 'hard', or 'sym'.
+
+    Returns
+    -------
+    method : str
+        The method, which was used: 'reflink', 'hardlink', 'symlink', or the one of
+        copy_file().
+
+    Raises
+    ------
+    SameFileError
+        If the source and the destination are the same file.
+    """
+    src_stat = os.stat(src)
+    try:
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        pass
+    else:
+        if (src_stat.st_dev, src_stat.st_ino) == (dst_stat.st_dev, dst_stat.st_ino):
+            raise SameFileError(f"{src!r} and {dst!r} are the same file")
+    if os.path.lexists(dst):
+        os.unlink(dst)
+
+    if link == "sym":
+        os.symlink(os.path.abspath(src), dst)
+        return "symlink"
+    if link == "hard":
+        try:
+            os.link(src, dst)
+            return "hardlink"
+        except OSError as e_1:
+            if e_1.errno not in _LINK_FALLBACK_ERRNOS:
+                raise
+    elif link == "reflink" and _reflink(src, dst, src_stat):
+        return "reflink"
+    return copy_file(src, dst)
+
+
+def _reflink(src, dst, src_stat):
+    """Clone the file via the FICLONE ioctl, if it is supported."""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    with open(src, "rb", buffering=0) as fsrc, open(dst, "wb", buffering=0) as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        except OSError as e_1:
+            if e_1.errno not in _LINK_FALLBACK_ERRNOS:
+                raise
+            return False
+        os.fchmod(fdst.fileno(), src_stat.st_mode & 0o7777)
+    return True
+
+
+def move_file(src, dst, retries=MOVE_RETRIES, delay=RETRY_DELAY):
+    """Move a file on the same filesystem or across filesystems.
+
+    On the same filesystem, the file is renamed. If the destination is on another
+    filesystem, `os.rename()` fails with EXDEV, and the file is copied via
+    copy_file() to a partial file next to the destination together with its
+    timestamps, synced to the disk, renamed to the destination, and only then the
+    source is removed. So an interrupted move never loses the file. Every step is
+    retried on transient errors with a doubled delay.
+
+    Parameters
+    ----------
+    src : str
+        Filename of the source file.
+    dst : str
+        Filename of the destination file.
+    retries : int, optional
+        Number of attempts of every step, by default MOVE_RETRIES.
+    delay : float, optional
+        Delay before the first retry in seconds, by default RETRY_DELAY.
+
+    Returns
+    -------
+    method : str
+        The method, which was used: 'rename' or 'copy+unlink'.
+    """
+    try:
+        _retry(retries, delay, os.rename, src, dst)
+        return "rename"
+    except OSError as e_1:
+        if e_1.errno != errno.EXDEV:
+            raise
+    _retry(retries, delay, _copy_durable, src, dst)
+    _retry(retries, delay, os.unlink, src)
+    return "copy+unlink"
+
+
+def _retry(retries, delay, func, *args):
+    """Call the function and retry it on transient errors."""
+    for attempt in range(retries):
+        try:
+            return func(*args)
+        except OSError as e_1:
+            if e_1.errno not in _TRANSIENT_ERRNOS or attempt + 1 >= retries:
+                raise
+        time.sleep(delay * 2**attempt)
+
+
+def _copy_durable(src, dst):
+    """Copy a file via a synced partial file, which replaces the destination."""
+    partial = f"{dst}{PARTIAL_SUFFIX}"
+    try:
+        copy_file(src, partial)
+        src_stat = os.stat(src)
+        os.utime(partial, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+        _fsync(partial)
+        os.replace(partial, dst)
+    except BaseException:
+        if os.path.lexists(partial):
+            os.unlink(partial)
+        raise
+    _fsync(os.path.dirname(os.path.abspath(dst)))
+
+
+def _fsync(fname):
+    """Sync a file or the entries of a directory to the disk, if it is supported."""
+    try:
+        fd = os.open(fname, os.O_RDONLY)
+    except OSError:
+        # Directories cannot be opened on Windows
+        return
+    try:
+        os.fsync(fd)
+    except OSError as e_1:
+        if e_1.errno not in (errno.EINVAL, errno.EBADF):
+            raise
+    finally:
+        os.close(fd)
@@ -0,0 +1,146 @@
+"""Write-ahead journal of the copy and move operations for copy2hash.
+
+json is imported by the journal and the replay, so runs without a journal do not
+load it.
+"""
+
+######################################################
+#
+# journal: - recording the planned and the completed
+# operations as JSON lines, so an interrupted run can
+# be resumed without repeating the finished work
+#
+######################################################
+
+import os
+import threading
+
+# Number of completed operations, which are written and synced together
+JOURNAL_BATCH_SIZE = 256
+
+
+class Journal:
+    """Write-ahead journal of the copy and move operations.
+
+    Every operation is recorded twice as a JSON line: as 'planned' before it starts,
+    and as 'done' after it is completed. The planned operations are synced to the disk
+    in batches before any of them starts; the completed ones are written and synced in
+    batches of JOURNAL_BATCH_SIZE entries. A lost 'done' entry is harmless, because
+    the resume checks the planned operations on the disk.
+
+    Parameters
+    ----------
+    fname : str
+        Filename of the journal.
+    resume : bool, optional
+        If True, the existing journal is replayed and continued; otherwise, it is
+        replaced by a new one. Default is False.
+    batch_size : int, optional
+        Number of completed operations per write; default is JOURNAL_BATCH_SIZE.
+
+    Attributes
+    ----------
+    entries : dict
+        Last replayed entry for every pair of the source and the destination.
+    hashnames : dict
+        Replayed hash-secured filenames for every source.
+    """
+
+    def __init__(self, fname, resume=False, batch_size=JOURNAL_BATCH_SIZE):
+        """Initialise the journal and replay the existing one for resuming."""
+        import json
+
+        self._json = json
+        self.fname = fname
+        self.batch_size = batch_size
+        self.entries = {}
+        self.hashnames = {}
+        if resume:
+            for entry in self.replay(fname):
+                self.entries[entry["src"], entry["dst"]] = entry
+                if entry.get("hashnames"):
+                    self.hashnames[entry["src"]] = entry["hashnames"]
+        self._lines = []
+        self._lock = threading.Lock()
+        self._file = open(fname, "a" if resume else "w", encoding="utf-8")
+
+    @staticmethod
+    def replay(fname):
+        """Read the entries of a journal.
+
+        Parameters
+        ----------
+        fname : str
+            Filename of the journal.
+
+        Returns
+        -------
+        entries : list
+            The entries in the order of the journal; a missing journal has no entries
+            and a line truncated by a crash is ignored.
+        """
+        import json
+
+        entries = []
+        try:
+            with open(fname, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def plan(self, entries):
+        """Record and sync planned operations before they start.
+
+        Parameters
+        ----------
+        entries : list
+            Dictionaries with the keys 'op', 'src', 'dst', and 'hashnames'.
+        """
+        with self._lock:
+            for entry in entries:
+                self._lines.append(self._json.dumps(dict(entry, state="planned")))
+            self._flush()
+
+    def done(self, op, src, dst, method):
+        """Record a completed operation.
+
+        Parameters
+        ----------
+        op : str
+            Operation: 'copy' or 'move'.
+        src : str
+            Filename of the source file.
+        dst : str
+            Filename of the destination file.
+        method : str
+            The method, which was used for the operation.
+        """
+        entry = {"op": op, "src": src, "dst": dst, "method": method, "state": "done"}
+        with self._lock:
+            self._lines.append(self._json.dumps(entry))
+            if len(self._lines) >= self.batch_size:
+                self._flush()
+
+    def flush(self):
+        """Write and sync the pending entries."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        """Write and sync the pending entries; the lock must be held."""
+        if not self._lines:
+            return
+        self._file.write("\n".join(self._lines) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._lines = []
+
+    def close(self):
+        """Write the pending entries and close the journal."""
+        self.flush()
+        self._file.close()
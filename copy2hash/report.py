@@ -0,0 +1,166 @@
+"""Streaming report writers for copy2hash."""
+
+######################################################
+#
+# report: - writing the rows of the report while the
+# file(s) are copied or moved, so the memory usage is
+# independent of the number of files
+#
+######################################################
+
+from pathlib import Path
+
+# Size of the write buffer of the streaming reports in bytes
+STREAM_BUFFER_SIZE = 1024 * 1024
+# Report formats, which cannot be written row by row
+BATCH_FORMATS = ("pkl", "yaml", "xml")
+
+
+class ReportStream:
+    """Streaming report, which is written row by row.
+
+    The rows are collected in the write buffer of the file and flushed once per
+    written batch of rows, so a crash loses at most the batch in progress. Every
+    format writes a single row, which are the values in the order of the columns,
+    via its own `write_row(row)`. The modules of the formats are imported by
+    `write_header()`, so only the selected formats are imported.
+
+    Parameters
+    ----------
+    fname : str
+        Filename of the report.
+    columns : list
+        Names of the columns.
+    """
+
+    def __init__(self, fname, columns):
+        """Open the report and write its header."""
+        Path(fname).parent.mkdir(parents=True, exist_ok=True)
+        self.fname = fname
+        self.columns = list(columns)
+        self._file = open(fname, "w", newline="", buffering=STREAM_BUFFER_SIZE)
+        self.write_header()
+
+    def write_header(self):
+        """Write the header of the report."""
+
+    def write_rows(self, rows):
+        """Write a batch of rows and flush them.
+
+        Parameters
+        ----------
+        rows : iterable
+            Rows of the report.
+        """
+        for row in rows:
+            self.write_row(row)
+        self._file.flush()
+
+    def write_footer(self):
+        """Write the footer of the report."""
+
+    def close(self):
+        """Write the footer and close the report."""
+        self.write_footer()
+        self._file.close()
+
+
+class CsvStream(ReportStream):
+    """Streaming report in the `csv`-format or in the tab separated `ASCII`-format.
+
+    Parameters
+    ----------
+    fname : str
+        Filename of the report.
+    columns : list
+        Names of the columns.
+    delimiter : str, optional
+        Delimiter of the columns, by default ','.
+    """
+
+    def __init__(self, fname, columns, delimiter=","):
+        """Open the report and write its header."""
+        self.delimiter = delimiter
+        super().__init__(fname, columns)
+
+    def write_header(self):
+        """Write the names of the columns."""
+        import csv
+
+        self._writer = csv.writer(self._file, delimiter=self.delimiter)
+        self._writer.writerow(self.columns)
+
+    def write_row(self, row):
+        """Write a single row as a line."""
+        self._writer.writerow(row)
+
+
+class JsonLinesStream(ReportStream):
+    """Streaming report in the `JSON Lines`-format with one object per row."""
+
+    def write_header(self):
+        """Import the encoder of the objects."""
+        import json
+
+        self._dumps = json.dumps
+
+    def write_row(self, row):
+        """Write a single row as an object in one line."""
+        self._file.write(self._dumps(dict(zip(self.columns, row))))
+        self._file.write("\n")
+
+
+class JsonStream(ReportStream):
+    """Streaming report in the `json`-format as an array of one object per row."""
+
+    def write_header(self):
+        """Open the array."""
+        import json
+
+        self._dumps = json.dumps
+        self._file.write("[")
+        self._separator = "\n"
+
+    def write_row(self, row):
+        """Write a single row as an object of the array."""
+        self._file.write(self._separator)
+        self._file.write(self._dumps(dict(zip(self.columns, row))))
+        self._separator = ",\n"
+
+    def write_footer(self):
+        """Close the array."""
+        self._file.write("\n]\n")
+
+
+def open_stream(fname, key, columns):
+    """Open the streaming report of a report format.
+
+    Parameters
+    ----------
+    fname : str
+        Filename of the report without the file-extension.
+    key : str
+        Report format: 'csv', 'json', 'jsonl', 'sqlite', 'txt', or an own
+        file-extension for the `ASCII`-format.
+    columns : list
+        Names of the columns.
+
+    Returns
+    -------
+    stream : ReportStream or Catalog
+        The opened streaming report.
+    """
+    if key == "sqlite":
+        try:
+            from .catalog import Catalog
+        except ImportError:
+            from catalog import Catalog
+
+        return Catalog(f"{fname}.sqlite", columns)
+    if key == "csv":
+        return CsvStream(f"{fname}.csv", columns)
+    if key == "json":
+        return JsonStream(f"{fname}.json", columns)
+    if key == "jsonl":
+        return JsonLinesStream(f"{fname}.jsonl", columns)
+    return CsvStream(f"{fname}.{key}", columns, delimiter="\t")
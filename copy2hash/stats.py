@@ -0,0 +1,229 @@
+"""Run statistics and profiling hooks for copy2hash.
+
+The statistics are written as JSON on request, so json is imported by write().
+"""
+
+######################################################
+#
+# stats: - timing the stages of a run, counting the
+# files, bytes, and errors, and passing every stage
+# to the hooks of embedding applications
+#
+######################################################
+
+import threading
+import time
+
+
+class RunStats:
+    """Timings, counters, and memory peaks of the stages of a run.
+
+    Every call of a stage via run() is timed and passed to the hooks. The stages
+    can run in several threads like in the asynchronous pipeline, so the updates are
+    locked. Without a RunStats, copy2hash calls the stages directly, so the disabled
+    statistics cost a single check per batch.
+
+    Parameters
+    ----------
+    trace_memory : bool, optional
+        If True, the peaks of the traced memory are recorded via `tracemalloc` for
+        every stage; default is False, because tracing slows down the run.
+    hooks : list, optional
+        Functions, which are called after every stage as `hook(stage, seconds,
+        result)`; default is None.
+
+    Attributes
+    ----------
+    timings : dict
+        Number of calls, seconds, and memory peak in bytes of every stage.
+    counters : dict
+        Number of files, bytes, and errors, and the number of files per method.
+    """
+
+    def __init__(self, trace_memory=False, hooks=None):
+        """Initialise the empty statistics."""
+        self.trace_memory = trace_memory
+        self.hooks = list(hooks) if hooks else []
+        self.timings = {}
+        self.counters = {"files": 0, "bytes": 0, "errors": 0, "methods": {}}
+        self.peak_memory = None
+        self._start = None
+        self._seconds = None
+        self._tracemalloc = None
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook):
+        """Add a function, which is called after every stage.
+
+        Parameters
+        ----------
+        hook : callable
+            Function, which is called as `hook(stage, seconds, result)`.
+        """
+        self.hooks.append(hook)
+
+    def start(self):
+        """Start the clock and the tracing of the memory of the run."""
+        if self.trace_memory:
+            # tracemalloc imports pickle, so it is only imported for tracing
+            import tracemalloc
+
+            self._tracemalloc = tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+        self._start = time.perf_counter()
+
+    def stop(self):
+        """Stop the clock and the tracing of the memory of the run."""
+        if self._start is not None:
+            self._seconds = time.perf_counter() - self._start
+        if self._tracemalloc is not None and self._tracemalloc.is_tracing():
+            self.peak_memory = self._tracemalloc.get_traced_memory()[1]
+            self._tracemalloc.stop()
+
+    def run(self, stage, func, *args):
+        """Call the function of a stage and record its duration.
+
+        Parameters
+        ----------
+        stage : str
+            Name of the stage.
+        func : callable
+            Function of the stage.
+        *args
+            Arguments of the function.
+
+        Returns
+        -------
+        result : any
+            Result of the function.
+        """
+        tracer = self._tracemalloc
+        if tracer is not None and not tracer.is_tracing():
+            tracer = None
+        if tracer is not None and hasattr(tracer, "reset_peak"):
+            tracer.reset_peak()
+        start = time.perf_counter()
+        try:
+            result = func(*args)
+        finally:
+            seconds = time.perf_counter() - start
+            peak = tracer.get_traced_memory()[1] if tracer is not None else None
+            self.add(stage, seconds, peak)
+        for hook in self.hooks:
+            hook(stage, seconds, result)
+        return result
+
+    def add(self, stage, seconds, peak=None):
+        """Add the duration of a call of a stage.
+
+        Parameters
+        ----------
+        stage : str
+            Name of the stage.
+        seconds : float
+            Duration of the call in seconds.
+        peak : int, optional
+            Peak of the traced memory during the call in bytes; default is None.
+        """
+        with self._lock:
+            timing = self.timings.setdefault(
+                stage, {"calls": 0, "seconds": 0.0, "peak_memory": None}
+            )
+            timing["calls"] += 1
+            timing["seconds"] += seconds
+            if peak is not None:
+                timing["peak_memory"] = max(timing["peak_memory"] or 0, peak)
+
+    def count(self, files=0, nbytes=0, errors=0, methods=None):
+        """Add to the counters of the run.
+
+        Parameters
+        ----------
+        files : int, optional
+            Number of processed files; default is 0.
+        nbytes : int, optional
+            Number of processed bytes; default is 0.
+        errors : int, optional
+            Number of files, which could not be processed; default is 0.
+        methods : list, optional
+            Method of every processed file; default is None.
+        """
+        with self._lock:
+            self.counters["files"] += files
+            self.counters["bytes"] += nbytes
+            self.counters["errors"] += errors
+            for method in methods or ():
+                counts = self.counters["methods"]
+                counts[method] = counts.get(method, 0) + 1
+
+    def summary(self):
+        """Get the statistics of the run as dictionary.
+
+        Returns
+        -------
+        summary : dict
+            The timings of the stages, the counters, the total seconds, and the peak
+            of the traced memory of the run.
+        """
+        with self._lock:
+            return {
+                "seconds": self._seconds,
+                "peak_memory": self.peak_memory,
+                "counters": dict(self.counters, methods=dict(self.counters["methods"])),
+                "timings": {
+                    stage: dict(timing) for stage, timing in self.timings.items()
+                },
+            }
+
+    def format_summary(self):
+        """Format the statistics of the run as table.
+
+        Returns
+        -------
+        lines : list
+            Lines of the table of the stages and of the counters.
+        """
+        summary = self.summary()
+        total = sum(timing["seconds"] for timing in summary["timings"].values())
+        lines = [
+            f"{'stage':<10} {'calls':>7} {'seconds':>10} {'share':>7} {'peak':>10}"
+        ]
+        for stage, timing in summary["timings"].items():
+            share = timing["seconds"] / total if total else 0.0
+            peak = timing["peak_memory"]
+            peak = f"{peak / 1024 ** 2:>8.1f}MB" if peak is not None else f"{'-':>10}"
+            lines.append(
+                f"{stage:<10} {timing['calls']:>7} {timing['seconds']:>10.4f} "
+                f"{share:>7.1%} {peak}"
+            )
+        counters = summary["counters"]
+        lines.append(
+            f"files: {counters['files']}, bytes: {counters['bytes']}, "
+            f"errors: {counters['errors']}"
+        )
+        if counters["methods"]:
+            lines.append(
+                "methods: "
+                + ", ".join(
+                    f"{method}: {n}" for method, n in counters["methods"].items()
+                )
+            )
+        if summary["seconds"] is not None:
+            lines.append(f"total seconds: {summary['seconds']:.4f}")
+        if summary["peak_memory"] is not None:
+            lines.append(f"peak memory: {summary['peak_memory'] / 1024 ** 2:.1f}MB")
+        return lines
+
+    def write(self, fname):
+        """Write the statistics of the run in the `json`-format.
+
+        Parameters
+        ----------
+        fname : str
+            Filename of the statistics.
+        """
+        import json
+
+        with open(fname, "w") as f:
+            json.dump(self.summary(), f, indent=4)
@@ -0,0 +1,108 @@
+"""Streaming directory walker for copy2hash."""
+
+######################################################
+#
+# walker: - finding the file(s) of directory trees via
+# os.scandir() as a generator, so the processing starts
+# with the first file instead of after the full scan
+#
+######################################################
+
+import os
+
+
+def dir_identity(path):
+    """Get the identity of a directory.
+
+    Parameters
+    ----------
+    path : str
+        Path of the directory.
+
+    Returns
+    -------
+    identity : tuple
+        Device and inode of the directory, or None if it does not exist.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_dev, st.st_ino
+
+
+def scan_files(paths, recursive=False, exclude=(), onerror=None, snapshot=False):
+    """Find the regular files of the paths.
+
+    The directories are walked depth-first via `os.scandir()`, and the files are
+    yielded in the order of `os.scandir()` while the directory is read, so a huge
+    flat directory is never held in memory. The type of the entries is taken from
+    the cached data of the `os.DirEntry` and the files are not stat'ed; symlinks are
+    neither followed nor yielded in the directories.
+
+    Parameters
+    ----------
+    paths : iterable
+        Filenames or directories.
+    recursive : bool, optional
+        If True, the directories are walked; otherwise, the paths are yielded
+        unchanged. Default is False.
+    exclude : iterable, optional
+        Directories, which are not walked like the destination directory. They are
+        identified by their device and inode at the start of the walk, so they have
+        to exist before.
+    onerror : callable, optional
+        Function, which is called with the OSError of an unreadable directory;
+        default is None for ignoring them.
+    snapshot : bool, optional
+        If True, the entries of every directory are read completely and sorted by
+        their name before its files are yielded, for a deterministic order and so
+        that files created next to them during the walk are not found again.
+        Default is False.
+
+    Yields
+    ------
+    fname : str
+        Filename including the parent directory.
+    """
+    if not recursive:
+        yield from paths
+        return
+
+    excluded = {identity for identity in map(dir_identity, exclude) if identity}
+    excluded_inodes = {inode for _, inode in excluded}
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        stack = [os.fspath(path)]
+        while stack:
+            dirname = stack.pop()
+            subdirs = []
+            try:
+                with os.scandir(dirname) as it:
+                    entries = (
+                        sorted(it, key=lambda entry: entry.name) if snapshot else it
+                    )
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                subdirs.append(entry)
+                                continue
+                            if not entry.is_file(follow_symlinks=False):
+                                continue
+                        except OSError:
+                            # Removed during the walk
+                            continue
+                        yield entry.path
+            except OSError as e_1:
+                if onerror is not None:
+                    onerror(e_1)
+            for entry in reversed(subdirs):
+                # The inode is cached; the device is only needed for a match
+                if (
+                    entry.inode() in excluded_inodes
+                    and dir_identity(entry.path) in excluded
+                ):
+                    continue
+                stack.append(entry.path)
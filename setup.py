@@ -73,5 +73,5 @@ setup(
         "Topic :: Utilities",
     ],
     keywords=["sha", "sha256", "hash", "hash-key", "data-science", "database",],
-    extras_require={"testing": ["pipenv"]},
+    extras_require={"testing": ["pipenv"], "fast": ["xxhash"]},
 )
@@ -0,0 +1,36 @@
+import pytest
+
+
+@pytest.fixture
+def make_args(tmp_path):
+    """Write example files to `tmp_path` and make the arguments of a run over them.
+
+    The files are given as number of files `example_{i}` with the content
+    `example {i}`, as list of the contents of the files `example_{i}`, or as dict of
+    the relative filenames and their contents. The copy directory is `copy`, and the
+    keywords replace the default arguments.
+    """
+
+    def factory(files=3, suffix=".txt", **kwargs):
+        if isinstance(files, int):
+            files = [f"example {i}".encode() for i in range(files)]
+        if not isinstance(files, dict):
+            files = {f"example_{i}{suffix}": content for i, content in enumerate(files)}
+        fnames = []
+        for name, content in files.items():
+            fname = tmp_path.joinpath(name)
+            fname.parent.mkdir(parents=True, exist_ok=True)
+            fname.write_bytes(content)
+            fnames.append(fname.as_posix())
+        args = {
+            "infile": fnames,
+            "report": ["json"],
+            "report_name": "copy_report",
+            "sha": ["sha256"],
+            "directory": tmp_path.joinpath("copy").as_posix(),
+            "verbose": False,
+        }
+        args.update(kwargs)
+        return args
+
+    return factory
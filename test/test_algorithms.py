@@ -1,5 +1,8 @@
-from copy2hash import copy2hash
+from copy2hash import algorithms, copy2hash
+from functools import partial
 import hashlib as hashlib
+import pytest
+from pathlib import Path
 
 __refargs__ = {
     "infile": [],
@@ -148,3 +151,149 @@ class TestSHANames(object):
             fname=self.fname, suffix=".txt", sha_key="sha256"
         )
         assert copy2hash_result == f"sha256-{hashlib_result}.sha256"
+
+
+class TestSHAContent(object):
+    fname = Path("test/example3.bin")
+
+    def test_content_sha256(self):
+        hashlib_result = hashlib.sha256(self.fname.read_bytes()).hexdigest()
+        copy2hash_result = copy2hash.HashTag(args={}).file2hash(
+            self.fname, sha_key="sha256"
+        )
+        assert hashlib_result == copy2hash_result
+
+    def test_content_small_chunks(self):
+        hashlib_result = hashlib.blake2b(self.fname.read_bytes()).hexdigest()
+        copy2hash_result = copy2hash.HashTag(args={}).file2hash(
+            self.fname, sha_key="blake2b", chunk_size=7
+        )
+        assert hashlib_result == copy2hash_result
+
+    def test_content_shake_256(self):
+        hashlib_result = hashlib.shake_256(self.fname.read_bytes()).hexdigest(32)
+        copy2hash_result = copy2hash.HashTag(args={}).file2hash(
+            self.fname, sha_key="shake_256"
+        )
+        assert hashlib_result == copy2hash_result
+
+    def test_content_hashname(self):
+        args = dict(__refargs__, content=True, file_extension=False, file_suffix=False)
+
+        hashlib_result = hashlib.sha256(self.fname.read_bytes()).hexdigest()
+        copy2hash_result = copy2hash.HashTag(args=args).generate_hashname(
+            fname=self.fname, suffix=".bin", sha_key="sha256"
+        )
+        assert copy2hash_result == f"{hashlib_result}.bin"
+
+    def test_content_process_pool(self):
+        fnames = sorted(Path("test").glob("example*.*"))
+
+        serial_result = list(
+            copy2hash.HashTag(args={"hash_pool": "serial"}).hash_contents(
+                fnames, sha_keys=["sha3_512"]
+            )
+        )
+        process_result = list(
+            copy2hash.HashTag(args={"hash_pool": "process"}).hash_contents(
+                fnames, sha_keys=["sha3_512"]
+            )
+        )
+        assert serial_result == process_result
+        assert serial_result[0] == (
+            [hashlib.sha3_512(fnames[0].read_bytes()).hexdigest()],
+            None,
+        )
+
+    def test_content_single_pass(self):
+        sha_keys = ["sha256", "sha512", "blake2b", "shake_128"]
+        copy2hash_result = copy2hash.HashTag(args={}).file2hashes(
+            self.fname, sha_keys=sha_keys, chunk_size=1000
+        )
+        assert copy2hash_result == [
+            copy2hash.HashTag.file2hash(self.fname, sha_key) for sha_key in sha_keys
+        ]
+
+    def test_content_missing_file(self):
+        result = copy2hash.hash_content(("test/file_not_exist.txt", ["sha256"], "auto"))
+        assert result[0] is None and "file_not_exist.txt" in result[1]
+
+
+class TestRegistry(object):
+    fpath = "sha_key_test"
+
+    def test_builtin_algorithms(self):
+        sha_keys = [key for key in vars(copy2hash.SHAKeys) if not key.startswith("_")]
+        assert all(algorithms.is_available(sha_key) for sha_key in sha_keys)
+
+    def test_fast_algorithm(self):
+        hashlib_result = hashlib.blake2b(
+            self.fpath.encode("utf-8"), digest_size=16
+        ).hexdigest()
+        copy2hash_result = copy2hash.HashTag(args={}).fpath2hash(
+            self.fpath, sha_key="blake2b_128"
+        )
+        assert hashlib_result == copy2hash_result
+
+    def test_register_algorithm(self):
+        algorithm = algorithms.register(
+            "sha512_256_test", partial(hashlib.new, "sha512"), tier="external"
+        )
+        assert algorithm.digest_size == 64
+        assert algorithms.is_available("sha512_256_test")
+        assert (
+            copy2hash.HashTag.fpath2hash(self.fpath, sha_key="sha512_256_test")
+            == hashlib.sha512(self.fpath.encode("utf-8")).hexdigest()
+        )
+
+    def test_unknown_algorithm(self):
+        assert not algorithms.is_available("sha713")
+        with pytest.raises(SystemExit):
+            copy2hash.HashTag.fpath2hash(self.fpath, sha_key="sha713")
+
+    def test_throughput(self):
+        algorithm = algorithms.get("sha256")
+        assert algorithm.measure_throughput(nbytes=1024 * 1024) > 0
+        assert algorithm.throughput > 0
+
+
+class TestHashNames(object):
+    fnames = ["example_1.txt", "example_2.txt", "example_1.txt"]
+
+    def test_hash_names(self):
+        hcodes = copy2hash.HashTag.hash_names(self.fnames, ["sha256", "md5"])
+        assert hcodes == [
+            [
+                hashlib.sha256(fname.encode("utf-8")).hexdigest(),
+                hashlib.md5(fname.encode("utf-8")).hexdigest(),
+            ]
+            for fname in self.fnames
+        ]
+
+    def test_hash_names_memoized(self):
+        copy2hash.name_digests.cache_clear()
+        copy2hash.HashTag.hash_names(self.fnames, ["sha1"])
+        info = copy2hash.name_digests.cache_info()
+        assert (info.hits, info.misses) == (1, 2)
+
+    def test_hash_names_resolved_once(self, monkeypatch):
+        calls = []
+        get = algorithms.get
+
+        def counted_get(name):
+            calls.append(name)
+            return get(name)
+
+        copy2hash.name_digests.cache_clear()
+        monkeypatch.setattr(algorithms, "get", counted_get)
+        copy2hash.HashTag.hash_names(self.fnames, ["sha256", "md5"])
+        assert calls == ["sha256", "md5"]
+
+    def test_hash_names_side_effect_free(self):
+        hashtag = copy2hash.HashTag(args={})
+        hashtag.hash_names(self.fnames, ["sha256"])
+        assert "hname" not in vars(hashtag)
+
+    def test_hash_names_unknown_algorithm(self):
+        with pytest.raises(SystemExit):
+            copy2hash.HashTag.hash_names(self.fnames, ["sha713"])
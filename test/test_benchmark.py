@@ -0,0 +1,40 @@
+from importlib import util
+from pathlib import Path
+import json
+
+spec = util.spec_from_file_location(
+    "bench_copy2hash",
+    Path(__file__).parent.parent.joinpath("benchmark", "bench_copy2hash.py"),
+)
+bench_copy2hash = util.module_from_spec(spec)
+spec.loader.exec_module(bench_copy2hash)
+
+
+class TestBenchmark(object):
+    def test_parse_size(self):
+        assert bench_copy2hash.parse_size("64B") == 64
+        assert bench_copy2hash.parse_size("4KiB") == 4096
+        assert bench_copy2hash.parse_size("1.5MiB") == 3 * 512 * 1024
+        assert bench_copy2hash.parse_size("1GiB") == 1024**3
+
+    def test_make_tree(self, tmp_path):
+        bench_copy2hash.make_tree(tmp_path, 40, 100, layout="nested")
+        fnames = sorted(tmp_path.rglob("*.dat"))
+        assert len(fnames) == 40
+        assert {fname.parent.name for fname in fnames} == {"d0", "d1"}
+        assert {fname.stat().st_size for fname in fnames} == {100}
+
+    def test_benchmark_run(self, tmp_path):
+        output = tmp_path.joinpath("results.jsonl")
+        argv = ["-n", "40", "-l", "nested", "-o", str(output), "-t", str(tmp_path)]
+        bench_copy2hash.main(argv)
+        bench_copy2hash.main(argv)
+
+        runs = [json.loads(line) for line in output.read_text().splitlines()]
+        assert len(runs) == 2
+        stages = [result["stage"] for result in runs[0]["results"]]
+        assert stages[0] == "import"
+        assert stages[1:5] == ["find_files", "hash_names", "hash_contents", "copy"]
+        assert "write_yaml" in stages and stages[-1] == "move"
+        # The synthetic trees are removed
+        assert list(tmp_path.iterdir()) == [output]
@@ -0,0 +1,127 @@
+from copy2hash import copy2hash
+from copy2hash.cache import HashCache
+import hashlib as hashlib
+import os
+from pathlib import Path
+import time
+
+
+def make_file(path, content, age=3600):
+    path.write_bytes(content)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+class TestHashCache(object):
+    def test_cache_hit(self, tmp_path):
+        fname = make_file(tmp_path.joinpath("example.txt"), b"example")
+        identity = HashCache.identity(fname)
+        hcache = HashCache(tmp_path.joinpath("cache.db").as_posix())
+        assert hcache.lookup(identity, ["sha256"]) is None
+        hcache.store(identity, ["sha256", "md5"], ["a", "b"])
+        hcache.close()
+
+        hcache = HashCache(tmp_path.joinpath("cache.db").as_posix())
+        assert hcache.lookup(identity, ["md5", "sha256"]) == ["b", "a"]
+        assert hcache.lookup(identity, ["sha1"]) is None
+        assert (hcache.hits, hcache.misses) == (1, 1)
+        hcache.close()
+
+    def test_cache_modified_file(self, tmp_path):
+        fname = make_file(tmp_path.joinpath("example.txt"), b"example")
+        hcache = HashCache(tmp_path.joinpath("cache.db").as_posix())
+        hcache.store(HashCache.identity(fname), ["sha256"], ["a"])
+        make_file(fname, b"changed", age=1800)
+        assert hcache.lookup(HashCache.identity(fname), ["sha256"]) is None
+        hcache.close()
+
+    def test_cache_racy_file(self, tmp_path):
+        fname = make_file(tmp_path.joinpath("example.txt"), b"example", age=0)
+        hcache = HashCache(tmp_path.joinpath("cache.db").as_posix())
+        hcache.store(HashCache.identity(fname), ["sha256"], ["a"])
+        assert hcache.lookup(HashCache.identity(fname), ["sha256"]) is None
+        hcache.close()
+
+    def test_cache_max_entries(self, tmp_path):
+        hcache = HashCache(tmp_path.joinpath("cache.db").as_posix(), max_entries=2)
+        for i in range(4):
+            fname = make_file(tmp_path.joinpath(f"example_{i}.txt"), bytes([i]))
+            hcache.store(HashCache.identity(fname), ["sha256"], [str(i)])
+        hcache.close()
+
+        hcache = HashCache(tmp_path.joinpath("cache.db").as_posix())
+        (n_entries,) = hcache.connection.execute(
+            "SELECT COUNT(*) FROM hashes"
+        ).fetchone()
+        assert n_entries == 2
+        hcache.close()
+
+
+class TestCachedContent(object):
+    def test_content_cache(self, tmp_path):
+        fnames = [
+            make_file(tmp_path.joinpath(f"example_{i}.txt"), f"example {i}".encode())
+            for i in range(3)
+        ]
+        args = {
+            "infile": fnames,
+            "sha": ["sha256", "md5"],
+            "directory": tmp_path.joinpath("copy"),
+            "content": True,
+            "cache": tmp_path.joinpath("cache.db").as_posix(),
+        }
+
+        c2h = copy2hash.HashTag(args)
+        c2h.cache = HashCache(args["cache"])
+        first = list(
+            c2h.hash_contents([fname.as_posix() for fname in fnames], args["sha"])
+        )
+        c2h.cache.close()
+        c2h.cache = HashCache(args["cache"])
+        second = list(
+            c2h.hash_contents([fname.as_posix() for fname in fnames], args["sha"])
+        )
+        assert c2h.cache.hits == 3
+        c2h.cache.close()
+
+        assert first == second
+        assert second[1] == (
+            [
+                hashlib.sha256(b"example 1").hexdigest(),
+                hashlib.md5(b"example 1").hexdigest(),
+            ],
+            None,
+        )
+
+    def test_content_cache_missing_file(self, tmp_path):
+        c2h = copy2hash.HashTag({"sha": ["sha256"]})
+        c2h.cache = HashCache(tmp_path.joinpath("cache.db").as_posix())
+        ((hcodes, error),) = c2h.hash_contents(
+            [tmp_path.joinpath("missing.txt").as_posix()], ["sha256"]
+        )
+        c2h.cache.close()
+        assert hcodes is None and error
+
+    def test_copy_with_cache(self, tmp_path):
+        fname = make_file(tmp_path.joinpath("example.txt"), b"example")
+        args = {
+            "infile": [fname],
+            "report": ["json"],
+            "report_name": "copy_report",
+            "sha": ["sha256"],
+            "directory": tmp_path.joinpath("copy").as_posix(),
+            "move": False,
+            "file_extension": False,
+            "file_suffix": False,
+            "no_file_extension": True,
+            "content": True,
+            "cache": tmp_path.joinpath("cache.db").as_posix(),
+            "verbose": False,
+            "version": False,
+        }
+        copy2hash.command_line_runner(opt=args)
+        copy2hash.command_line_runner(opt=args)
+
+        hname = hashlib.sha256(b"example").hexdigest()
+        assert tmp_path.joinpath("copy", hname).read_bytes() == b"example"
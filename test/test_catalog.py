@@ -0,0 +1,99 @@
+from copy2hash import copy2hash
+from copy2hash.catalog import Catalog
+import hashlib as hashlib
+import sys
+
+
+class TestCatalog(object):
+    columns = ["index", "filename", "mode", "home_dir", "copy_dir", "method", "md5"]
+
+    def make_catalog(self, tmp_path):
+        catalog = Catalog(tmp_path.joinpath("catalog.sqlite"), self.columns)
+        catalog.write_rows(
+            [
+                (0, "a.txt", "copy", "data", "copy", "buffered", "abc1.txt"),
+                (1, "b.txt", "copy", "data", "copy", "buffered", "abd2.txt"),
+                (2, "c.txt", "copy", "data", "copy", None, None),
+            ]
+        )
+        return catalog
+
+    def test_lookup(self, tmp_path):
+        catalog = self.make_catalog(tmp_path)
+        (row,) = catalog.lookup("abc1.txt")
+        assert (row["filename"], row["sha_key"]) == ("a.txt", "md5")
+        assert catalog.lookup("abc1") == []
+        catalog.close()
+
+    def test_lookup_prefix(self, tmp_path):
+        catalog = self.make_catalog(tmp_path)
+        assert [row["filename"] for row in catalog.lookup("ab", prefix=True)] == [
+            "a.txt",
+            "b.txt",
+        ]
+        assert [row["filename"] for row in catalog.lookup("abd", prefix=True)] == [
+            "b.txt"
+        ]
+        catalog.close()
+
+    def test_lookup_filename(self, tmp_path):
+        catalog = self.make_catalog(tmp_path)
+        (row,) = catalog.lookup_filename("b.txt", home_dir="data")
+        assert row["hashname"] == "abd2.txt"
+        assert catalog.lookup_filename("b.txt", home_dir="other") == []
+        # Files without a hash-secured filename are not cataloged
+        assert catalog.lookup_filename("c.txt") == []
+        catalog.close()
+
+    def test_catalog_replaces_rows(self, tmp_path):
+        self.make_catalog(tmp_path).close()
+        catalog = self.make_catalog(tmp_path)
+        assert len(catalog.lookup("", prefix=True)) == 2
+        catalog.close()
+
+
+class TestLookupCommand(object):
+    opt = {"report": ["sqlite"], "sha": ["sha256", "md5"], "content": True}
+
+    def test_sqlite_report(self, tmp_path, make_args, capsys):
+        copy2hash.command_line_runner(opt=make_args(suffix=".out", **self.opt))
+        catalog = tmp_path.joinpath("copy", "copy_report.sqlite").as_posix()
+
+        hname = hashlib.sha256(b"example 1").hexdigest()
+        assert copy2hash.lookup_runner([catalog, f"{hname}.out"]) == 1
+        line = capsys.readouterr().out.strip()
+        assert line.split("\t")[1] == tmp_path.joinpath("example_1.out").as_posix()
+
+        assert copy2hash.lookup_runner([catalog, "-p", hname[:8]]) == 1
+        assert copy2hash.lookup_runner([catalog, "-f", "example_2.out"]) == 2
+
+    def test_streamed_sqlite_report(self, tmp_path, make_args):
+        copy2hash.command_line_runner(
+            opt=make_args(suffix=".out", stream_report=True, **self.opt)
+        )
+        catalog = tmp_path.joinpath("copy", "copy_report.sqlite").as_posix()
+
+        hname = hashlib.md5(b"example 0").hexdigest()
+        assert copy2hash.lookup_runner([catalog, f"{hname}.out"]) == 1
+
+    def test_lookup_subcommand(self, tmp_path, make_args, capsys, monkeypatch):
+        copy2hash.command_line_runner(opt=make_args(suffix=".out", **self.opt))
+        catalog = tmp_path.joinpath("copy", "copy_report.sqlite").as_posix()
+
+        hname = hashlib.sha256(b"example 0").hexdigest()
+        monkeypatch.setattr(sys, "argv", ["copy2hash", "lookup", catalog, hname, "-p"])
+        copy2hash.command_line_runner()
+        assert "example_0.out" in capsys.readouterr().out
+
+    def test_lookup_file_named_lookup(self, tmp_path, monkeypatch):
+        # An existing input file named `lookup` is not taken as the subcommand
+        monkeypatch.chdir(tmp_path)
+        tmp_path.joinpath("lookup").write_text("example")
+        monkeypatch.setattr(sys, "argv", ["copy2hash", "lookup", "--directory", "copy"])
+        copy2hash.command_line_runner()
+        hname = hashlib.sha256(b"lookup").hexdigest()
+        assert tmp_path.joinpath("copy", hname).read_text() == "example"
+
+    def test_lookup_missing_catalog(self, tmp_path):
+        catalog = tmp_path.joinpath("missing.sqlite").as_posix()
+        assert copy2hash.lookup_runner([catalog, "abc"]) == 0
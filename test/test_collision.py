@@ -0,0 +1,112 @@
+from copy2hash import copy2hash
+from copy2hash.collision import CollisionIndex
+import hashlib as hashlib
+import json
+import pytest
+import time
+
+
+def read_report(tmp_path):
+    return json.loads(tmp_path.joinpath("copy/copy_report.json").read_text())
+
+
+class TestCollisionIndex(object):
+    def test_add(self):
+        index = CollisionIndex()
+        assert index.add("copy/abc.txt")
+        assert index.add("copy/abd.txt")
+        assert not index.add("copy/abc.txt")
+        assert (index.n_names, index.n_collisions) == (2, 1)
+        index.close()
+
+    def test_spill(self, tmp_path):
+        index = CollisionIndex(max_entries=10, bloom_bits=1024, spill_dir=tmp_path)
+        assert all(index.add(f"copy/{i}.txt") for i in range(100))
+        (spill,) = tmp_path.iterdir()
+        assert len(index._digests) < 10
+        assert not any(index.add(f"copy/{i}.txt") for i in range(100))
+        assert index.add("copy/100.txt")
+        index.close()
+        assert not spill.exists()
+
+
+class TestCollisionMode(object):
+    files = {"dir_a/example.txt": b"dir_a", "dir_b/example.txt": b"dir_b"}
+    hname = hashlib.sha256(b"example.txt").hexdigest()
+
+    def test_collision_warn(self, tmp_path, make_args, capsys):
+        copy2hash.command_line_runner(opt=make_args(self.files))
+        assert "collides with another file" in capsys.readouterr().out
+        report = read_report(tmp_path)
+        assert report["sha256"] == [f"{self.hname}.txt"] * 2
+        assert tmp_path.joinpath("copy", f"{self.hname}.txt").read_text() == "dir_b"
+
+    def test_collision_warn_workers(self, tmp_path, make_args, monkeypatch):
+        active, overlaps = set(), []
+        copy_file = copy2hash.Copy2Hash.copy_file
+
+        def tracked(self, job):
+            record, copyname = job
+            if copyname in active:
+                overlaps.append(copyname)
+            active.add(copyname)
+            time.sleep(0.05)
+            try:
+                return copy_file(self, job)
+            finally:
+                active.discard(copyname)
+
+        monkeypatch.setattr(copy2hash.Copy2Hash, "copy_file", tracked)
+        files = {f"dir_{i}/example.txt": f"dir_{i}".encode() for i in range(4)}
+        copy2hash.command_line_runner(opt=make_args(files, workers=4))
+        assert overlaps == []
+        assert tmp_path.joinpath("copy", f"{self.hname}.txt").read_text() == "dir_3"
+
+    def test_collision_fail(self, tmp_path, make_args):
+        with pytest.raises(SystemExit):
+            copy2hash.command_line_runner(opt=make_args(self.files, collision="fail"))
+        assert not tmp_path.joinpath("copy", f"{self.hname}.txt").exists()
+
+    def test_collision_rehash(self, tmp_path, make_args):
+        args = make_args(self.files, collision="rehash")
+        copy2hash.command_line_runner(opt=args)
+        rehashed = hashlib.sha256(
+            tmp_path.joinpath("dir_b", "example.txt").as_posix().encode("utf-8")
+        ).hexdigest()
+        report = read_report(tmp_path)
+        assert report["sha256"] == [f"{self.hname}.txt", f"{rehashed}.txt"]
+        assert tmp_path.joinpath("copy", f"{rehashed}.txt").read_text() == "dir_b"
+
+    def test_collision_rehash_relative(self, tmp_path, make_args, monkeypatch):
+        args = make_args(self.files, collision="rehash")
+        monkeypatch.chdir(tmp_path)
+        args["infile"] = ["dir_a/example.txt", "dir_b/example.txt"]
+        copy2hash.command_line_runner(opt=args)
+        rehashed = hashlib.sha256(
+            tmp_path.resolve().joinpath("dir_b", "example.txt").as_posix().encode()
+        ).hexdigest()
+        assert read_report(tmp_path)["sha256"][1] == f"{rehashed}.txt"
+
+    def test_collision_warn_move(self, tmp_path, make_args, capsys):
+        copy2hash.command_line_runner(opt=make_args(self.files, move=True))
+        assert "collides with another file" in capsys.readouterr().out
+        report = read_report(tmp_path)
+        assert report["sha256"] == [f"{self.hname}.txt", f"{self.hname}-1.txt"]
+        assert tmp_path.joinpath("copy", f"{self.hname}.txt").read_text() == "dir_a"
+        assert tmp_path.joinpath("copy", f"{self.hname}-1.txt").read_text() == "dir_b"
+
+    def test_collision_suffix(self, tmp_path, make_args):
+        args = make_args(self.files, collision="suffix", move=True, shard_depth=1)
+        copy2hash.command_line_runner(opt=args)
+        shard = self.hname[:2]
+        report = read_report(tmp_path)
+        assert report["sha256"] == [
+            f"{shard}/{self.hname}.txt",
+            f"{shard}/{self.hname}-1.txt",
+        ]
+        assert tmp_path.joinpath("copy", shard, f"{self.hname}-1.txt").is_file()
+
+    def test_collision_content(self, tmp_path, make_args):
+        args = make_args(self.files, collision="fail", content=True)
+        copy2hash.command_line_runner(opt=args)
+        assert len(set(read_report(tmp_path)["sha256"])) == 2
@@ -1,3 +1,5 @@
+import json
+import hashlib
 from copy2hash import copy2hash
 from pathlib import Path
 
@@ -203,3 +205,97 @@ class TestSingleRuns(object):
         copy2hash.command_line_runner(opt=args)
 
         assert 1
+
+    def test_content_copy(self, tmp_path):
+        args = {
+            "infile": list(Path("test").glob("example3.*")),
+            "report": ["json"],
+            "report_name": "copy_report",
+            "sha": ["sha256"],
+            "directory": tmp_path.as_posix(),
+            "move": False,
+            "file_extension": False,
+            "file_suffix": False,
+            "no_file_extension": True,
+            "content": True,
+            "verbose": True,
+            "version": False,
+        }
+
+        copy2hash.command_line_runner(opt=args)
+
+        hname = hashlib.sha256(Path("test/example3.bin").read_bytes()).hexdigest()
+        assert tmp_path.joinpath(hname).read_bytes() == Path(
+            "test/example3.npy"
+        ).read_bytes()
+
+    def test_copy_workers(self, tmp_path):
+        fnames = sorted(Path("test").glob("example*.*"))
+        args = {
+            "infile": fnames,
+            "report": ["json"],
+            "report_name": "copy_report",
+            "sha": ["sha256"],
+            "directory": tmp_path.as_posix(),
+            "move": False,
+            "workers": 4,
+            "file_extension": False,
+            "file_suffix": False,
+            "no_file_extension": False,
+            "verbose": True,
+            "version": False,
+        }
+
+        copy2hash.command_line_runner(opt=args)
+
+        for fname in fnames:
+            hname = hashlib.sha256(fname.name.encode("utf-8")).hexdigest()
+            assert tmp_path.joinpath(f"{hname}{fname.suffix}").is_file()
+
+    def test_copy_once_per_sha_key(self, tmp_path):
+        fnames = sorted(Path("test").glob("example*.txt"))
+        args = {
+            "infile": fnames,
+            "report": ["json"],
+            "report_name": "copy_report",
+            "sha": ["sha256", "md5"],
+            "directory": tmp_path.as_posix(),
+            "move": False,
+            "file_extension": False,
+            "file_suffix": False,
+            "no_file_extension": False,
+            "verbose": False,
+            "version": False,
+        }
+
+        copy2hash.command_line_runner(opt=args)
+
+        copies = [path for path in tmp_path.iterdir() if path.suffix == ".txt"]
+        assert len(copies) == 2 * len(fnames)
+        for fname in fnames:
+            hname = hashlib.md5(fname.name.encode("utf-8")).hexdigest()
+            assert tmp_path.joinpath(f"{hname}.txt").read_bytes() == fname.read_bytes()
+
+    def test_link_report(self, tmp_path):
+        src = tmp_path.joinpath("example3.bin")
+        src.write_bytes(Path("test/example3.bin").read_bytes())
+        args = {
+            "infile": [src.as_posix()],
+            "report": ["json"],
+            "report_name": "copy_report",
+            "sha": ["sha256"],
+            "directory": tmp_path.joinpath("links").as_posix(),
+            "move": False,
+            "link": "hard",
+            "file_extension": False,
+            "file_suffix": False,
+            "no_file_extension": False,
+            "verbose": True,
+            "version": False,
+        }
+
+        copy2hash.command_line_runner(opt=args)
+
+        report = json.loads(tmp_path.joinpath("links/copy_report.json").read_text())
+        assert report["method"] == ["hardlink"]
+        assert tmp_path.joinpath("links", report["sha256"][0]).samefile(src)
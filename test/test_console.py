@@ -0,0 +1,98 @@
+from copy2hash import copy2hash
+from copy2hash.console import Console, Progress
+import io
+import threading
+
+
+class NotFormatted(object):
+    def __format__(self, spec):
+        raise AssertionError("Filtered messages are not formatted")
+
+
+class TestConsole(object):
+    def test_buffered(self):
+        stream = io.StringIO()
+        console = Console(stream=stream, buffer_size=3)
+        console.log("first")
+        console.log("second {}", 2, 2)
+        assert stream.getvalue() == ""
+        console.log("third")
+        assert stream.getvalue() == "first\n[VERBOSE] second 2\nthird\n"
+
+    def test_error_flushed(self):
+        stream = io.StringIO()
+        console = Console(stream=stream)
+        console.log("first")
+        console.log("Missing file", 1)
+        assert stream.getvalue() == "first\n[ERROR] Missing file\n"
+        console.log("Collision", 3)
+        assert stream.getvalue().endswith("[WARNING] Collision\n")
+
+    def test_threads(self):
+        stream = io.StringIO()
+        console = Console(stream=stream, buffer_size=7)
+
+        def log_lines(name):
+            for i in range(1000):
+                console.log("{} {}", None, name, i)
+
+        threads = [threading.Thread(target=log_lines, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        console.flush()
+        assert len(stream.getvalue().splitlines()) == 4000
+
+    def test_verbose_filtered(self):
+        stream = io.StringIO()
+        console = Console(stream=stream)
+        console.verbose = False
+        console.log("Copy file {}", 2, NotFormatted())
+        console.flush()
+        assert stream.getvalue() == ""
+
+    def test_verbose_per_run(self, capsys):
+        verbose = copy2hash.Copy2Hash({"verbose": True})
+        quiet = copy2hash.Copy2Hash({"verbose": False})
+        quiet.log("Copy file {}", 2, NotFormatted())
+        verbose.log("Copy file {}", 2, "example")
+        copy2hash.CONSOLE.flush()
+        assert capsys.readouterr().out == "[VERBOSE] Copy file example\n"
+
+
+class TestProgress(object):
+    def test_rate_limited(self):
+        stream = io.StringIO()
+        progress = Progress(total=1000, stream=stream, interval=60.0)
+        for _ in range(1000):
+            progress.update(nbytes=1024)
+        assert stream.getvalue() == ""
+        progress.close()
+        (line,) = stream.getvalue().splitlines()
+        assert line.startswith("[PROGRESS] 1000/1000 files, ")
+        assert "files/s" in line and "MB/s" in line and "ETA 0:00:00" in line
+
+    def test_unknown_total(self):
+        stream = io.StringIO()
+        progress = Progress(stream=stream, interval=0.0)
+        progress.update()
+        line = stream.getvalue().splitlines()[0]
+        assert line.startswith("[PROGRESS] 1 files, ") and "ETA" not in line
+
+
+class TestProgressMode(object):
+    def test_progress(self, tmp_path, capsys):
+        fnames = [tmp_path.joinpath(f"example_{i}.txt") for i in range(3)]
+        for fname in fnames:
+            fname.write_text("example")
+        args = {
+            "infile": fnames,
+            "directory": tmp_path.joinpath("copy").as_posix(),
+            "progress": True,
+            "verbose": True,
+        }
+        copy2hash.command_line_runner(opt=args)
+        captured = capsys.readouterr()
+        assert "[PROGRESS] 3/3 files, " in captured.err
+        assert captured.out.count("[VERBOSE] Copy file") == 3
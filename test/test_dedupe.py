@@ -0,0 +1,103 @@
+from copy2hash import copy2hash, dedupe
+from copy2hash.dedupe import Deduplicator
+import json
+
+
+class TestDeduplicator(object):
+    def test_find_staged(self, tmp_path):
+        big = bytes(dedupe.PARTIAL_SIZE) + b"a"
+        contents = [b"a", b"b", b"a", big, bytes(dedupe.PARTIAL_SIZE) + b"b", big]
+        deduplicator = Deduplicator()
+        originals = []
+        for i, content in enumerate(contents):
+            fname = tmp_path.joinpath(f"{i}.bin")
+            fname.write_bytes(content)
+            originals.append(deduplicator.find(i, fname))
+        assert originals == [None, None, 0, None, None, 3]
+        assert deduplicator.n_duplicates == 2
+
+    def test_find_unique_sizes(self, tmp_path, monkeypatch):
+        def not_hashed(fname):
+            raise AssertionError("Files with unique sizes are not hashed")
+
+        monkeypatch.setattr(Deduplicator, "partial_hash", staticmethod(not_hashed))
+        deduplicator = Deduplicator()
+        for i in range(3):
+            fname = tmp_path.joinpath(f"{i}.bin")
+            fname.write_bytes(bytes(i))
+            assert deduplicator.find(i, fname) is None
+
+    def test_find_digest(self):
+        deduplicator = Deduplicator()
+        assert deduplicator.find(0, "a.txt", digest="abc") is None
+        assert deduplicator.find(1, "b.txt", digest="abd") is None
+        assert deduplicator.find(2, "c.txt", digest="abc") == 0
+
+
+class TestDedupeMode(object):
+    def test_dedupe_link(self, tmp_path, make_args):
+        args = make_args([b"a", b"b", b"a"], dedupe="link")
+        copy2hash.command_line_runner(opt=args)
+
+        report = json.loads(tmp_path.joinpath("copy/copy_report.json").read_text())
+        assert report["duplicate_of"] == [
+            None,
+            None,
+            tmp_path.joinpath("example_0.txt").as_posix(),
+        ]
+        assert report["method"][2] == "hardlink"
+        copy_dir = tmp_path.joinpath("copy")
+        assert copy_dir.joinpath(report["sha256"][2]).samefile(
+            copy_dir.joinpath(report["sha256"][0])
+        )
+
+    def test_dedupe_skip(self, tmp_path, make_args):
+        args = make_args([b"a", b"a"], dedupe="skip")
+        copy2hash.command_line_runner(opt=args)
+
+        report = json.loads(tmp_path.joinpath("copy/copy_report.json").read_text())
+        assert report["method"][1] == "skipped"
+        assert not tmp_path.joinpath("copy", report["sha256"][1]).exists()
+
+    def test_dedupe_content(self, tmp_path, make_args):
+        args = make_args([b"a", b"a"], dedupe="link", content=True)
+        copy2hash.command_line_runner(opt=args)
+
+        report = json.loads(tmp_path.joinpath("copy/copy_report.json").read_text())
+        # The duplicate has the same hash-secured filename, so it is not copied again
+        assert report["method"][1] == "duplicate"
+        assert report["sha256"][0] == report["sha256"][1]
+
+    def test_dedupe_ignored_for_moving(self, tmp_path, make_args):
+        args = make_args([b"a", b"a"], dedupe="link", move=True)
+        copy2hash.command_line_runner(opt=args)
+
+        report = json.loads(tmp_path.joinpath("copy/copy_report.json").read_text())
+        assert "duplicate_of" not in report
+        assert report["method"] == ["rename", "rename"]
+
+    def test_dedupe_failed_original(self, tmp_path, make_args, monkeypatch):
+        copy_file = copy2hash.Copy2Hash.copy_file
+
+        def unreadable(self, job):
+            if job[0].filename == "example_0.txt":
+                return job, None, "Permission denied"
+            return copy_file(self, job)
+
+        monkeypatch.setattr(copy2hash.Copy2Hash, "copy_file", unreadable)
+        args = make_args([b"a", b"a", b"a"], dedupe="link")
+        copy2hash.command_line_runner(opt=args)
+        report = json.loads(tmp_path.joinpath("copy/copy_report.json").read_text())
+        # The first duplicate is copied instead and the others are linked to it
+        assert report["method"][0] is None
+        assert report["duplicate_of"] == [
+            None,
+            None,
+            tmp_path.joinpath("example_1.txt").as_posix(),
+        ]
+        assert report["method"][2] == "hardlink"
+        copy_dir = tmp_path.joinpath("copy")
+        assert copy_dir.joinpath(report["sha256"][1]).read_bytes() == b"a"
+        assert copy_dir.joinpath(report["sha256"][2]).samefile(
+            copy_dir.joinpath(report["sha256"][1])
+        )
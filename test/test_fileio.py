@@ -0,0 +1,248 @@
+from copy2hash import copy2hash, fileio
+import errno
+import hashlib as hashlib
+import json
+import os
+from pathlib import Path
+import pytest
+from shutil import SameFileError
+
+
+class TestReadEngines(object):
+    fname = Path("test/example3.bin")
+
+    @pytest.mark.parametrize("engine", fileio.READ_ENGINES)
+    def test_read_engine(self, engine):
+        hashlib_result = hashlib.sha256(self.fname.read_bytes()).hexdigest()
+        copy2hash_result = copy2hash.HashTag.file2hash(
+            self.fname, sha_key="sha256", chunk_size=8192, engine=engine
+        )
+        assert hashlib_result == copy2hash_result
+
+    @pytest.mark.parametrize("engine", fileio.READ_ENGINES)
+    def test_read_engine_empty_file(self, engine, tmp_path):
+        fname = tmp_path.joinpath("empty.txt")
+        fname.touch()
+        copy2hash_result = copy2hash.HashTag.file2hash(
+            fname, sha_key="md5", engine=engine
+        )
+        assert copy2hash_result == hashlib.md5(b"").hexdigest()
+
+    def test_read_engine_uneven_chunks(self):
+        chunks = []
+        engine = fileio.read_chunks(
+            self.fname, [lambda chunk: chunks.append(bytes(chunk))], "mmap", 1000
+        )
+        assert engine == "mmap"
+        assert b"".join(chunks) == self.fname.read_bytes()
+        assert max(len(chunk) for chunk in chunks) == 1000
+
+    def short_reads(self, monkeypatch, eof_at=None):
+        # Direct I/O without O_DIRECT, which returns only a part of the buffer
+        readv = os.readv
+        offsets = []
+
+        def short_readv(fd, buffers):
+            offsets.append(os.lseek(fd, 0, os.SEEK_CUR))
+            if eof_at is not None and offsets[-1] >= eof_at:
+                return 0
+            (buffer,) = buffers
+            with memoryview(buffer) as view, view[:1000] as part:
+                return readv(fd, [part])
+
+        monkeypatch.setattr(fileio.os, "O_DIRECT", 0, False)
+        monkeypatch.setattr(fileio.os, "readv", short_readv)
+        return offsets
+
+    @pytest.mark.skipif(not hasattr(os, "readv"), reason="os.readv is POSIX only")
+    def test_read_direct_short_reads(self, monkeypatch):
+        offsets = self.short_reads(monkeypatch)
+        chunks = []
+        engine = fileio.read_chunks(
+            self.fname, [lambda chunk: chunks.append(bytes(chunk))], "direct", 8192
+        )
+        assert engine == "direct"
+        assert b"".join(chunks) == self.fname.read_bytes()
+        assert len(offsets) > 1
+
+    @pytest.mark.skipif(not hasattr(os, "readv"), reason="os.readv is POSIX only")
+    def test_read_direct_truncated(self, monkeypatch):
+        self.short_reads(monkeypatch, eof_at=1000)
+        with pytest.raises(OSError):
+            fileio.read_chunks(self.fname, [lambda chunk: None], "direct", 8192)
+
+    def test_choose_read_engine(self):
+        assert fileio.choose_read_engine(0) == "readinto"
+        assert fileio.choose_read_engine(fileio.MMAP_MIN_SIZE) == "mmap"
+
+
+class TestCopyEngines(object):
+    fname = Path("test/example3.bin")
+
+    def test_copy_file(self, tmp_path):
+        dst = tmp_path.joinpath("example3.bin")
+        method = fileio.copy_file(self.fname, dst)
+        assert method in ("copy_file_range", "sendfile", "buffered")
+        assert dst.read_bytes() == self.fname.read_bytes()
+
+    def test_copy_file_overwrite(self, tmp_path):
+        dst = tmp_path.joinpath("example3.bin")
+        dst.write_bytes(b"x" * 200000)
+        fileio.copy_file(self.fname, dst)
+        assert dst.read_bytes() == self.fname.read_bytes()
+
+    def test_copy_file_fallback(self, tmp_path, monkeypatch):
+        def not_supported(*args):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+        monkeypatch.setattr(fileio.os, "copy_file_range", not_supported, False)
+        monkeypatch.setattr(fileio.os, "sendfile", not_supported, False)
+        dst = tmp_path.joinpath("example3.bin")
+        assert fileio.copy_file(self.fname, dst, buffer_size=1000) == "buffered"
+        assert dst.read_bytes() == self.fname.read_bytes()
+
+    def test_copy_file_sendfile(self, tmp_path, monkeypatch):
+        def not_supported(*args):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+        monkeypatch.setattr(fileio.os, "copy_file_range", not_supported, False)
+        dst = tmp_path.joinpath("example3.bin")
+        method = fileio.copy_file(self.fname, dst)
+        assert method == ("sendfile" if fileio._USE_SENDFILE else "buffered")
+        assert dst.read_bytes() == self.fname.read_bytes()
+
+    def test_copy_file_no_sendfile(self, tmp_path, monkeypatch):
+        def socket_only(*args):
+            raise TypeError("offset must be an integer")
+
+        # Like on macOS, where os.sendfile() exists but needs a socket
+        monkeypatch.setattr(fileio, "_USE_SENDFILE", False)
+        monkeypatch.delattr(fileio.os, "copy_file_range", False)
+        monkeypatch.setattr(fileio.os, "sendfile", socket_only, False)
+        dst = tmp_path.joinpath("example3.bin")
+        assert fileio.copy_file(self.fname, dst) == "buffered"
+        assert dst.read_bytes() == self.fname.read_bytes()
+
+    def test_copy_empty_file(self, tmp_path):
+        src = tmp_path.joinpath("empty.txt")
+        src.touch()
+        dst = tmp_path.joinpath("copy.txt")
+        fileio.copy_file(src, dst)
+        assert dst.read_bytes() == b""
+
+    def test_copy_same_file(self):
+        with pytest.raises(SameFileError):
+            fileio.copy_file(self.fname, self.fname)
+
+
+class TestLinkModes(object):
+    fname = Path("test/example3.bin")
+
+    def test_hardlink(self, tmp_path):
+        src = tmp_path.joinpath("example3.bin")
+        src.write_bytes(self.fname.read_bytes())
+        dst = tmp_path.joinpath("hardlink.bin")
+        assert fileio.link_file(src, dst, "hard") == "hardlink"
+        assert src.samefile(dst)
+
+    def test_hardlink_fallback(self, tmp_path, monkeypatch):
+        def not_supported(*args):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+        monkeypatch.setattr(fileio.os, "link", not_supported)
+        dst = tmp_path.joinpath("hardlink.bin")
+        assert fileio.link_file(self.fname, dst, "hard") != "hardlink"
+        assert dst.read_bytes() == self.fname.read_bytes()
+
+    def test_symlink(self, tmp_path):
+        dst = tmp_path.joinpath("symlink.bin")
+        assert fileio.link_file(self.fname, dst, "sym") == "symlink"
+        assert dst.is_symlink() and dst.samefile(self.fname)
+
+    def test_reflink(self, tmp_path):
+        dst = tmp_path.joinpath("reflink.bin")
+        dst.write_bytes(b"x")
+        assert fileio.link_file(self.fname, dst, "reflink") in (
+            "reflink",
+            "copy_file_range",
+            "sendfile",
+            "buffered",
+        )
+        assert dst.read_bytes() == self.fname.read_bytes()
+
+    def test_link_same_file(self, tmp_path):
+        dst = tmp_path.joinpath("symlink.bin")
+        fileio.link_file(self.fname, dst, "sym")
+        with pytest.raises(SameFileError):
+            fileio.link_file(self.fname, dst, "sym")
+
+
+def cross_device(*args):
+    raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+
+class TestMoveFile(object):
+    def make_file(self, tmp_path):
+        src = tmp_path.joinpath("example.txt")
+        src.write_bytes(b"example" * 1000)
+        os.utime(src, ns=(1000000000, 2000000000))
+        return src, tmp_path.joinpath("moved.txt")
+
+    def test_move_rename(self, tmp_path):
+        src, dst = self.make_file(tmp_path)
+        assert fileio.move_file(src, dst) == "rename"
+        assert not src.exists() and dst.read_bytes() == b"example" * 1000
+
+    def test_move_cross_device(self, tmp_path, monkeypatch):
+        src, dst = self.make_file(tmp_path)
+        dst.write_bytes(b"x")
+        monkeypatch.setattr(fileio.os, "rename", cross_device)
+        assert fileio.move_file(src, dst) == "copy+unlink"
+        assert not src.exists() and dst.read_bytes() == b"example" * 1000
+        assert dst.stat().st_mtime_ns == 2000000000
+        assert not Path(f"{dst}{fileio.PARTIAL_SUFFIX}").exists()
+
+    def test_move_retry(self, tmp_path, monkeypatch):
+        src, dst = self.make_file(tmp_path)
+        rename, calls = os.rename, []
+
+        def busy(*args):
+            calls.append(args)
+            if len(calls) < 3:
+                raise OSError(errno.EBUSY, "Device or resource busy")
+            return rename(*args)
+
+        monkeypatch.setattr(fileio.os, "rename", busy)
+        assert fileio.move_file(src, dst, delay=0) == "rename"
+        assert len(calls) == 3 and dst.is_file()
+
+    def test_move_failed_copy(self, tmp_path, monkeypatch):
+        src, dst = self.make_file(tmp_path)
+
+        def busy(*args):
+            raise OSError(errno.EBUSY, "Device or resource busy")
+
+        monkeypatch.setattr(fileio.os, "rename", cross_device)
+        monkeypatch.setattr(fileio.os, "replace", busy)
+        with pytest.raises(OSError):
+            fileio.move_file(src, dst, retries=2, delay=0)
+        assert src.is_file() and not dst.exists()
+        assert not Path(f"{dst}{fileio.PARTIAL_SUFFIX}").exists()
+
+    def test_move_files_cross_device(self, tmp_path, monkeypatch):
+        fnames = [tmp_path.joinpath(f"example_{i}.txt") for i in range(3)]
+        for i, fname in enumerate(fnames):
+            fname.write_text(f"example {i}")
+        monkeypatch.setattr(fileio.os, "rename", cross_device)
+        args = {
+            "infile": fnames,
+            "report": ["json"],
+            "sha": ["sha256"],
+            "directory": tmp_path.joinpath("copy").as_posix(),
+            "move": True,
+            "workers": 2,
+        }
+        copy2hash.command_line_runner(opt=args)
+        report = json.loads(tmp_path.joinpath("copy/copy_report.json").read_text())
+        assert report["method"] == ["copy+unlink"] * 3
+        assert not any(fname.exists() for fname in fnames)
@@ -0,0 +1,122 @@
+from copy2hash import copy2hash, fileio
+from copy2hash.journal import Journal
+import hashlib as hashlib
+import json
+from pathlib import Path
+import pytest
+
+
+@pytest.fixture
+def journal_args(make_args, tmp_path):
+    journal = tmp_path.joinpath("copy2hash.journal").as_posix()
+
+    def factory(files, **kwargs):
+        opt = {"content": True, "no_file_extension": True, "journal": journal}
+        opt.update(kwargs)
+        return make_args(files, **opt)
+
+    return factory
+
+
+def drop_finished(fname):
+    """Keep only the planned entries like after a crash."""
+    lines = Path(fname).read_text().splitlines()
+    planned = [line for line in lines if json.loads(line)["state"] == "planned"]
+    Path(fname).write_text("\n".join(planned) + "\n")
+
+
+def read_report(tmp_path):
+    return json.loads(tmp_path.joinpath("copy", "copy_report.json").read_text())
+
+
+class TestJournal(object):
+    def test_replay(self, tmp_path):
+        fname = tmp_path.joinpath("copy2hash.journal").as_posix()
+        journal = Journal(fname, batch_size=2)
+        journal.plan([{"op": "copy", "src": "a", "dst": "b", "hashnames": {}}])
+        journal.done("copy", "a", "b", "buffered")
+        journal.close()
+        # A line truncated by a crash
+        with open(fname, "a") as f:
+            f.write('{"op": "copy", "src"')
+
+        journal = Journal(fname, resume=True)
+        journal.close()
+        assert journal.entries["a", "b"]["state"] == "done"
+        assert journal.entries["a", "b"]["method"] == "buffered"
+
+    def test_replay_missing_journal(self, tmp_path):
+        fname = tmp_path.joinpath("copy2hash.journal").as_posix()
+        assert Journal.replay(fname) == []
+
+    def test_new_journal_replaces_old_one(self, tmp_path):
+        fname = tmp_path.joinpath("copy2hash.journal").as_posix()
+        journal = Journal(fname)
+        journal.done("copy", "a", "b", "buffered")
+        journal.close()
+        Journal(fname).close()
+        assert Journal.replay(fname) == []
+
+
+class TestResume(object):
+    def test_resume_copy(self, tmp_path, journal_args):
+        args = journal_args([b"example"])
+        copy2hash.command_line_runner(opt=args)
+
+        # Interrupted during the copy
+        drop_finished(args["journal"])
+        hname = tmp_path.joinpath("copy", hashlib.sha256(b"example").hexdigest())
+        hname.write_bytes(b"exa")
+        copy2hash.command_line_runner(opt=dict(args, resume=True))
+
+        assert hname.read_bytes() == b"example"
+        states = [entry["state"] for entry in Journal.replay(args["journal"])]
+        assert states == ["planned", "planned", "done"]
+
+    def test_resume_skips_finished_copy(self, tmp_path, journal_args):
+        args = journal_args([b"example"])
+        copy2hash.command_line_runner(opt=args)
+        method = read_report(tmp_path)["method"]
+
+        hname = tmp_path.joinpath("copy", hashlib.sha256(b"example").hexdigest())
+        hname.unlink()
+        copy2hash.command_line_runner(opt=dict(args, resume=True))
+
+        assert not hname.exists()
+        assert read_report(tmp_path)["method"] == method
+
+    def test_resume_move(self, tmp_path, journal_args):
+        args = journal_args(3, move=True)
+        copy2hash.command_line_runner(opt=args)
+
+        # Interrupted after the renames; the sources are gone
+        drop_finished(args["journal"])
+        copy2hash.command_line_runner(opt=dict(args, resume=True))
+
+        report = read_report(tmp_path)
+        assert report["method"] == ["rename"] * 3
+        assert report["sha256"] == [
+            hashlib.sha256(f"example {i}".encode()).hexdigest() for i in range(3)
+        ]
+
+    def test_resume_partial_move(self, tmp_path, journal_args):
+        args = journal_args(3, move=True)
+        copy2hash.command_line_runner(opt=args)
+
+        # Interrupted during the copy of a move across filesystems
+        hname = hashlib.sha256(b"example 0").hexdigest()
+        source = Path(args["infile"][0])
+        tmp_path.joinpath("copy", hname).rename(source)
+        partial = tmp_path.joinpath("copy", f"{hname}{fileio.PARTIAL_SUFFIX}")
+        partial.write_bytes(b"exam")
+        drop_finished(args["journal"])
+        copy2hash.command_line_runner(opt=dict(args, resume=True))
+
+        assert not partial.exists() and not source.exists()
+        assert tmp_path.joinpath("copy", hname).read_bytes() == b"example 0"
+        assert read_report(tmp_path)["method"] == ["rename"] * 3
+
+    def test_resume_requires_journal(self, tmp_path, journal_args):
+        args = journal_args([b"example"], journal=None, resume=True)
+        copy2hash.command_line_runner(opt=args)
+        assert not tmp_path.joinpath("copy").exists()
@@ -0,0 +1,91 @@
+from copy2hash import copy2hash
+import hashlib as hashlib
+import json
+import pytest
+
+
+def make_files(tmp_path, n=5):
+    for i in range(n):
+        fname = tmp_path.joinpath(f"example_{i}.txt")
+        fname.write_text(f"example {i}")
+        yield fname
+
+
+class TestLibrary(object):
+    def test_copy2hash_files(self, tmp_path):
+        records = copy2hash.copy2hash_files(
+            make_files(tmp_path), directory=tmp_path.joinpath("copy"), content=True
+        )
+        for i, record in enumerate(records):
+            hname = hashlib.sha256(f"example {i}".encode("utf-8")).hexdigest()
+            assert record.index == i
+            assert record.hashnames == {"sha256": f"{hname}.txt"}
+            assert record.method is not None
+            assert tmp_path.joinpath("copy", f"{hname}.txt").is_file()
+        assert i == 4
+        # No report without selecting one
+        assert not list(tmp_path.joinpath("copy").glob("copy_report.*"))
+
+    def test_copy2hash_files_lazy(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(copy2hash, "RECORD_BATCH_SIZE", 2)
+        consumed = []
+
+        def paths():
+            for fname in make_files(tmp_path):
+                consumed.append(fname)
+                yield fname
+
+        records = copy2hash.copy2hash_files(paths(), directory=tmp_path / "copy")
+        next(records)
+        assert len(consumed) == 2
+        records.close()
+
+    def test_copy2hash_files_report(self, tmp_path):
+        records = list(
+            copy2hash.copy2hash_files(
+                make_files(tmp_path, n=3),
+                directory=tmp_path.joinpath("copy"),
+                report=["json"],
+            )
+        )
+        report = json.loads(tmp_path.joinpath("copy/copy_report.json").read_text())
+        assert report["sha256"] == [record.hashnames["sha256"] for record in records]
+
+    def test_copy2hash_files_batch_size(self, tmp_path):
+        consumed = []
+
+        def paths():
+            for fname in make_files(tmp_path):
+                consumed.append(fname)
+                yield fname
+
+        records = copy2hash.copy2hash_files(
+            paths(), directory=tmp_path / "copy", content=True, batch_size=1
+        )
+        record = next(records)
+        assert len(consumed) == 1
+        assert record.method is not None
+        records.close()
+
+    def test_copy2hash_files_invalid(self, tmp_path):
+        # The options are checked before the first record
+        with pytest.raises(ValueError):
+            copy2hash.copy2hash_files(make_files(tmp_path), sha=["sha0"])
+        with pytest.raises(ValueError):
+            copy2hash.copy2hash_files(make_files(tmp_path), batch_size=0)
+
+    def test_command_line_runner(self, tmp_path, monkeypatch):
+        calls = []
+        copy2hash_files = copy2hash.copy2hash_files
+
+        def counted(paths, **options):
+            calls.append(paths)
+            return copy2hash_files(paths, **options)
+
+        monkeypatch.setattr(copy2hash, "copy2hash_files", counted)
+        fnames = [fname.as_posix() for fname in make_files(tmp_path, n=2)]
+        copy2hash.command_line_runner(
+            opt={"infile": fnames, "directory": tmp_path.joinpath("copy")}
+        )
+        assert calls == [fnames]
+        assert tmp_path.joinpath("copy", "copy_report.json").is_file()
@@ -0,0 +1,94 @@
+from copy2hash import copy2hash
+import asyncio
+import json
+import pytest
+import sqlite3
+import time
+
+OPT = {"sha": ["sha256", "md5"], "content": True, "hash_pool": "serial"}
+
+
+def read_report(tmp_path):
+    return json.loads(tmp_path.joinpath("copy/copy_report.json").read_text())
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class TestPipeline(object):
+    def test_pipeline(self, tmp_path, make_args, monkeypatch):
+        # Several batches in the queues
+        monkeypatch.setattr(copy2hash, "RECORD_BATCH_SIZE", 3)
+        args = make_args(10, **OPT)
+        assert run(copy2hash.copy2hash_async(args))
+        piped = read_report(tmp_path)
+
+        tmp_path.joinpath("copy/copy_report.json").unlink()
+        copy2hash.command_line_runner(opt=make_args(10, **OPT))
+        assert piped == read_report(tmp_path)
+        assert len(piped["index"]) == 10
+
+    def test_pipeline_command_line(self, tmp_path, make_args):
+        args = make_args(10, **OPT, pipeline=True, stream_report=True)
+        copy2hash.command_line_runner(opt=args)
+        report = read_report(tmp_path)
+        assert [row["index"] for row in report] == list(range(10))
+
+    def test_pipeline_sqlite_stream(self, tmp_path, make_args, monkeypatch):
+        # The catalog is opened, written, and closed on different threads
+        monkeypatch.setattr(copy2hash, "RECORD_BATCH_SIZE", 3)
+        args = make_args(
+            10,
+            **dict(OPT, report=["sqlite", "json"]),
+            pipeline=True,
+            stream_report=True,
+        )
+        copy2hash.command_line_runner(opt=args)
+        with sqlite3.connect(tmp_path.joinpath("copy/copy_report.sqlite")) as db:
+            (n_rows,) = db.execute("SELECT COUNT(*) FROM catalog").fetchone()
+        assert n_rows == 20
+        assert len(read_report(tmp_path)) == 10
+
+    def test_pipeline_failing_stage(self, tmp_path, make_args, monkeypatch):
+        def broken(self, records):
+            raise OSError("Disk full")
+
+        monkeypatch.setattr(copy2hash, "RECORD_BATCH_SIZE", 1)
+        monkeypatch.setattr(copy2hash.Copy2Hash, "transfer_files", broken)
+        with pytest.raises(OSError):
+            run(copy2hash.copy2hash_async(make_args(10, **OPT)))
+
+    def test_pipeline_failing_stage_waits(self, tmp_path, make_args, monkeypatch):
+        # The hashing thread still runs, when the copying fails
+        events = []
+        transform_hash = copy2hash.Copy2Hash.transform_hash
+        close = copy2hash.Copy2Hash.close
+
+        def slow(self, records):
+            time.sleep(0.05)
+            transform_hash(self, records)
+            events.append("hash")
+
+        def broken(self, records):
+            raise OSError("Disk full")
+
+        def closing(self):
+            events.append("close")
+            close(self)
+
+        monkeypatch.setattr(copy2hash, "RECORD_BATCH_SIZE", 1)
+        monkeypatch.setattr(copy2hash.Copy2Hash, "transform_hash", slow)
+        monkeypatch.setattr(copy2hash.Copy2Hash, "transfer_files", broken)
+        monkeypatch.setattr(copy2hash.Copy2Hash, "close", closing)
+        with pytest.raises(OSError):
+            run(copy2hash.copy2hash_async(make_args(10, **OPT)))
+        assert events[-1] == "close" and events.count("hash") >= 2
+
+    def test_pipeline_invalid_args(self, tmp_path, make_args):
+        args = make_args(10, **dict(OPT, sha=["sha0"]))
+        assert not run(copy2hash.copy2hash_async(args))
@@ -0,0 +1,86 @@
+from copy2hash import copy2hash, report
+import csv
+import json
+import yaml
+
+SHA_KEYS = ["sha256", "md5"]
+
+
+class TestReportStreams(object):
+    columns = ["index", "filename"]
+    rows = [(0, "a.txt"), (1, None)]
+
+    def test_csv_stream(self, tmp_path):
+        fname = tmp_path.joinpath("report.csv")
+        stream = report.CsvStream(fname, self.columns)
+        stream.write_rows(self.rows[:1])
+        # The rows of a batch are flushed
+        assert fname.read_text().splitlines() == ["index,filename", "0,a.txt"]
+        stream.write_rows(self.rows[1:])
+        stream.close()
+        with open(fname, newline="") as f:
+            assert list(csv.reader(f))[-1] == ["1", ""]
+
+    def test_json_stream(self, tmp_path):
+        fname = tmp_path.joinpath("report.json")
+        stream = report.JsonStream(fname, self.columns)
+        stream.write_rows(self.rows)
+        stream.close()
+        assert json.loads(fname.read_text()) == [
+            {"index": 0, "filename": "a.txt"},
+            {"index": 1, "filename": None},
+        ]
+
+    def test_empty_json_stream(self, tmp_path):
+        fname = tmp_path.joinpath("report.json")
+        report.JsonStream(fname, self.columns).close()
+        assert json.loads(fname.read_text()) == []
+
+    def test_jsonl_stream(self, tmp_path):
+        fname = tmp_path.joinpath("report.jsonl")
+        stream = report.JsonLinesStream(fname, self.columns)
+        stream.write_rows(self.rows)
+        stream.close()
+        lines = fname.read_text().splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {"index": 0, "filename": "a.txt"},
+            {"index": 1, "filename": None},
+        ]
+
+
+class TestStreamReport(object):
+    def test_stream_report(self, tmp_path, make_args):
+        args = make_args(5, report=["csv", "json", "jsonl", "log"], sha=SHA_KEYS)
+        copy2hash.command_line_runner(opt=args)
+        copy_dir = tmp_path.joinpath("copy")
+        batch = {
+            fxt: copy_dir.joinpath(f"copy_report.{fxt}").read_text()
+            for fxt in ["csv", "json", "jsonl", "log"]
+        }
+
+        args = make_args(5, report=["csv", "json", "jsonl", "log"], sha=SHA_KEYS)
+        args = copy2hash.get_args(opt=dict(args, stream_report=True), argv=[])
+        assert copy2hash.check_args(args)
+        c2h = copy2hash.Copy2Hash(args)
+        c2h.copy2hash()
+
+        # No records are kept for the streamed formats
+        assert c2h._records == []
+        with open(copy_dir.joinpath("copy_report.csv"), newline="") as f:
+            streamed_csv = list(csv.reader(f))
+        assert streamed_csv == list(csv.reader(batch["csv"].splitlines()))
+        assert copy_dir.joinpath("copy_report.jsonl").read_text() == batch["jsonl"]
+        rows = json.loads(copy_dir.joinpath("copy_report.json").read_text())
+        columns = json.loads(batch["json"])
+        assert [row["sha256"] for row in rows] == columns["sha256"]
+        assert len(copy_dir.joinpath("copy_report.log").read_text().splitlines()) == 6
+
+    def test_stream_report_with_batch_formats(self, tmp_path, make_args):
+        args = make_args(5, report=["jsonl", "yaml"], sha=SHA_KEYS, stream_report=True)
+        copy2hash.command_line_runner(opt=args)
+
+        copy_dir = tmp_path.joinpath("copy")
+        columns = yaml.safe_load(copy_dir.joinpath("copy_report.yaml").read_text())
+        lines = copy_dir.joinpath("copy_report.jsonl").read_text().splitlines()
+        assert [json.loads(line)["md5"] for line in lines] == columns["md5"]
+        assert columns["filename"] == [f"example_{i}.txt" for i in range(5)]
@@ -4,13 +4,35 @@ from pathlib import Path
 __refargs__ = {
     "infile": [],
     "report": ["json"],
+    "stream_report": False,
     "report_name": "copy_report",
     "sha": ["sha256"],
     "directory": None,
+    "recursive": False,
     "move": False,
+    "workers": 1,
+    "batch_size": None,
+    "link": None,
+    "collision": "warn",
+    "shard_depth": 0,
+    "shard_width": 2,
     "file_extension": False,
     "file_suffix": False,
     "no_file_extension": False,
+    "dedupe": None,
+    "journal": None,
+    "resume": False,
+    "content": False,
+    "hash_pool": "auto",
+    "read_engine": "auto",
+    "cache": None,
+    "cache_max_age": 30.0,
+    "cache_max_entries": None,
+    "pipeline": False,
+    "progress": False,
+    "stats": None,
+    "trace_memory": False,
+    "list_algorithms": False,
     "verbose": False,
     "version": False,
 }
@@ -0,0 +1,70 @@
+from copy2hash import copy2hash
+from pathlib import Path
+import hashlib as hashlib
+import json
+
+
+class TestShard(object):
+    opt = {
+        "report": ["json", "sqlite"],
+        "sha": ["sha256", "md5"],
+        "content": True,
+        "hash_pool": "serial",
+        "shard_depth": 2,
+    }
+
+    def test_shard_copy(self, tmp_path, make_args):
+        copy2hash.command_line_runner(opt=make_args(4, **self.opt))
+
+        hname = hashlib.sha256(b"example 1").hexdigest()
+        shard = f"{hname[:2]}/{hname[2:4]}/{hname}.txt"
+        assert tmp_path.joinpath("copy", shard).is_file()
+        report = json.loads(tmp_path.joinpath("copy/copy_report.json").read_text())
+        assert report["sha256"][1] == shard
+
+    def test_shard_width(self, tmp_path, make_args):
+        args = make_args(4, **dict(self.opt, shard_depth=1, shard_width=3, move=True))
+        copy2hash.command_line_runner(opt=args)
+
+        hname = hashlib.sha256(b"example 0").hexdigest()
+        assert tmp_path.joinpath("copy", hname[:3], f"{hname}.txt").is_file()
+        assert not tmp_path.joinpath("example_0.txt").exists()
+
+    def test_shard_lookup(self, tmp_path, make_args, capsys):
+        copy2hash.command_line_runner(opt=make_args(4, **self.opt))
+        capsys.readouterr()
+        catalog = tmp_path.joinpath("copy", "copy_report.sqlite").as_posix()
+
+        hname = hashlib.md5(b"example 2").hexdigest()
+        assert copy2hash.lookup_runner([catalog, f"{hname}.txt"]) == 1
+        assert copy2hash.lookup_runner([catalog, "-p", hname[:6]]) == 1
+        dst, src, _, _ = capsys.readouterr().out.splitlines()[0].split("\t")
+        assert Path(dst).is_file()
+        assert dst.endswith(f"/{hname[:2]}/{hname[2:4]}/{hname}.txt")
+        assert src == tmp_path.joinpath("example_2.txt").as_posix()
+
+    def test_shard_dirs_cached(self, tmp_path, make_args, monkeypatch):
+        made = []
+        mkdir = Path.mkdir
+
+        def counted_mkdir(self, *args, **kwargs):
+            made.append(self)
+            return mkdir(self, *args, **kwargs)
+
+        args = make_args(4, **dict(self.opt, directory=tmp_path.joinpath("copy")))
+        args["directory"].mkdir()
+        monkeypatch.setattr(Path, "mkdir", counted_mkdir)
+        worker = copy2hash.Copy2Hash(copy2hash.get_args(opt=args, argv=[]))
+        records = list(worker.find_files())
+        for record in records:
+            record.hashnames = {"sha256": f"ab/cd/{record.index}"}
+        worker.make_shard_dirs(records)
+        assert made[0] == tmp_path.joinpath("copy", "ab", "cd")
+        n_made = len(made)
+        worker.make_shard_dirs(records)
+        assert len(made) == n_made
+
+    def test_shard_too_deep(self, tmp_path, make_args):
+        args = make_args(4, **dict(self.opt, shard_depth=9, shard_width=4))
+        copy2hash.command_line_runner(opt=args)
+        assert not tmp_path.joinpath("copy").exists()
@@ -0,0 +1,59 @@
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+# Modules, which must not be imported for starting copy2hash
+HEAVY_MODULES = (
+    "asyncio",
+    "concurrent.futures.process",
+    "csv",
+    "dict2xml",
+    "json",
+    "pickle",
+    "sqlite3",
+    "yaml",
+)
+
+
+def loaded_modules(code="import copy2hash.copy2hash"):
+    """Run the code in a new interpreter and get the heavy modules it imported."""
+    code = (
+        f"{code}\n"
+        "import sys\n"
+        f"print(*[module for module in {HEAVY_MODULES!r} if module in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parent.parent,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    return result.stdout.split()
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="requires lazy imports")
+class TestStartup(object):
+    def test_lazy_imports(self):
+        assert loaded_modules() == []
+
+    def test_lazy_report_formats(self, tmp_path):
+        fname = tmp_path.joinpath("example.txt")
+        fname.write_text("example")
+        code = (
+            "from copy2hash import copy2hash; "
+            f"copy2hash.command_line_runner(opt={{'infile': [{str(fname)!r}]}})"
+        )
+        assert loaded_modules(code) == ["json"]
+
+    def test_lazy_process_pool(self, tmp_path):
+        fname = tmp_path.joinpath("example.txt")
+        fname.write_text("example")
+        code = (
+            "from copy2hash import copy2hash; "
+            "copy2hash.command_line_runner("
+            f"opt={{'infile': [{str(fname)!r}], 'content': True}})"
+        )
+        assert "concurrent.futures.process" not in loaded_modules(code)
@@ -0,0 +1,102 @@
+from copy2hash import copy2hash
+from copy2hash.stats import RunStats
+import asyncio
+import json
+import pytest
+
+
+class TestRunStats(object):
+    def test_run(self):
+        calls = []
+        stats = RunStats(hooks=[lambda *args: calls.append(args)])
+        stats.start()
+        assert stats.run("hash", sum, [1, 2]) == 3
+        assert stats.run("hash", sum, [3]) == 3
+        stats.stop()
+
+        summary = stats.summary()
+        assert summary["timings"]["hash"]["calls"] == 2
+        assert summary["seconds"] >= summary["timings"]["hash"]["seconds"]
+        assert [(stage, result) for stage, _, result in calls] == [
+            ("hash", 3),
+            ("hash", 3),
+        ]
+
+    def test_run_failing_stage(self):
+        stats = RunStats()
+        with pytest.raises(ZeroDivisionError):
+            stats.run("hash", divmod, 1, 0)
+        assert stats.timings["hash"]["calls"] == 1
+
+    def test_trace_memory(self):
+        stats = RunStats(trace_memory=True)
+        stats.start()
+        stats.run("alloc", bytearray, 1024 * 1024)
+        stats.stop()
+        assert stats.timings["alloc"]["peak_memory"] >= 1024 * 1024
+        assert stats.peak_memory >= 1024 * 1024
+        assert "peak memory" in stats.format_summary()[-1]
+
+
+class TestStatsMode(object):
+    def test_stats_json(self, tmp_path, make_args):
+        fname = tmp_path.joinpath("stats.json")
+        args = make_args(4, hash_pool="serial", stats=fname.as_posix(), content=True)
+        copy2hash.command_line_runner(opt=args)
+
+        summary = json.loads(fname.read_text())
+        assert list(summary["timings"]) == [
+            "find",
+            "hash",
+            "transfer",
+            "report",
+            "export",
+        ]
+        assert summary["timings"]["find"]["calls"] == 2
+        counters = summary["counters"]
+        assert (counters["files"], counters["bytes"], counters["errors"]) == (4, 36, 0)
+        assert sum(counters["methods"].values()) == 4
+
+    def test_stats_print(self, tmp_path, make_args, capsys):
+        copy2hash.command_line_runner(
+            opt=make_args(4, hash_pool="serial", stats="-", move=True)
+        )
+        out = capsys.readouterr().out
+        assert "[STATS] files: 4, bytes: 36, errors: 0" in out
+        assert "rename: 4" in out
+
+    def test_stats_pipeline(self, tmp_path, make_args):
+        fname = tmp_path.joinpath("stats.json")
+        args = make_args(4, hash_pool="serial", stats=fname.as_posix(), pipeline=True)
+        copy2hash.command_line_runner(opt=args)
+        summary = json.loads(fname.read_text())
+        assert summary["counters"]["files"] == 4
+        assert summary["timings"]["transfer"]["calls"] == 1
+
+    def test_stats_disabled(self, tmp_path, make_args, monkeypatch):
+        def not_run(self, stage, func, *args):
+            raise AssertionError("Disabled stats are not run")
+
+        monkeypatch.setattr(RunStats, "run", not_run)
+        copy2hash.command_line_runner(opt=make_args(4, hash_pool="serial"))
+
+    def test_stats_hooks_api(self, tmp_path, make_args):
+        calls = []
+        args = make_args(4, hash_pool="serial")
+        records = copy2hash.copy2hash_files(
+            args.pop("infile"), hooks=[lambda *call: calls.append(call[0])], **args
+        )
+        assert len(list(records)) == 4
+        assert calls[:4] == ["find", "hash", "transfer", "report"]
+
+    def test_stats_async_api(self, tmp_path, make_args):
+        stats = RunStats()
+        loop = asyncio.new_event_loop()
+        try:
+            assert loop.run_until_complete(
+                copy2hash.copy2hash_async(make_args(4, hash_pool="serial"), stats=stats)
+            )
+        finally:
+            loop.close()
+        assert stats.counters["files"] == 4
+        assert stats.timings["transfer"]["calls"] == 1
@@ -0,0 +1,124 @@
+from copy2hash import copy2hash, walker
+import json
+import os
+from pathlib import Path
+
+
+def make_tree(root):
+    root.joinpath("a", "b").mkdir(parents=True)
+    root.joinpath("c").mkdir()
+    for fname in ["x.txt", "a/y.txt", "a/b/z.txt", "c/w.txt"]:
+        root.joinpath(fname).write_text(fname)
+    return root
+
+
+class TestScanFiles(object):
+    def test_scan_files(self, tmp_path):
+        root = make_tree(tmp_path.joinpath("tree"))
+        found = list(walker.scan_files([root], recursive=True))
+        assert sorted(found) == sorted(
+            os.path.join(dirname, fname)
+            for dirname, _, fnames in os.walk(root)
+            for fname in fnames
+        )
+
+    def test_scan_files_snapshot(self, tmp_path):
+        root = tmp_path.joinpath("tree")
+        root.mkdir()
+        for fname in ["b.txt", "c.txt", "a.txt"]:
+            root.joinpath(fname).write_text(fname)
+        found = list(walker.scan_files([root], recursive=True, snapshot=True))
+        assert found == [root.joinpath(f"{fname}.txt").as_posix() for fname in "abc"]
+
+    def test_scan_files_lazy(self, tmp_path):
+        root = make_tree(tmp_path.joinpath("tree"))
+        files = walker.scan_files([root], recursive=True)
+        fname = next(files)
+        # The sub-directories are walked after the files of the directory
+        assert fname == root.joinpath("x.txt").as_posix()
+
+    def test_scan_files_exclude(self, tmp_path):
+        root = make_tree(tmp_path.joinpath("tree"))
+        found = [
+            fname
+            for fname in walker.scan_files(
+                [root], recursive=True, exclude=[root.joinpath("a")]
+            )
+        ]
+        assert sorted(found) == [
+            root.joinpath("c", "w.txt").as_posix(),
+            root.joinpath("x.txt").as_posix(),
+        ]
+
+    def test_scan_files_not_recursive(self):
+        fnames = [Path("test/example3.bin")]
+        assert list(walker.scan_files(fnames)) == fnames
+
+    def test_scan_files_skips_symlinks(self, tmp_path):
+        root = make_tree(tmp_path.joinpath("tree"))
+        root.joinpath("link.txt").symlink_to(root.joinpath("x.txt"))
+        root.joinpath("loop").symlink_to(root)
+        found = list(walker.scan_files([root], recursive=True))
+        assert len(found) == 4
+
+
+class TestRecursiveCopy(object):
+    def test_recursive_copy(self, tmp_path):
+        root = make_tree(tmp_path.joinpath("tree"))
+        args = {
+            "infile": [root.as_posix()],
+            "report": ["json"],
+            "report_name": "copy_report",
+            "sha": ["sha256"],
+            # The destination is inside of the walked tree
+            "directory": root.joinpath("hashed").as_posix(),
+            "recursive": True,
+            "move": False,
+            "file_extension": False,
+            "file_suffix": False,
+            "no_file_extension": False,
+            "content": True,
+            "verbose": False,
+            "version": False,
+        }
+        copy2hash.command_line_runner(opt=args)
+        copy2hash.command_line_runner(opt=args)
+
+        report = json.loads(root.joinpath("hashed", "copy_report.json").read_text())
+        assert sorted(report["filename"]) == ["w.txt", "x.txt", "y.txt", "z.txt"]
+        assert len(list(root.joinpath("hashed").glob("*.txt"))) == 4
+
+    def test_recursive_copy_nested_destination(self, tmp_path, monkeypatch):
+        # The walk reaches the new destination after the first batches are copied
+        monkeypatch.setattr(copy2hash, "RECORD_BATCH_SIZE", 1)
+        root = make_tree(tmp_path.joinpath("tree"))
+        args = {
+            "infile": [root.as_posix()],
+            "report": ["json"],
+            "sha": ["sha256"],
+            "directory": root.joinpath("c", "hashed").as_posix(),
+            "recursive": True,
+            "content": True,
+            "verbose": False,
+        }
+        copy2hash.command_line_runner(opt=args)
+
+        fname = root.joinpath("c", "hashed", "copy_report.json")
+        report = json.loads(fname.read_text())
+        assert sorted(report["filename"]) == ["w.txt", "x.txt", "y.txt", "z.txt"]
+
+    def test_recursive_copy_in_place(self, tmp_path, monkeypatch):
+        # The copies are made next to the files, while the walk goes on
+        monkeypatch.setattr(copy2hash, "RECORD_BATCH_SIZE", 1)
+        root = make_tree(tmp_path.joinpath("tree"))
+        args = {
+            "infile": [root.as_posix()],
+            "report": ["json"],
+            "sha": ["sha256"],
+            "directory": None,
+            "recursive": True,
+            "verbose": False,
+        }
+        copy2hash.command_line_runner(opt=args)
+
+        assert len(list(root.rglob("*.txt"))) == 8